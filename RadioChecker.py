@@ -3,57 +3,578 @@ import time
 import json
 import requests
 import sys
-import cv2
-import numpy as np
-from urllib.parse import urlparse, quote_plus
+import asyncio
+import queue
+import hashlib
+import argparse
+import contextlib
+from urllib.parse import urlparse, quote_plus, urljoin
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock, Thread
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import TimeoutException, NoSuchWindowException, WebDriverException, InvalidSessionIdException
-from PIL import Image
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed, wait, FIRST_COMPLETED
+from threading import Lock, Thread, Event, BoundedSemaphore, Condition
 import io
 import os
 import shutil
-import ctypes
-from ctypes import wintypes
+import difflib
+import socket
+import ipaddress
+import random
+import xml.etree.ElementTree as ET
+import sqlite3
+import base64
+import subprocess
+import unicodedata
+from http import cookiejar
 GIST_RAW_URL = (
     "https://gist.githubusercontent.com/YoSoyGena/"
     "7f3a225f39e98d5ac988e1af1526fdc4/raw"
 )
 TIMEOUT = 5
 MAX_THREADS = 30
+MAX_CONCURRENCIA_ASYNC = 200
+MAX_CONEXIONES_POR_HOST = 6
 MAX_BROWSER_THREADS = 2
 ARCHIVO_LOG = "resultado_streams.txt"
 ARCHIVO_MD_ACTUALIZADO = "radios_actualizadas.md"
+ARCHIVO_RESULTADOS_JSON = "resultados_streams.json"
 ARCHIVO_SETTINGS = "settings.json"
+ARCHIVO_CACHE_PROBES = "cache_probes.json"
+ARCHIVO_ESTADO_INCREMENTAL = "estado_incremental.json"
+ARCHIVO_GIST_ESPEJO = "gist_espejo.md"
+ARCHIVO_GIST_META = "gist_espejo.json"
+ARCHIVO_INDICE_RADIO_BROWSER = "radio_browser_ar.json"
+ARCHIVO_CACHE_PLAYLISTS = "cache_playlists.json"
+ARCHIVO_DESCUBRIMIENTOS = "descubrimientos.db"
 VIDEO_DIR = "videos"
 TEMP_DIR = os.path.join(VIDEO_DIR, "temp")
 EXPORTED_DIR = os.path.join(VIDEO_DIR, "exported")
-for d in [VIDEO_DIR, TEMP_DIR, EXPORTED_DIR]:
-    if not os.path.exists(d):
-        os.makedirs(d)
+FPS_GRABACION = 5
+CALIDAD_SCREENCAST = 60
+TAMANO_MAXIMO_SCREENCAST = (1280, 720)
+aiohttp = None
+_aiohttp_disponible = None
+webdriver = Options = By = None
+WebDriverException = InvalidSessionIdException = TimeoutException = None
+cv2 = np = Image = None
+websocket = None
+_websocket_disponible = None
+_imports_lock = Lock()
 PATRON_URL = re.compile(r"(https?://[^\s)]+)", re.IGNORECASE)
 HEADERS_STREAM = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120.0.0.0",
     "Accept": "*/*",
-    "Icy-MetaData": "1",
-    "Connection": "close"
+    "Icy-MetaData": "1"
 }
-cache_hosts = {}
-cache_lock = Lock()
-
-def obtener_gist():
-    """Descarga el contenido del gist"""
-    url_nocache = f"{GIST_RAW_URL}?nocache={int(time.time())}"
-    r = requests.get(
-        url_nocache,
-        timeout=TIMEOUT,
-        headers={"Cache-Control": "no-cache", "Pragma": "no-cache"}
-    )
-    r.raise_for_status()
+MAX_HOSTS_POOL = 100
+TTL_DNS = 300
+TTL_DNS_INEXISTENTE = 900
+MAX_HILOS_DNS = 32
+REINTENTOS_TIMEOUT = 2
+ESPERA_REINTENTO = 0.5
+VALIDACION_PROFUNDA = False
+BYTES_VALIDACION_PROFUNDA = 64 * 1024
+PROFUNDIDAD_MAXIMA_PLAYLIST = 3
+EXTENSIONES_PLAYLIST = ('.m3u8', '.m3u', '.pls')
+TIPOS_PLAYLIST = ('mpegurl', 'scpls', 'x-scpls')
+MAX_BYTES_PLAYLIST = 64 * 1024
+TTL_CACHE_PLAYLISTS = 6 * 3600
+URL_PROVISIONING_STW = "https://playerservices.streamtheworld.com/api/livestream"
+PATRON_URL_STW = re.compile(
+    r'https?://(?:\d+\.live\.streamtheworld\.com|playerservices\.streamtheworld\.com/api/livestream-redirect)/([^?#]+)(\?[^#]*)?',
+    re.IGNORECASE
+)
+TTL_EDGES_STW = 1800
+MAX_HILOS_STW = 16
+MAX_EDGES_STW = 2
+CODIGOS_MOUNT_INEXISTENTE_STW = ("404",)
+TTL_CACHE_PROBES = {"ACTIVO": 30 * 60, "CAIDO": 5 * 60, "TIMEOUT": 2 * 60}
+MAX_ENTRADAS_CACHE = 5000
+MAX_EDAD_EXITO_INCREMENTAL = 6 * 60 * 60
+MAX_USOS_NAVEGADOR = 20
+TIEMPOS_ESPERA = {
+    "busqueda": 10,
+    "repositorio": 8,
+    "actividad_repositorio": 12,
+    "carga": 10,
+    "interaccion": 10,
+    "popup": 10,
+    "iframe": 10,
+    "estabilizacion": 3,
+    "pestanas": 20
+}
+MAX_PESTANAS_PARALELAS = 3
+TIEMPO_MAXIMO_BUSQUEDA = 120
+TIEMPO_CANCELACION_BUSQUEDA = 30
+TIMEOUT_CARGA_PAGINA = 20
+MAX_BYTES_HTML_ARMADO = 512 * 1024
+URL_INDICE_RADIO_BROWSER = "https://de1.api.radio-browser.info/json/stations/bycountrycodeexact/AR"
+TTL_INDICE_RADIO_BROWSER = 24 * 3600
+SIMILITUD_MINIMA_NOMBRE = 0.6
+TTL_PERDEDORES = 30 * 24 * 3600
+FALLOS_PARA_DESCARTAR = 2
+PALABRAS_GENERICAS_NOMBRE = {'radio', 'fm', 'am', 'la', 'el', 'de', 'del', 'los', 'las', 'y', 'en', 'vivo'}
+RED_INACTIVA_SEGUNDOS = 2
+EXTENSIONES_ASSETS = (
+    '.js', '.css', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico',
+    '.woff', '.woff2', '.ttf', '.eot', '.json', '.xml', '.html',
+    '.webp', '.map', '.txt'
+)
+PALABRAS_NO_STREAM = [
+    'duckduckgo.com', 'google.com', 'facebook.com',
+    '/js/', '/css/', '/images/', '/img/', '/fonts/',
+    '/assets/', '/_astro/', '/static/',
+    'analytics', 'tracking', 'pixel', 'advertisement'
+]
+EXTENSIONES_AUDIO = ['.mp3', '.aac', '.aacp', '.m3u8', '.pls', '.m3u', '.ogg', '.oga', 'emisoraenvivo.com/api/listening/']
+PALABRAS_STREAM = [
+    'icecast', 'shoutcast', 'streamtheworld',
+    '/stream', '/live', '/radio', '/audio',
+    'listen', 'player', 'broadcast', 'api/listening',
+]
+PUERTOS_STREAM = ['8000', '8080', '8443', '9000', '7189']
+TIPOS_AUDIO = ['audio/', 'mpegurl', 'video/mp2t', 'application/ogg', 'application/x-mpegurl', 'application/vnd.apple.mpegurl']
+# Aceptados al verificar un stream ya elegido, pero demasiado genéricos para detectarlo en la red
+TIPOS_AUDIO_AMPLIOS = TIPOS_AUDIO + ['application/octet-stream', 'video/mp4']
+# Recursos que el navegador de búsqueda no necesita para encontrar el reproductor.
+# Nunca se bloquean .js/.json/.html (arman el player) ni .mp4/.m3u8/etc (pueden ser el stream).
+RECURSOS_BLOQUEADOS = {
+    "fuentes": ['.woff', '.woff2', '.ttf', '.eot', '.otf'],
+    "estilos": ['.css'],
+    "imagenes": ['.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico', '.webp'],
+    "video": ['.webm'],
+    "publicidad": [
+        'doubleclick.net', 'googlesyndication.com', 'googletagmanager.com',
+        'google-analytics.com', 'adservice.google.*', 'connect.facebook.net',
+        'scorecardresearch.com', 'amazon-adsystem.com'
+    ]
+}
+MAX_RSS_NAVEGADOR_MB = 1500
+PALABRAS_IFRAME_PLAYER = ['player', 'stream', 'listen', 'radio', 'vivo', 'embed', 'cast', 'media']
+SELECTORES_PLAY = [
+    'button#play_pause_button', '#play_pause_button',
+    '[class*="play"]', '[class*="Play"]', '[class*="PLAY"]',
+    '[class*="player"]', '[class*="Player"]',
+    '[class*="btn-play"]', '[class*="playButton"]', '[class*="play-button"]',
+    '[class*="btnPlay"]', '[class*="PlayBtn"]',
+    '[id*="play"]', '[id*="Play"]', '[id*="player"]',
+    '[id*="btnPlay"]', '[id*="playBtn"]',
+    '[aria-label*="play" i]', '[aria-label*="reproducir" i]',
+    '[aria-label*="Play" i]', '[aria-label*="Reproducir" i]',
+    '[title*="play" i]', '[title*="reproducir" i]',
+    'button[class*="icon-play"]', 'button[class*="fa-play"]',
+    'div[class*="icon-play"]', 'div[class*="fa-play"]',
+    'svg[class*="play"]', 'svg[aria-label*="play" i]',
+    '.player-button', '.audio-player button', '.radio-player button',
+    '.stream-button', '.live-button', '.online-button',
+    'div[onclick*="play"]', 'div[onclick*="stream"]',
+    'a[href*="play"]', 'a[href*="stream"]'
+]
+# Junta en una sola llamada a execute_script lo que antes eran find_elements + get_attribute /
+# is_displayed / size por elemento (cada uno un round-trip HTTP a chromedriver):
+# fuentes de audio/video, candidatos de play por selector (solo los visibles llevan el elemento) e iframes.
+SCRIPT_ESCANEO_DOM = """
+const selectores = arguments[0] || [];
+const atributo = (el, nombre) => {
+    const propiedad = el[nombre];
+    if (typeof propiedad === 'string' && propiedad) return propiedad;
+    return el.getAttribute(nombre);
+};
+const visible = (el) => {
+    const rect = el.getBoundingClientRect();
+    if (!rect.width && !rect.height) return false;
+    const estilo = window.getComputedStyle(el);
+    return estilo.display !== 'none' && estilo.visibility !== 'hidden' && parseFloat(estilo.opacity || '1') > 0;
+};
+const medios = [];
+for (const el of document.querySelectorAll('audio, video, source, object, embed')) {
+    for (const nombre of ['src', 'data', 'value']) {
+        const valor = atributo(el, nombre);
+        if (valor) medios.push(valor);
+    }
+}
+const botones = {};
+for (const selector of selectores) {
+    let elementos;
+    try { elementos = document.querySelectorAll(selector); } catch (e) { continue; }
+    if (!elementos.length) continue;
+    botones[selector] = Array.from(elementos, (el) => {
+        const rect = el.getBoundingClientRect();
+        const es_visible = visible(el);
+        return {
+            elemento: es_visible ? el : null,
+            visible: es_visible,
+            tamano: {height: Math.round(rect.height), width: Math.round(rect.width)},
+            onclick: el.getAttribute('onclick')
+        };
+    });
+}
+const iframes = Array.from(document.querySelectorAll('iframe'), (el) => ({elemento: el, src: atributo(el, 'src')}));
+return {medios: medios, botones: botones, iframes: iframes};
+"""
+_sesion_http = None
+_sesion_lock = Lock()
+_aviso_sin_psutil = Event()
+
+def _cargar_selenium():
+    """Importa selenium recién cuando hace falta el navegador (búsqueda automática)"""
+    global webdriver, Options, By, WebDriverException, InvalidSessionIdException, TimeoutException
+    with _imports_lock:
+        if webdriver is None:
+            from selenium import webdriver as _webdriver
+            from selenium.webdriver.chrome.options import Options as _Options
+            from selenium.webdriver.common.by import By as _By
+            from selenium.common.exceptions import WebDriverException as _WebDriverException, InvalidSessionIdException as _InvalidSessionIdException, TimeoutException as _TimeoutException
+            Options, By = _Options, _By
+            WebDriverException, InvalidSessionIdException, TimeoutException = _WebDriverException, _InvalidSessionIdException, _TimeoutException
+            webdriver = _webdriver
+
+def _cargar_video():
+    """Importa OpenCV, numpy y PIL recién cuando se graba un video de debug"""
+    global cv2, np, Image
+    with _imports_lock:
+        if cv2 is None:
+            import numpy as _np
+            from PIL import Image as _Image
+            import cv2 as _cv2
+            np, Image = _np, _Image
+            cv2 = _cv2
+
+def _cargar_aiohttp():
+    """Importa aiohttp al arrancar la primera verificación; devuelve None si no está instalado"""
+    global aiohttp, _aiohttp_disponible
+    with _imports_lock:
+        if _aiohttp_disponible is None:
+            try:
+                import aiohttp as _aiohttp
+                aiohttp = _aiohttp
+                _aiohttp_disponible = True
+            except ImportError:
+                _aiohttp_disponible = False
+    return aiohttp
+
+def _cargar_websocket():
+    """Importa websocket-client para hablar CDP directo con Chrome; devuelve None si no está instalado"""
+    global websocket, _websocket_disponible
+    with _imports_lock:
+        if _websocket_disponible is None:
+            try:
+                import websocket as _websocket
+                websocket = _websocket
+                _websocket_disponible = True
+            except ImportError:
+                _websocket_disponible = False
+    return websocket
+
+def _asegurar_directorios_video():
+    """Crea las carpetas de videos la primera vez que se graba"""
+    for d in [VIDEO_DIR, TEMP_DIR, EXPORTED_DIR]:
+        if not os.path.exists(d):
+            os.makedirs(d)
+
+def obtener_sesion_http():
+    """
+    Devuelve la sesión HTTP compartida por todos los hilos.
+    Mantiene las conexiones vivas (keep-alive) con un pool por host dimensionado a la
+    cantidad de workers, así los probes a un mismo servidor Icecast/StreamTheWorld no
+    repiten DNS + TCP + TLS en cada request. No guarda cookies: el jar sería compartido y
+    las cookies de los redirects de una radio viajarían a todos los demás hosts.
+    """
+    global _sesion_http
+    if _sesion_http is None:
+        with _sesion_lock:
+            if _sesion_http is None:
+                sesion = requests.Session()
+                sesion.cookies.set_policy(cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+                adaptador = requests.adapters.HTTPAdapter(
+                    pool_connections=MAX_HOSTS_POOL,
+                    pool_maxsize=MAX_THREADS + MAX_BROWSER_THREADS * 5,
+                    max_retries=0
+                )
+                sesion.mount("http://", adaptador)
+                sesion.mount("https://", adaptador)
+                _sesion_http = sesion
+    return _sesion_http
+
+class ResolvedorDNS:
+    """
+    Resolución DNS en lote con cache compartida entre hilos.
+    Los dominios inexistentes (NXDOMAIN) quedan en una cache negativa para
+    descartarlos sin abrir conexión; los errores transitorios no se cachean.
+    """
+    ERRORES_INEXISTENTE = {socket.EAI_NONAME, getattr(socket, "EAI_NODATA", socket.EAI_NONAME)}
+    def __init__(self, ttl=TTL_DNS, ttl_inexistente=TTL_DNS_INEXISTENTE):
+        self.ttl = ttl
+        self.ttl_inexistente = ttl_inexistente
+        self._entradas = {}
+        self._lock = Lock()
+    def obtener(self, host):
+        """Lista de IPs cacheadas, [] si el dominio no existe, o None si no hay dato vigente"""
+        with self._lock:
+            entrada = self._entradas.get(host)
+            if entrada is None or entrada[1] < time.time():
+                return None
+            return entrada[0]
+    def resolver(self, host):
+        """Resuelve un host (usando la cache); devuelve [] si no existe y None si el DNS falló"""
+        if not host:
+            return None
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+        cacheado = self.obtener(host)
+        if cacheado is not None:
+            return cacheado
+        try:
+            infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+            ips, ttl = list(dict.fromkeys(info[4][0] for info in infos)), self.ttl
+        except socket.gaierror as e:
+            if e.errno not in self.ERRORES_INEXISTENTE:
+                return None
+            ips, ttl = [], self.ttl_inexistente
+        except Exception:
+            return None
+        with self._lock:
+            self._entradas[host] = (ips, time.time() + ttl)
+        return ips
+    def resolver_lote(self, hosts, max_hilos=MAX_HILOS_DNS):
+        """Resuelve en paralelo los hosts que no estén en cache; devuelve {host: ips}"""
+        hosts = [h for h in dict.fromkeys(hosts) if h]
+        pendientes = [h for h in hosts if self.obtener(h) is None]
+        if pendientes:
+            with ThreadPoolExecutor(max_workers=min(max_hilos, len(pendientes))) as executor:
+                list(executor.map(self.resolver, pendientes))
+        return {h: self.obtener(h) for h in hosts}
+    def existe(self, host):
+        """False solo si el DNS ya confirmó que el dominio no existe"""
+        return self.obtener(host) != []
+
+resolvedor_dns = ResolvedorDNS()
+
+def host_de_url(url):
+    """Host (en minúscula) de una URL, o None si no se puede parsear"""
+    try:
+        return (urlparse(url).hostname or "").lower() or None
+    except ValueError:
+        return None
+
+def normalizar_url_cache(url):
+    """Normaliza una URL (esquema/host en minúscula, sin puerto por defecto ni fragmento) para usarla como clave"""
+    p = urlparse(url.strip())
+    esquema = p.scheme.lower()
+    host = (p.hostname or "").lower()
+    try:
+        puerto = p.port
+    except ValueError:
+        puerto = None
+    if puerto and (esquema, puerto) not in [("http", 80), ("https", 443)]:
+        host = f"{host}:{puerto}"
+    query = f"?{p.query}" if p.query else ""
+    return f"{esquema}://{host}{p.path or '/'}{query}"
+
+class CacheProbes:
+    """
+    Cache de resultados de verificación por URL normalizada.
+    Cada estado tiene su propio TTL (los CAIDO/TIMEOUT expiran antes que los ACTIVO),
+    se desalojan las entradas menos usadas al superar max_entradas y se puede
+    persistir a disco para que una nueva corrida reaproveche lo verificado recientemente.
+    """
+    def __init__(self, ttls=None, max_entradas=MAX_ENTRADAS_CACHE):
+        self.ttls = ttls or TTL_CACHE_PROBES
+        self.max_entradas = max_entradas
+        self._entradas = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+    def _clave(self, url, variante):
+        clave = normalizar_url_cache(url)
+        return f"{clave} [{variante}]" if variante else clave
+    def obtener(self, url, variante=None):
+        """Devuelve (estado, info) si hay un resultado vigente para la URL (y variante de probe), o None"""
+        clave = self._clave(url, variante)
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None or entrada[2] < time.time():
+                if entrada is not None:
+                    del self._entradas[clave]
+                self.misses += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self.hits += 1
+            return entrada[0], entrada[1]
+    def guardar(self, url, estado, info, variante=None):
+        """Guarda un resultado con el TTL correspondiente a su estado"""
+        ttl = self.ttls.get(estado, 0)
+        if ttl <= 0:
+            return
+        clave = self._clave(url, variante)
+        with self._lock:
+            self._entradas[clave] = (estado, info, time.time() + ttl)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+    def cargar(self, ruta=ARCHIVO_CACHE_PROBES):
+        """Carga las entradas vigentes guardadas por una corrida anterior"""
+        if not os.path.exists(ruta):
+            return
+        try:
+            with open(ruta, "r", encoding="utf-8") as f:
+                datos = json.load(f)
+        except Exception as e:
+            print(f"     ⚠️ No se pudo leer la cache de probes: {e}")
+            return
+        ahora = time.time()
+        with self._lock:
+            for clave, estado, info, expira in datos.get("entradas", []):
+                if expira > ahora:
+                    self._entradas[clave] = (estado, info, expira)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+    def persistir(self, ruta=ARCHIVO_CACHE_PROBES):
+        """Guarda a disco las entradas vigentes respetando el orden LRU"""
+        ahora = time.time()
+        with self._lock:
+            entradas = [[clave, estado, info, expira] for clave, (estado, info, expira) in self._entradas.items() if expira > ahora]
+        try:
+            temporal = f"{ruta}.tmp"
+            with open(temporal, "w", encoding="utf-8") as f:
+                json.dump({"entradas": entradas}, f)
+            os.replace(temporal, ruta)
+        except Exception as e:
+            print(f"     ⚠️ No se pudo guardar la cache de probes: {e}")
+    def resumen(self):
+        total = self.hits + self.misses
+        porcentaje = (self.hits * 100 / total) if total else 0
+        return f"{self.hits} hits / {self.misses} misses ({porcentaje:.1f}% hit), {len(self._entradas)} entradas"
+
+cache_probes = CacheProbes()
+
+def patrones_bloqueo_red(grabar_video=False):
+    """
+    Arma la lista de patrones para Network.setBlockedURLs a partir de RECURSOS_BLOQUEADOS.
+    Las extensiones se anclan al final de la URL y los dominios al host (el dominio y sus
+    subdominios), así una palabra suelta no bloquea hosts de streams ni scripts del player.
+    Las imágenes solo se bloquean si no se graba video (en el video se quieren ver).
+    """
+    patrones = []
+    for categoria, valores in RECURSOS_BLOQUEADOS.items():
+        if categoria == "imagenes" and grabar_video:
+            continue
+        for valor in valores:
+            if valor.startswith('.'):
+                patrones += [f"*{valor}", f"*{valor}?*"]
+            else:
+                patrones += [f"*://{valor}/*", f"*://*.{valor}/*"]
+    return patrones
+
+class EstadisticasBloqueo:
+    """Contador global (thread-safe) de lo que bloquean y descargan los navegadores de búsqueda en una corrida"""
+    def __init__(self):
+        self._lock = Lock()
+        self.reiniciar()
+    def reiniciar(self):
+        with self._lock:
+            self.bloqueados = {}
+            self.descargados = 0
+            self.bytes_descargados = 0
+    def registrar_bloqueo(self, tipo):
+        with self._lock:
+            self.bloqueados[tipo] = self.bloqueados.get(tipo, 0) + 1
+    def registrar_descarga(self, cantidad_bytes):
+        with self._lock:
+            self.descargados += 1
+            self.bytes_descargados += cantidad_bytes
+    def resumen(self):
+        with self._lock:
+            total = sum(self.bloqueados.values())
+            detalle = ", ".join(f"{tipo}: {n}" for tipo, n in sorted(self.bloqueados.items(), key=lambda x: -x[1]))
+            megas = self.bytes_descargados / (1024 * 1024)
+            texto = f"{total} requests bloqueados"
+            if detalle:
+                texto += f" ({detalle})"
+            return texto + f", {self.descargados} descargados ({megas:.1f} MB)"
+
+estadisticas_bloqueo = EstadisticasBloqueo()
+
+def _leer_espejo_gist():
+    """Devuelve (contenido, metadatos) de la copia local del gist, o (None, {}) si no hay"""
+    if not os.path.exists(ARCHIVO_GIST_ESPEJO):
+        return None, {}
+    try:
+        with open(ARCHIVO_GIST_ESPEJO, "r", encoding="utf-8") as f:
+            contenido = f.read()
+        meta = {}
+        if os.path.exists(ARCHIVO_GIST_META):
+            with open(ARCHIVO_GIST_META, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        return contenido, meta
+    except Exception as e:
+        print(f"     ⚠️ No se pudo leer la copia local del gist: {e}")
+        return None, {}
+
+def _guardar_espejo_gist(contenido, headers):
+    """
+    Guarda el gist descargado junto con su ETag/Last-Modified. Los dos archivos se escriben
+    con .tmp + os.replace y la meta va última (y se borra antes): si se corta a la mitad no
+    queda un ETag que no corresponda al espejo.
+    """
+    meta = {
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "descargado": time.time()
+    }
+    try:
+        if os.path.exists(ARCHIVO_GIST_META):
+            os.remove(ARCHIVO_GIST_META)
+        temporal = f"{ARCHIVO_GIST_ESPEJO}.tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            f.write(contenido)
+        os.replace(temporal, ARCHIVO_GIST_ESPEJO)
+        temporal = f"{ARCHIVO_GIST_META}.tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(temporal, ARCHIVO_GIST_META)
+    except Exception as e:
+        print(f"     ⚠️ No se pudo guardar la copia local del gist: {e}")
+
+def obtener_gist(forzar=False):
+    """
+    Descarga el contenido del gist.
+    Hace un GET condicional (If-None-Match / If-Modified-Since) contra la copia local:
+    si el servidor responde 304 se reutiliza el espejo, y si la descarga falla también.
+    Con forzar=True se salta el espejo y se pide el documento completo sin cache.
+    """
+    if forzar:
+        url_nocache = f"{GIST_RAW_URL}?nocache={int(time.time())}"
+        r = obtener_sesion_http().get(
+            url_nocache,
+            timeout=TIMEOUT,
+            headers={"Cache-Control": "no-cache", "Pragma": "no-cache"}
+        )
+        r.raise_for_status()
+        _guardar_espejo_gist(r.text, r.headers)
+        return r.text
+    espejo, meta = _leer_espejo_gist()
+    headers = {}
+    if espejo is not None:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+    try:
+        r = obtener_sesion_http().get(GIST_RAW_URL, timeout=TIMEOUT, headers=headers)
+        if r.status_code == 304 and espejo is not None:
+            print("📄 Gist sin cambios (304), usando la copia local")
+            return espejo
+        r.raise_for_status()
+    except Exception as e:
+        if espejo is not None:
+            print(f"⚠️ No se pudo descargar el gist ({e}), usando la copia local")
+            return espejo
+        raise
+    _guardar_espejo_gist(r.text, r.headers)
     return r.text
 
 def extraer_radios(markdown):
@@ -90,6 +611,66 @@ def extraer_radios(markdown):
             })
     return radios, lineas_originales
 
+def hash_gist(markdown):
+    """Hash del contenido del gist, para saber si cambió desde la última corrida"""
+    return hashlib.sha256(markdown.encode("utf-8")).hexdigest()
+
+def clave_fila(radio):
+    """Identifica una fila del gist por frecuencia y nombre (sin el asterisco de STW)"""
+    nombre = " ".join(radio["nombre"].replace("*", "").split()).lower()
+    return f"{radio['frecuencia'].strip().lower()}|{nombre}"
+
+def cargar_estado_incremental(ruta=ARCHIVO_ESTADO_INCREMENTAL):
+    """Carga los resultados por fila guardados en la corrida anterior"""
+    if os.path.exists(ruta):
+        try:
+            with open(ruta, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"     ⚠️ No se pudo leer el estado incremental: {e}")
+    return {"hash_gist": None, "filas": {}}
+
+def guardar_estado_incremental(estado, ruta=ARCHIVO_ESTADO_INCREMENTAL):
+    """Guarda los resultados por fila para la próxima corrida incremental"""
+    try:
+        temporal = f"{ruta}.tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(estado, f, ensure_ascii=False)
+        os.replace(temporal, ruta)
+    except Exception as e:
+        print(f"     ⚠️ No se pudo guardar el estado incremental: {e}")
+
+def seleccionar_radios_a_verificar(radios, estado_previo, max_edad=MAX_EDAD_EXITO_INCREMENTAL):
+    """
+    Decide qué radios hay que volver a probar en modo incremental.
+    Se prueban las URLs nuevas o cambiadas, las que fallaron la última vez y las que
+    llevan más de max_edad segundos sin un éxito. Devuelve (índices a verificar,
+    {índice: resultado previo}) para las que se pueden reutilizar.
+    """
+    ahora = time.time()
+    filas = estado_previo.get("filas", {})
+    a_verificar = []
+    reutilizadas = {}
+    for idx, radio in enumerate(radios):
+        previo = filas.get(clave_fila(radio), {}).get(radio["url"])
+        if (previo is None or previo.get("estado") != "ACTIVO"
+                or ahora - previo.get("ultimo_exito", 0) > max_edad):
+            a_verificar.append(idx)
+        else:
+            reutilizadas[idx] = previo
+    return a_verificar, reutilizadas
+
+def registrar_resultado_incremental(estado_nuevo, radio, estado, info, previo=None):
+    """Anota el resultado de una radio en el estado que se guardará para la próxima corrida"""
+    ahora = time.time()
+    ultimo_exito = ahora if estado == "ACTIVO" else (previo or {}).get("ultimo_exito", 0)
+    estado_nuevo["filas"].setdefault(clave_fila(radio), {})[radio["url"]] = {
+        "estado": estado,
+        "info": info if isinstance(info, (str, int)) else str(info),
+        "ultimo_exito": ultimo_exito,
+        "verificado": ahora
+    }
+
 def ajustar_nombre_por_url(nombre, url):
     """
     Agrega un asterisco al nombre si la URL es de streamtheworld,
@@ -110,50 +691,1444 @@ def ajustar_nombre_por_url(nombre, url):
     else:
         return nombre_base
 
-def verificar_stream(radio):
-    """Verifica si un stream está funcionando"""
-    url = radio["url"]
-    host = urlparse(url).netloc
-    with cache_lock:
-        if host in cache_hosts:
-            estado, info = cache_hosts[host]
-            return radio, estado, f"(cache) {info}"
+def _alternativas(textos):
+    """
+    Compila una regex que encuentra cualquiera de los textos (literales). Las alternativas se
+    arman como un árbol de prefijos comunes ("/(?:css/|fonts/|im(?:ages/|g/))"), así el motor
+    de re descarta cada posición con una sola comparación en vez de probar texto por texto.
+    """
+    arbol = {}
+    for texto in textos:
+        nodo = arbol
+        for caracter in texto:
+            nodo = nodo.setdefault(caracter, {})
+        nodo[""] = {}
+    def armar(nodo):
+        ramas = [re.escape(caracter) + armar(hijo) for caracter, hijo in sorted(nodo.items()) if caracter]
+        if not ramas:
+            return ""
+        patron = ramas[0] if len(ramas) == 1 else "(?:" + "|".join(ramas) + ")"
+        if "" in nodo:
+            patron = f"(?:{patron})?"
+        return patron
+    return re.compile(armar(arbol))
+
+# Clasificador de URLs y Content-Types armado una sola vez: corre por cada evento de red
+# del performance log y por cada atributo del DOM, así que evita listas y any() por llamada
+_RE_PALABRAS_NO_STREAM = _alternativas(PALABRAS_NO_STREAM)
+_RE_EXTENSION_AUDIO = _alternativas(EXTENSIONES_AUDIO)
+_RE_PALABRAS_STREAM = _alternativas(PALABRAS_STREAM)
+_RE_PUERTO_STREAM = _alternativas([f':{puerto}' for puerto in PUERTOS_STREAM])
+_RE_EXTENSION_ASSET = _alternativas(EXTENSIONES_ASSETS)
+_RE_TIPO_AUDIO = _alternativas(TIPOS_AUDIO)
+_RE_TIPO_AUDIO_AMPLIO = _alternativas(TIPOS_AUDIO_AMPLIOS)
+
+def es_url_stream_audio(url):
+    """Detecta si una URL es de audio streaming (por extensión, palabras clave o puerto típico)"""
+    if not url or not isinstance(url, str):
+        return False
+    url_lower = url.lower()
+    if url_lower.endswith(EXTENSIONES_ASSETS) or _RE_PALABRAS_NO_STREAM.search(url_lower):
+        return False
+    if _RE_EXTENSION_AUDIO.search(url_lower):
+        return True
+    if _RE_PALABRAS_STREAM.search(url_lower):
+        parsed = urlparse(url_lower)
+        if _RE_PALABRAS_STREAM.search(parsed.path) or _RE_PALABRAS_STREAM.search(parsed.netloc):
+            return True
+    return bool(_RE_PUERTO_STREAM.search(url)) and not _RE_EXTENSION_ASSET.search(url_lower)
+
+def es_tipo_audio(content_type, amplio=True):
+    """True si el Content-Type (en minúscula) es de audio/stream; `amplio` acepta además octet-stream y mp4"""
+    return bool((_RE_TIPO_AUDIO_AMPLIO if amplio else _RE_TIPO_AUDIO).search(content_type))
+
+def _clasificar_respuesta(status_code, headers):
+    """Decide el estado de un stream a partir del status y las cabeceras de la respuesta"""
+    if status_code < 400:
+        ct = headers.get('Content-Type', '').lower()
+        is_icy = any(k.lower().startswith('icy-') for k in headers.keys())
+        if not is_icy and not es_tipo_audio(ct):
+            if 'text/html' in ct or 'image/' in ct:
+                return "CAIDO", f"No es audio ({ct})"
+            return "ACTIVO", f"{status_code} ({ct})"
+        return "ACTIVO", status_code
+    return "CAIDO", status_code
+
+BITRATES_MP3 = {
+    (3, 3): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (3, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (3, 1): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 3): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 1): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160]
+}
+MUESTREO_MP3 = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+def _largo_frame_mp3(datos, i):
+    """Largo del frame MPEG audio que empieza en i, o None si no hay un header válido"""
+    if i + 4 > len(datos) or datos[i] != 0xFF or (datos[i + 1] & 0xE0) != 0xE0:
+        return None
+    version = (datos[i + 1] >> 3) & 3
+    capa = (datos[i + 1] >> 1) & 3
+    indice_bitrate = datos[i + 2] >> 4
+    indice_muestreo = (datos[i + 2] >> 2) & 3
+    if version == 1 or capa == 0 or indice_bitrate in (0, 15) or indice_muestreo == 3:
+        return None
+    bitrate = BITRATES_MP3[(3 if version == 3 else 2, capa)][indice_bitrate] * 1000
+    muestreo = MUESTREO_MP3[version][indice_muestreo]
+    padding = (datos[i + 2] >> 1) & 1
+    if capa == 3:
+        return (12 * bitrate // muestreo + padding) * 4
+    if capa == 1 and version != 3:
+        return 72 * bitrate // muestreo + padding
+    return 144 * bitrate // muestreo + padding
+
+def _largo_frame_adts(datos, i):
+    """Largo del frame AAC/ADTS que empieza en i, o None si no hay un header válido"""
+    if i + 7 > len(datos) or datos[i] != 0xFF or (datos[i + 1] & 0xF6) != 0xF0:
+        return None
+    if (datos[i + 2] >> 2) & 0xF >= 13:
+        return None
+    largo = ((datos[i + 3] & 3) << 11) | (datos[i + 4] << 3) | (datos[i + 5] >> 5)
+    return largo if largo >= 7 else None
+
+def _frames_consecutivos(datos, largo_frame, minimo=3):
+    """True si hay `minimo` frames seguidos (cada header donde el anterior dice que termina)"""
+    i = datos.find(b"\xff")
+    while i != -1:
+        j, cantidad = i, 0
+        while cantidad < minimo:
+            largo = largo_frame(datos, j)
+            if not largo:
+                break
+            j += largo
+            cantidad += 1
+        if cantidad >= minimo:
+            return True
+        i = datos.find(b"\xff", i + 1)
+    return False
+
+CAJAS_INICIO_MP4 = (b"ftyp", b"styp", b"moof", b"sidx", b"emsg")
+CAJAS_MP4 = CAJAS_INICIO_MP4 + (b"moov", b"mdat", b"free", b"skip", b"uuid", b"prft")
+
+def _cajas_mp4(datos):
+    """
+    True si los datos arrancan con cajas MP4 reales: en el offset 0 el tamaño (4 bytes) y
+    en el offset 4 un tipo de inicio de archivo/fragmento, y si la caja siguiente entra en
+    los datos, su header también tiene que ser válido.
+    """
+    if len(datos) < 8 or datos[4:8] not in CAJAS_INICIO_MP4:
+        return False
+    tamanio = int.from_bytes(datos[:4], "big")
+    if tamanio == 1 and len(datos) >= 16:
+        tamanio = int.from_bytes(datos[8:16], "big")
+    if tamanio < 8:
+        return False
+    if tamanio + 8 <= len(datos):
+        siguiente = int.from_bytes(datos[tamanio:tamanio + 4], "big")
+        return datos[tamanio + 4:tamanio + 8] in CAJAS_MP4 and (siguiente == 0 or siguiente >= 8)
+    return True
+
+def detectar_formato_audio(datos):
+    """
+    Busca sincronismo real de audio en los primeros bytes de un stream: frames MP3 o
+    AAC/ADTS encadenados, páginas Ogg, paquetes MPEG-TS cada 188 bytes o cajas MP4.
+    Devuelve el formato ("MP3", "AAC", "OGG", "TS", "MP4", "FLAC") o None.
+    """
+    if b"OggS\x00" in datos:
+        return "OGG"
+    if b"fLaC" in datos[:4096]:
+        return "FLAC"
+    for i in range(min(188, len(datos) - 376)):
+        if datos[i] == 0x47 and datos[i + 188] == 0x47 and datos[i + 376] == 0x47:
+            return "TS"
+    if _cajas_mp4(datos):
+        return "MP4"
+    if _frames_consecutivos(datos, _largo_frame_adts):
+        return "AAC"
+    if _frames_consecutivos(datos, _largo_frame_mp3):
+        return "MP3"
+    return None
+
+def _parece_texto(datos):
+    """True si los primeros bytes parecen texto (casi sin bytes de control), no media binaria"""
+    muestra = datos[:512]
+    controles = sum(1 for b in muestra if b < 9 or 13 < b < 32)
+    return controles <= len(muestra) // 20
+
+def es_playlist(url, content_type, datos=b""):
+    """
+    True si la respuesta es una playlist (por contenido, Content-Type o extensión). Muchos
+    Icecast sirven el audio directo en una URL .m3u: si el Content-Type es de audio/video o
+    los primeros bytes son binarios, no se la trata como playlist.
+    """
+    inicio = datos[:16].lstrip().lower()
+    if inicio.startswith(b"#extm3u") or inicio.startswith(b"[playlist]"):
+        return True
+    if datos and not _parece_texto(datos):
+        return False
+    if any(t in content_type for t in TIPOS_PLAYLIST):
+        return True
+    if content_type.startswith(("audio/", "video/")):
+        return False
+    return urlparse(url).path.lower().endswith(EXTENSIONES_PLAYLIST)
+
+def entradas_playlist(texto, url_base):
+    """
+    URLs absolutas de una playlist PLS, M3U o HLS, en el orden en que conviene probarlas.
+    En una media playlist HLS en vivo el último segmento es el que seguro sigue en el servidor.
+    """
+    entradas = []
+    es_hls_media = "#EXT-X-TARGETDURATION" in texto
+    for linea in texto.splitlines():
+        linea = linea.strip()
+        if not linea:
+            continue
+        if re.match(r'^file\d*=', linea, re.IGNORECASE):
+            entradas.append(linea.split("=", 1)[1].strip())
+        elif not linea.startswith(("#", "[")) and not re.match(r'^[a-z]+\d*=', linea, re.IGNORECASE):
+            entradas.append(linea)
+    entradas = [urljoin(url_base, entrada) for entrada in entradas]
+    return entradas[::-1] if es_hls_media else entradas
+
+def _veredicto_contenido(datos, url, content_type, fin):
+    """
+    Decide con lo leído hasta ahora: ("audio", formato), ("playlist", None) cuando ya se
+    leyó toda la playlist, ("seguir", None) o ("sin_audio", None) si se agotó el presupuesto.
+    """
+    if es_playlist(url, content_type, datos):
+        return ("playlist", None) if fin else ("seguir", None)
+    formato = detectar_formato_audio(datos)
+    if formato:
+        return "audio", formato
+    return ("sin_audio", None) if fin else ("seguir", None)
+
+def _resultado_profundo(veredicto, formato, status_code, datos):
+    """Traduce un veredicto final que no sea playlist a (estado, info)"""
+    if veredicto == "audio":
+        return "ACTIVO", f"{status_code} ({formato})"
+    return "CAIDO", f"Sin frames de audio en {len(datos) // 1024} KB"
+
+def _resultado_playlist(resultados):
+    """Combina los (estado, info) de las entradas probadas de una playlist"""
+    if not resultados:
+        return "CAIDO", "Playlist vacía"
+    for estado, info in resultados:
+        if estado == "ACTIVO":
+            return "ACTIVO", f"Playlist → {info}"
+    # Si alguna entrada no respondió a tiempo no se puede decir que la playlist esté caída
+    for estado, info in resultados:
+        if estado == "TIMEOUT":
+            return "TIMEOUT", f"Playlist sin media ({info})"
+    return "CAIDO", f"Playlist sin media ({resultados[0][1]})"
+
+class ResolvedorPlaylists:
+    """
+    Resuelve playlists PLS, M3U y HLS hasta las URLs de media concretas, siguiendo
+    playlists anidadas (hasta PROFUNDIDAD_MAXIMA_PLAYLIST). Cada playlist parseada se
+    cachea por URL con TTL y se persiste a disco, así las corridas siguientes no la
+    vuelven a bajar. De una media playlist HLS solo se cachea que lo es: sus segmentos
+    cambian todo el tiempo, así que en cada resolución se vuelve a bajar y se devuelven los
+    segmentos vigentes (el más nuevo primero) para probar media real.
+    El motor asíncrono usa resolver_async, que baja con la sesión aiohttp y respeta el
+    cupo por host de control_hosts; el parseo y la cache son los mismos.
+    """
+    def __init__(self, ttl=TTL_CACHE_PLAYLISTS):
+        self.ttl = ttl
+        self._entradas = {}
+        self._lock = Lock()
+        self.descargas = 0
+    def _bajar(self, url):
+        """Baja la playlist (acotada a MAX_BYTES_PLAYLIST); devuelve (url_final, content_type, datos) o None"""
+        with obtener_sesion_http().get(url, headers=HEADERS_STREAM, timeout=TIMEOUT, stream=True, allow_redirects=True) as r:
+            if r.status_code >= 400:
+                return None
+            content_type = r.headers.get('Content-Type', '').lower()
+            datos = b""
+            for bloque in r.iter_content(chunk_size=8192):
+                datos += bloque
+                if not es_playlist(r.url, content_type, datos) or len(datos) >= MAX_BYTES_PLAYLIST:
+                    break
+            url_final = r.url
+        self.descargas += 1
+        return url_final, content_type, datos
+    async def _bajar_async(self, sesion, semaforo, url):
+        """Versión aiohttp de _bajar, dentro del cupo del host y del semáforo global"""
+        host = host_de_url(url)
+        await control_hosts.entrar_async(host)
+        try:
+            async with semaforo:
+                timeout = aiohttp.ClientTimeout(total=None, sock_connect=control_hosts.timeout(host), sock_read=control_hosts.timeout(host))
+                async with sesion.get(url, headers=HEADERS_STREAM, timeout=timeout, allow_redirects=True) as r:
+                    if r.status >= 400:
+                        return None
+                    content_type = r.headers.get('Content-Type', '').lower()
+                    datos = b""
+                    while True:
+                        bloque = await r.content.read(8192)
+                        datos += bloque
+                        if not bloque or not es_playlist(str(r.url), content_type, datos) or len(datos) >= MAX_BYTES_PLAYLIST:
+                            break
+                    url_final = str(r.url)
+        finally:
+            control_hosts.salir(host)
+        self.descargas += 1
+        return url_final, content_type, datos
+    def _clasificar(self, url, bajada):
+        """Clasifica una playlist bajada: {"tipo", "entradas"} o None"""
+        if bajada is None:
+            return None
+        url_final, content_type, datos = bajada
+        if not es_playlist(url_final, content_type, datos):
+            # La "playlist" respondió directamente con el stream
+            return {"tipo": "directo", "entradas": [url]}
+        texto = datos.decode("utf-8", "ignore")
+        if "#EXT-X-TARGETDURATION" in texto or "#EXTINF" in texto and "#EXT-X-" in texto:
+            return {"tipo": "hls_media", "entradas": [url]}
+        tipo = "hls_master" if "#EXT-X-STREAM-INF" in texto else "playlist"
+        return {"tipo": tipo, "entradas": entradas_playlist(texto, url_final)}
+    def _segmentos(self, bajada):
+        """Segmentos de una media playlist HLS recién bajada, el más nuevo primero; None si no se pudo bajar"""
+        if bajada is None:
+            return None
+        url_final, _, datos = bajada
+        return entradas_playlist(datos.decode("utf-8", "ignore"), url_final)
+    def _de_cache(self, url):
+        with self._lock:
+            entrada = self._entradas.get(url)
+            if entrada and entrada["vence"] > time.time():
+                return entrada
+        return None
+    def _a_cache(self, url, parseada):
+        if parseada is None:
+            return None
+        parseada["vence"] = time.time() + self.ttl
+        with self._lock:
+            self._entradas[url] = parseada
+        return parseada
+    def _es_anidada(self, entrada, profundidad):
+        return profundidad < PROFUNDIDAD_MAXIMA_PLAYLIST and urlparse(entrada).path.lower().endswith(EXTENSIONES_PLAYLIST)
+    def parsear(self, url):
+        """Playlist parseada (desde la cache si está vigente) o None si no se pudo bajar"""
+        entrada = self._de_cache(url)
+        if entrada:
+            return entrada
+        try:
+            parseada = self._clasificar(url, self._bajar(url))
+        except Exception:
+            parseada = None
+        return self._a_cache(url, parseada)
+    def resolver(self, url, profundidad=0):
+        """
+        Lista de URLs de media concretas de una playlist, en orden de preferencia.
+        Devuelve [] si la playlist no tiene entradas y None si no se pudo bajar.
+        """
+        parseada = self.parsear(url)
+        if parseada is None:
+            return None
+        if parseada["tipo"] == "directo":
+            return parseada["entradas"]
+        if parseada["tipo"] == "hls_media":
+            try:
+                return self._segmentos(self._bajar(url))
+            except Exception:
+                return None
+        medios = []
+        for entrada in parseada["entradas"]:
+            if self._es_anidada(entrada, profundidad):
+                medios.extend(self.resolver(entrada, profundidad + 1) or [])
+            else:
+                medios.append(entrada)
+        return list(dict.fromkeys(medios))
+    async def parsear_async(self, sesion, semaforo, url):
+        """Versión asíncrona de parsear"""
+        entrada = self._de_cache(url)
+        if entrada:
+            return entrada
+        try:
+            parseada = self._clasificar(url, await self._bajar_async(sesion, semaforo, url))
+        except Exception:
+            parseada = None
+        return self._a_cache(url, parseada)
+    async def resolver_async(self, sesion, semaforo, url, profundidad=0):
+        """Versión asíncrona de resolver, con la sesión aiohttp del lote"""
+        parseada = await self.parsear_async(sesion, semaforo, url)
+        if parseada is None:
+            return None
+        if parseada["tipo"] == "directo":
+            return parseada["entradas"]
+        if parseada["tipo"] == "hls_media":
+            try:
+                return self._segmentos(await self._bajar_async(sesion, semaforo, url))
+            except Exception:
+                return None
+        medios = []
+        for entrada in parseada["entradas"]:
+            if self._es_anidada(entrada, profundidad):
+                medios.extend(await self.resolver_async(sesion, semaforo, entrada, profundidad + 1) or [])
+            else:
+                medios.append(entrada)
+        return list(dict.fromkeys(medios))
+    def cargar(self, ruta=ARCHIVO_CACHE_PLAYLISTS):
+        """Carga las playlists vigentes guardadas por una corrida anterior"""
+        if not os.path.exists(ruta):
+            return
+        try:
+            with open(ruta, "r", encoding="utf-8") as f:
+                datos = json.load(f)
+        except Exception as e:
+            print(f"     ⚠️ No se pudo leer la cache de playlists: {e}")
+            return
+        ahora = time.time()
+        with self._lock:
+            for url, entrada in datos.get("playlists", {}).items():
+                if entrada.get("vence", 0) > ahora:
+                    self._entradas[url] = entrada
+    def persistir(self, ruta=ARCHIVO_CACHE_PLAYLISTS):
+        """Guarda a disco las playlists vigentes"""
+        ahora = time.time()
+        with self._lock:
+            vigentes = {url: entrada for url, entrada in self._entradas.items() if entrada["vence"] > ahora}
+        try:
+            temporal = f"{ruta}.tmp"
+            with open(temporal, "w", encoding="utf-8") as f:
+                json.dump({"playlists": vigentes}, f)
+            os.replace(temporal, ruta)
+        except Exception as e:
+            print(f"     ⚠️ No se pudo guardar la cache de playlists: {e}")
+    def resumen(self):
+        return f"{len(self._entradas)} playlists en cache, {self.descargas} descargadas en esta corrida"
+
+resolvedor_playlists = ResolvedorPlaylists()
+
+class ResolvedorStreamTheWorld:
+    """
+    Resuelve mountpoints de StreamTheWorld a sus servidores edge con la API de provisioning
+    (playerservices/api/livestream), así los probes van directo a un edge en vez de pasar
+    cada vez por livestream-redirect. Las listas de edges se cachean por mount con TTL y,
+    cuando un edge falla, pasa al final de la lista para que el próximo probe use otro.
+    """
+    def __init__(self, ttl=TTL_EDGES_STW):
+        self.ttl = ttl
+        self._edges = {}
+        self._lock = Lock()
+    @staticmethod
+    def mount_de_url(url):
+        """(mount, ruta) de una URL de StreamTheWorld, o None si no lo es. ruta conserva extensión y query"""
+        match = PATRON_URL_STW.match(url.strip())
+        if not match:
+            return None
+        ruta = match.group(1) + (match.group(2) or "")
+        mount = re.sub(r'(_SC)?(\.(aac|mp3|flv))?$', '', match.group(1).split('/')[-1], flags=re.IGNORECASE)
+        return mount, ruta
+    def _consultar(self, mount):
+        """
+        Pide al provisioning los edges del mount: lista de hosts, [] si el mount no existe
+        (código CODIGOS_MOUNT_INEXISTENTE_STW) y None si falló o respondió otro error
+        (geobloqueo, provisioning temporal...), así el probe usa la URL de redirect.
+        """
+        try:
+            params = {"version": "1.9", "mount": mount, "lang": "es"}
+            response = obtener_sesion_http().get(URL_PROVISIONING_STW, params=params, headers=HEADERS_STREAM, timeout=TIMEOUT)
+            if response.status_code != 200:
+                return None
+            raiz = ET.fromstring(response.content)
+        except Exception:
+            return None
+        edges = []
+        otro_error = False
+        for mountpoint in raiz.iter("mountpoint"):
+            codigo = (mountpoint.findtext("status/status-code") or "").strip()
+            if codigo and codigo != "200":
+                otro_error = otro_error or codigo not in CODIGOS_MOUNT_INEXISTENTE_STW
+                continue
+            for servidor in mountpoint.iter("server"):
+                ip = (servidor.findtext("ip") or "").strip()
+                if ip and ip not in edges:
+                    edges.append(ip)
+        if not edges and otro_error:
+            return None
+        return edges
+    def _guardar(self, mount, edges):
+        if edges is None:
+            return
+        with self._lock:
+            self._edges[mount] = {"edges": edges, "vence": time.time() + self.ttl}
+    def _vigentes(self, mount):
+        with self._lock:
+            entrada = self._edges.get(mount)
+            if entrada and entrada["vence"] > time.time():
+                return list(entrada["edges"])
+        return None
+    def precargar(self, urls, max_hilos=MAX_HILOS_STW):
+        """Consulta en paralelo todos los mounts distintos (sin edges vigentes) que aparecen en urls"""
+        mounts = []
+        for url in urls:
+            resultado = self.mount_de_url(url)
+            if resultado and resultado[0] not in mounts and self._vigentes(resultado[0]) is None:
+                mounts.append(resultado[0])
+        if not mounts:
+            return 0
+        with ThreadPoolExecutor(max_workers=min(max_hilos, len(mounts))) as executor:
+            for mount, edges in zip(mounts, executor.map(self._consultar, mounts)):
+                self._guardar(mount, edges)
+        print(f"     📡 StreamTheWorld: {len(mounts)} mounts resueltos")
+        return len(mounts)
+    def urls_directas(self, url):
+        """
+        URLs del mismo mount en cada edge, en orden de preferencia. [] si el mount no
+        existe y None si no es STW o la API no respondió (usar la URL original).
+        """
+        resultado = self.mount_de_url(url)
+        if not resultado:
+            return None
+        mount, ruta = resultado
+        edges = self._vigentes(mount)
+        if edges is None:
+            edges = self._consultar(mount)
+            self._guardar(mount, edges)
+        if edges is None:
+            return None
+        return [f"https://{edge}/{ruta}" for edge in edges]
+    def marcar_caido(self, url_directa):
+        """Manda al final de la lista el edge que falló"""
+        resultado = self.mount_de_url(url_directa)
+        edge = host_de_url(url_directa)
+        if not resultado:
+            return
+        with self._lock:
+            entrada = self._edges.get(resultado[0])
+            if entrada and edge in entrada["edges"]:
+                entrada["edges"].remove(edge)
+                entrada["edges"].append(edge)
+
+resolvedor_stw = ResolvedorStreamTheWorld()
+
+def es_url_playlist(url):
+    """True si la URL apunta a una playlist por su extensión"""
+    try:
+        return urlparse(url).path.lower().endswith(EXTENSIONES_PLAYLIST)
+    except ValueError:
+        return False
+
+class ControlHosts:
+    """
+    Control adaptativo por host para los probes de verificación.
+    - Concurrencia AIMD: cada respuesta sube el cupo del host en 1/cupo (≈ +1 por ronda)
+      y cada timeout o error de conexión lo parte a la mitad (mínimo 1).
+    - Timeout estilo TCP: latencia suavizada + 4 × variación, entre TIMEOUT y 3 × TIMEOUT
+      (un host rápido nunca baja del TIMEOUT configurado, solo los lentos lo estiran);
+      sin muestras se usa TIMEOUT. Cada reintento lo duplica.
+    Sirve para los dos motores: entrar()/salir() bloquean en hilos y entrar_async() espera
+    un aviso por host sin ocupar el loop.
+    """
+    def __init__(self, cupo_inicial=MAX_CONEXIONES_POR_HOST):
+        self._condicion = Condition()
+        self.reiniciar(cupo_inicial)
+    def reiniciar(self, cupo_inicial=MAX_CONEXIONES_POR_HOST):
+        with self._condicion:
+            self.cupo_inicial = cupo_inicial
+            self.cupo_maximo = cupo_inicial * 3
+            self._hosts = {}
+            self._esperas_async = {}
+            self.reintentos = 0
+            self.recuperados = 0
+    def _host(self, host):
+        estado = self._hosts.get(host)
+        if estado is None:
+            estado = {"cupo": float(self.cupo_inicial), "en_vuelo": 0, "srtt": None, "rttvar": 0.0, "fallos": 0}
+            self._hosts[host] = estado
+        return estado
+    def _hay_lugar(self, host):
+        estado = self._host(host)
+        if estado["en_vuelo"] < int(estado["cupo"]):
+            estado["en_vuelo"] += 1
+            return True
+        return False
+    def entrar(self, host):
+        with self._condicion:
+            self._condicion.wait_for(lambda: self._hay_lugar(host))
+    async def entrar_async(self, host):
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condicion:
+                if self._hay_lugar(host):
+                    return
+                evento = asyncio.Event()
+                self._esperas_async.setdefault(host, []).append((loop, evento))
+            await evento.wait()
+    def _avisar(self, host):
+        """Despierta a los que esperan lugar en el host (hilos y corrutinas); se llama con el lock tomado"""
+        self._condicion.notify_all()
+        for loop, evento in self._esperas_async.pop(host, []):
+            try:
+                loop.call_soon_threadsafe(evento.set)
+            except RuntimeError:
+                pass
+    def salir(self, host):
+        with self._condicion:
+            self._host(host)["en_vuelo"] -= 1
+            self._avisar(host)
+    def timeout(self, host, intento=0):
+        """Timeout a usar para el próximo probe a este host"""
+        with self._condicion:
+            estado = self._host(host)
+            if estado["srtt"] is None:
+                base = TIMEOUT
+            else:
+                base = min(max(estado["srtt"] + 4 * estado["rttvar"], TIMEOUT), TIMEOUT * 3)
+        return min(base * (2 ** intento), TIMEOUT * 3)
+    def registrar(self, host, estado_probe, info, latencia):
+        """Actualiza latencia y cupo del host con el resultado de un probe"""
+        fallo_red = estado_probe == "TIMEOUT" or info == "Error de conexión"
+        with self._condicion:
+            estado = self._host(host)
+            if estado_probe != "TIMEOUT":
+                if estado["srtt"] is None:
+                    estado["srtt"], estado["rttvar"] = latencia, latencia / 2
+                else:
+                    estado["rttvar"] = 0.75 * estado["rttvar"] + 0.25 * abs(estado["srtt"] - latencia)
+                    estado["srtt"] = 0.875 * estado["srtt"] + 0.125 * latencia
+            elif estado["srtt"] is not None:
+                estado["srtt"] = max(estado["srtt"], latencia)
+            if fallo_red:
+                estado["fallos"] += 1
+                estado["cupo"] = max(1.0, estado["cupo"] / 2)
+            else:
+                estado["cupo"] = min(self.cupo_maximo, estado["cupo"] + 1 / estado["cupo"])
+            self._avisar(host)
+    def anotar_reintento(self, recuperado=False):
+        with self._condicion:
+            if recuperado:
+                self.recuperados += 1
+            else:
+                self.reintentos += 1
+    def resumen(self):
+        with self._condicion:
+            castigados = sum(1 for e in self._hosts.values() if e["cupo"] < self.cupo_inicial)
+            return (f"{len(self._hosts)} hosts ({castigados} con cupo reducido), "
+                    f"{self.reintentos} reintentos por TIMEOUT, {self.recuperados} recuperados")
+
+control_hosts = ControlHosts()
+
+def _espera_reintento(intento):
+    """Backoff exponencial con jitter entre reintentos"""
+    return ESPERA_REINTENTO * (2 ** (intento - 1)) * random.uniform(0.5, 1.5)
+
+def _probar_stream(url, timeout, profunda=False, profundidad=0):
+    """
+    Un intento de verificación con requests; devuelve (estado, info).
+    Con profunda=True además de las cabeceras exige frames de audio reales dentro de
+    BYTES_VALIDACION_PROFUNDA, y si es una playlist prueba sus primeras entradas.
+    """
     try:
-        r = requests.get(
+        with obtener_sesion_http().get(
             url,
             headers=HEADERS_STREAM,
-            timeout=TIMEOUT,
+            timeout=timeout,
             stream=True,
             allow_redirects=True
-        )
-        for _ in r.iter_content(chunk_size=1024):
-            break
-        if r.status_code < 400:
-            ct = r.headers.get('Content-Type', '').lower()
-            tipos_audio = ['audio/', 'mpegurl', 'video/mp2t', 'application/ogg', 'application/x-mpegurl', 'application/vnd.apple.mpegurl', 'application/octet-stream', 'video/mp4']
-            is_icy = any(k.lower().startswith('icy-') for k in r.headers.keys())
-            if not is_icy and not any(t in ct for t in tipos_audio):
-                if 'text/html' in ct or 'image/' in ct:
-                    estado, info = "CAIDO", f"No es audio ({ct})"
-                else:
-                    estado, info = "ACTIVO", f"{r.status_code} ({ct})"
-            else:
-                estado, info = "ACTIVO", r.status_code
-        else:
-            estado, info = "CAIDO", r.status_code
+        ) as r:
+            if not profunda:
+                for _ in r.iter_content(chunk_size=1024):
+                    break
+                return _clasificar_respuesta(r.status_code, r.headers)
+            estado, info = _clasificar_respuesta(r.status_code, r.headers)
+            if estado != "ACTIVO":
+                return estado, info
+            content_type = r.headers.get('Content-Type', '').lower()
+            datos = b""
+            bloques = r.iter_content(chunk_size=8192)
+            while True:
+                bloque = next(bloques, b"")
+                datos += bloque
+                veredicto, formato = _veredicto_contenido(datos, r.url, content_type, not bloque or len(datos) >= BYTES_VALIDACION_PROFUNDA)
+                if veredicto != "seguir":
+                    break
+            if veredicto != "playlist":
+                return _resultado_profundo(veredicto, formato, r.status_code, datos)
+            url_playlist = r.url
+        if profundidad >= PROFUNDIDAD_MAXIMA_PLAYLIST:
+            return "CAIDO", "Demasiadas playlists anidadas"
+        entradas = entradas_playlist(datos.decode("utf-8", "ignore"), url_playlist)[:2]
+        if not entradas:
+            return _resultado_playlist([])
+        # Las entradas se prueban a la vez, como el gather de _probar_stream_async
+        with ThreadPoolExecutor(max_workers=len(entradas)) as executor:
+            return _resultado_playlist(list(executor.map(lambda entrada: _probar_stream(entrada, timeout, True, profundidad + 1), entradas)))
     except requests.exceptions.ReadTimeout:
-        estado, info = "TIMEOUT", "Timeout de lectura"
+        return "TIMEOUT", "Timeout de lectura"
+    except requests.exceptions.ConnectTimeout:
+        # Igual que en aiohttp: no conectar a tiempo es TIMEOUT (se reintenta), no "Error de conexión"
+        return "TIMEOUT", "Timeout de conexión"
     except requests.exceptions.SSLError:
-        estado, info = "ACTIVO", "SSL incompatible"
+        return "ACTIVO", "SSL incompatible"
     except requests.exceptions.ConnectionError:
-        estado, info = "CAIDO", "Error de conexión"
+        return "CAIDO", "Error de conexión"
+    except Exception as e:
+        return "CAIDO", str(e)
+
+def _verificar_url_con_reintentos(url):
+    """Probe de una URL con el control por host y reintentos con backoff si da TIMEOUT"""
+    host = host_de_url(url)
+    if not resolvedor_dns.existe(host):
+        return "CAIDO", "Dominio inexistente (DNS)"
+    for intento in range(REINTENTOS_TIMEOUT + 1):
+        if intento:
+            control_hosts.anotar_reintento()
+            time.sleep(_espera_reintento(intento))
+        control_hosts.entrar(host)
+        try:
+            inicio = time.time()
+            estado, info = _probar_stream(url, control_hosts.timeout(host, intento), VALIDACION_PROFUNDA)
+            control_hosts.registrar(host, estado, info, time.time() - inicio)
+        finally:
+            control_hosts.salir(host)
+        if estado != "TIMEOUT":
+            if intento:
+                control_hosts.anotar_reintento(recuperado=True)
+            break
+    return estado, info
+
+def _verificar_stw(url):
+    """Verifica un mount de StreamTheWorld directo contra sus edges, pasando al siguiente si uno falla"""
+    directas = resolvedor_stw.urls_directas(url)
+    if directas is None:
+        return _verificar_url_con_reintentos(url)
+    if not directas:
+        return "CAIDO", "Mount inexistente en StreamTheWorld"
+    for directa in directas[:MAX_EDGES_STW]:
+        estado, info = _verificar_url_con_reintentos(directa)
+        if estado == "ACTIVO":
+            return estado, f"{info} (edge {host_de_url(directa)})"
+        resolvedor_stw.marcar_caido(directa)
+    return estado, info
+
+def verificar_stream(radio):
+    """Verifica si un stream está funcionando (reintenta con backoff si da TIMEOUT)"""
+    url = radio["url"]
+    variante = "profunda" if VALIDACION_PROFUNDA else None
+    cacheado = cache_probes.obtener(url, variante)
+    if cacheado:
+        estado, info = cacheado
+        return radio, estado, f"(cache) {info}"
+    if not resolvedor_dns.existe(host_de_url(url)):
+        return radio, "CAIDO", "Dominio inexistente (DNS)"
+    medios = resolvedor_playlists.resolver(url) if es_url_playlist(url) else None
+    if medios == []:
+        estado, info = "CAIDO", "Playlist vacía"
+    elif medios and medios != [url]:
+        resultados = [_verificar_url_con_reintentos(medio) for medio in medios[:2]]
+        estado, info = _resultado_playlist(resultados)
+    elif resolvedor_stw.mount_de_url(url):
+        estado, info = _verificar_stw(url)
+    else:
+        estado, info = _verificar_url_con_reintentos(url)
+    cache_probes.guardar(url, estado, info, variante)
+    radio['nombre'] = ajustar_nombre_por_url(radio['nombre'], url)
+    return radio, estado, info
+
+async def _probar_stream_async(sesion, url, timeout_host, profunda=False, profundidad=0):
+    """Un intento de verificación con aiohttp; devuelve (estado, info). Ver _probar_stream"""
+    try:
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout_host, sock_read=timeout_host)
+        async with sesion.get(url, headers=HEADERS_STREAM, timeout=timeout, allow_redirects=True) as r:
+            if not profunda:
+                await r.content.read(1024)
+                return _clasificar_respuesta(r.status, r.headers)
+            estado, info = _clasificar_respuesta(r.status, r.headers)
+            if estado != "ACTIVO":
+                return estado, info
+            content_type = r.headers.get('Content-Type', '').lower()
+            datos = b""
+            while True:
+                bloque = await r.content.read(8192)
+                datos += bloque
+                veredicto, formato = _veredicto_contenido(datos, str(r.url), content_type, not bloque or len(datos) >= BYTES_VALIDACION_PROFUNDA)
+                if veredicto != "seguir":
+                    break
+            if veredicto != "playlist":
+                return _resultado_profundo(veredicto, formato, r.status, datos)
+            url_playlist = str(r.url)
+        if profundidad >= PROFUNDIDAD_MAXIMA_PLAYLIST:
+            return "CAIDO", "Demasiadas playlists anidadas"
+        entradas = entradas_playlist(datos.decode("utf-8", "ignore"), url_playlist)[:2]
+        resultados = await asyncio.gather(*[_probar_stream_async(sesion, entrada, timeout_host, True, profundidad + 1) for entrada in entradas])
+        return _resultado_playlist(list(resultados))
+    except getattr(aiohttp, "ConnectionTimeoutError", ()):
+        return "TIMEOUT", "Timeout de conexión"
+    except asyncio.TimeoutError:
+        return "TIMEOUT", "Timeout de lectura"
+    except aiohttp.ClientSSLError:
+        return "ACTIVO", "SSL incompatible"
+    except aiohttp.ClientConnectionError:
+        return "CAIDO", "Error de conexión"
     except Exception as e:
-        estado, info = "CAIDO", str(e)
-    with cache_lock:
-        cache_hosts[host] = (estado, info)
+        return "CAIDO", str(e)
+
+async def _verificar_url_async(sesion, semaforo, url):
+    """Versión asíncrona de _verificar_url_con_reintentos"""
+    host = host_de_url(url)
+    if not resolvedor_dns.existe(host):
+        return "CAIDO", "Dominio inexistente (DNS)"
+    for intento in range(REINTENTOS_TIMEOUT + 1):
+        if intento:
+            control_hosts.anotar_reintento()
+            await asyncio.sleep(_espera_reintento(intento))
+        await control_hosts.entrar_async(host)
+        try:
+            async with semaforo:
+                inicio = time.time()
+                estado, info = await _probar_stream_async(sesion, url, control_hosts.timeout(host, intento), VALIDACION_PROFUNDA)
+                control_hosts.registrar(host, estado, info, time.time() - inicio)
+        finally:
+            control_hosts.salir(host)
+        if estado != "TIMEOUT":
+            if intento:
+                control_hosts.anotar_reintento(recuperado=True)
+            break
+    return estado, info
+
+async def _verificar_stw_async(sesion, semaforo, url):
+    """Versión asíncrona de _verificar_stw"""
+    directas = await asyncio.get_running_loop().run_in_executor(None, resolvedor_stw.urls_directas, url)
+    if directas is None:
+        return await _verificar_url_async(sesion, semaforo, url)
+    if not directas:
+        return "CAIDO", "Mount inexistente en StreamTheWorld"
+    for directa in directas[:MAX_EDGES_STW]:
+        estado, info = await _verificar_url_async(sesion, semaforo, directa)
+        if estado == "ACTIVO":
+            return estado, f"{info} (edge {host_de_url(directa)})"
+        resolvedor_stw.marcar_caido(directa)
+    return estado, info
+
+async def _verificar_stream_async(sesion, semaforo, radio):
+    """Versión asíncrona de verificar_stream: mismo contrato (radio, estado, info)"""
+    url = radio["url"]
+    variante = "profunda" if VALIDACION_PROFUNDA else None
+    cacheado = cache_probes.obtener(url, variante)
+    if cacheado:
+        estado, info = cacheado
+        return radio, estado, f"(cache) {info}"
+    if not resolvedor_dns.existe(host_de_url(url)):
+        return radio, "CAIDO", "Dominio inexistente (DNS)"
+    medios = None
+    if es_url_playlist(url):
+        medios = await resolvedor_playlists.resolver_async(sesion, semaforo, url)
+    if medios == []:
+        estado, info = "CAIDO", "Playlist vacía"
+    elif medios and medios != [url]:
+        resultados = await asyncio.gather(*[_verificar_url_async(sesion, semaforo, medio) for medio in medios[:2]])
+        estado, info = _resultado_playlist(list(resultados))
+    elif resolvedor_stw.mount_de_url(url):
+        estado, info = await _verificar_stw_async(sesion, semaforo, url)
+    else:
+        estado, info = await _verificar_url_async(sesion, semaforo, url)
+    cache_probes.guardar(url, estado, info, variante)
     radio['nombre'] = ajustar_nombre_por_url(radio['nombre'], url)
     return radio, estado, info
 
+class _ResolvedorAiohttp:
+    """Resolver para aiohttp que reutiliza las resoluciones (y NXDOMAIN) de resolvedor_dns"""
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        ips = resolvedor_dns.obtener(host)
+        if ips is None:
+            ips = await asyncio.get_running_loop().run_in_executor(None, resolvedor_dns.resolver, host)
+        if family != socket.AF_UNSPEC:
+            ips = [ip for ip in (ips or []) if (socket.AF_INET6 if ":" in ip else socket.AF_INET) == family]
+        if not ips:
+            raise OSError(f"No se pudo resolver {host}")
+        return [{
+            "hostname": host, "host": ip, "port": port,
+            "family": socket.AF_INET6 if ":" in ip else socket.AF_INET,
+            "proto": 0, "flags": socket.AI_NUMERICHOST
+        } for ip in ips]
+    async def close(self):
+        pass
+
+async def _verificar_lote_async(radios, cola, detener, max_concurrencia, max_por_host):
+    """Lanza todas las verificaciones en un solo event loop y publica cada resultado en la cola"""
+    semaforo = asyncio.Semaphore(max_concurrencia)
+    # El cupo por host lo maneja control_hosts (AIMD); el conector solo pone el techo
+    conector = aiohttp.TCPConnector(limit=max_concurrencia, limit_per_host=control_hosts.cupo_maximo, resolver=_ResolvedorAiohttp())
+    async with aiohttp.ClientSession(connector=conector, cookie_jar=aiohttp.DummyCookieJar()) as sesion:
+        async def verificar(idx, radio):
+            try:
+                resultado = await _verificar_stream_async(sesion, semaforo, radio)
+            except Exception as e:
+                resultado = (radio, "CAIDO", str(e))
+            cola.put((idx, resultado))
+        pendientes = {asyncio.create_task(verificar(i, r)) for i, r in enumerate(radios)}
+        while pendientes:
+            _, pendientes = await asyncio.wait(pendientes, timeout=0.5)
+            if detener.is_set():
+                for tarea in pendientes:
+                    tarea.cancel()
+                await asyncio.gather(*pendientes, return_exceptions=True)
+                break
+
+def _verificar_lote_hilos(radios, max_hilos):
+    """Motor de verificación con hilos (usado cuando aiohttp no está instalado)"""
+    executor = ThreadPoolExecutor(max_workers=max_hilos)
+    try:
+        future_to_index = {executor.submit(verificar_stream, radio): i for i, radio in enumerate(radios)}
+        for future in as_completed(future_to_index):
+            idx = future_to_index[future]
+            try:
+                resultado = future.result()
+            except Exception as e:
+                resultado = (radios[idx], "CAIDO", str(e))
+            yield idx, resultado
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def verificar_streams_en_lote(radios, max_concurrencia=MAX_CONCURRENCIA_ASYNC, max_por_host=MAX_CONEXIONES_POR_HOST):
+    """
+    Verifica todas las radios y va entregando (índice, (radio, estado, info)) a medida que terminan.
+    Con aiohttp mantiene cientos de verificaciones en vuelo en un único hilo, limitando
+    el total con max_concurrencia y las conexiones simultáneas a un mismo host con max_por_host.
+    Sin aiohttp cae al pool de hilos de siempre (MAX_THREADS).
+    Antes de empezar resuelve en lote todos los hosts, así los dominios que ya no
+    existen se descartan al instante y el resto llega con el DNS resuelto.
+    max_por_host es el cupo inicial de cada host; después lo ajusta control_hosts.
+    """
+    control_hosts.reiniciar(max_por_host)
+    hosts = [host_de_url(r["url"]) for r in radios]
+    resueltos = resolvedor_dns.resolver_lote(hosts)
+    inexistentes = sum(1 for ips in resueltos.values() if ips == [])
+    if inexistentes:
+        print(f"     🌐 DNS: {inexistentes} de {len(resueltos)} dominios no existen")
+    resolvedor_stw.precargar([r["url"] for r in radios])
+    if _cargar_aiohttp() is None:
+        yield from _verificar_lote_hilos(radios, MAX_THREADS)
+        return
+    cola = queue.Queue()
+    detener = Event()
+    fin = object()
+    fallo = Event()
+    def correr_loop():
+        try:
+            asyncio.run(_verificar_lote_async(radios, cola, detener, max_concurrencia, max_por_host))
+        except Exception as e:
+            print(f"     ⚠️ Error en el motor asíncrono: {e}")
+            fallo.set()
+        finally:
+            cola.put(fin)
+    hilo = Thread(target=correr_loop, daemon=True)
+    hilo.start()
+    entregados = set()
+    try:
+        while True:
+            item = cola.get()
+            if item is fin:
+                break
+            entregados.add(item[0])
+            yield item
+        faltantes = [i for i in range(len(radios)) if i not in entregados]
+        if fallo.is_set() and faltantes:
+            # Lo que el loop no llegó a entregar se verifica con el motor de hilos
+            print(f"     🔁 Verificando con hilos las {len(faltantes)} radios que quedaron pendientes")
+            for i, resultado in _verificar_lote_hilos([radios[i] for i in faltantes], MAX_THREADS):
+                yield faltantes[i], resultado
+    finally:
+        detener.set()
+
+def limpiar_nombre_radio(nombre):
+    """Limpia el nombre de la radio (quita asteriscos, etc)"""
+    nombre = nombre.strip()
+    nombre = nombre.replace('*', '')
+    nombre = ' '.join(nombre.split())
+    return nombre
+
+def tokens_nombre_radio(nombre):
+    """
+    Tokens comparables de un nombre de radio: limpio, sin acentos ni paréntesis, en
+    minúscula y sin palabras genéricas ("radio", "fm"...). Las frecuencias quedan ("100.7").
+    """
+    nombre = re.sub(r'\(.*?\)', ' ', limpiar_nombre_radio(nombre).lower())
+    nombre = unicodedata.normalize("NFKD", nombre).encode("ascii", "ignore").decode("ascii")
+    tokens = re.findall(r'\d+(?:[.,]\d+)?|[a-z0-9]+', nombre)
+    return [t.replace(',', '.') for t in tokens if t not in PALABRAS_GENERICAS_NOMBRE]
+
+class IndiceRadioBrowser:
+    """
+    Copia local de todas las estaciones AR de Radio Browser (una descarga cada
+    TTL_INDICE_RADIO_BROWSER) con un índice invertido por token del nombre.
+    Las búsquedas se resuelven en memoria con coincidencia por tokens + difflib,
+    y si la API no responde se sigue usando la última copia descargada.
+    La descarga corre fuera de _lock (un solo hilo a la vez, con _carga_lock): mientras
+    tanto las demás búsquedas van a la API en vez de quedar esperando.
+    """
+    def __init__(self, ruta=ARCHIVO_INDICE_RADIO_BROWSER, ttl=TTL_INDICE_RADIO_BROWSER):
+        self.ruta = ruta
+        self.ttl = ttl
+        self._estaciones = None
+        self._por_token = {}
+        self._lock = Lock()
+        self._carga_lock = Lock()
+        self._reintentar_desde = 0
+    def _descargar(self):
+        """Baja el listado completo de AR y lo guarda compacto: [nombre, url, votos]"""
+        print(f"    📚 Descargando índice de Radio Browser (AR)...")
+        response = obtener_sesion_http().get(URL_INDICE_RADIO_BROWSER, params={"hidebroken": "true"}, timeout=30)
+        response.raise_for_status()
+        estaciones = []
+        for station in response.json():
+            url_stream = station.get("url_resolved") or station.get("url")
+            if url_stream:
+                estaciones.append([station.get("name", "Desconocida"), url_stream, station.get("votes", 0)])
+        try:
+            temporal = f"{self.ruta}.tmp"
+            with open(temporal, "w", encoding="utf-8") as f:
+                json.dump({"descargado": time.time(), "estaciones": estaciones}, f, ensure_ascii=False)
+            os.replace(temporal, self.ruta)
+        except Exception as e:
+            print(f"    ⚠️ No se pudo guardar el índice de Radio Browser: {e}")
+        return estaciones
+    def cargar(self):
+        """
+        Carga el índice (del disco si está vigente, si no lo descarga); devuelve False si no hay
+        ninguno o si otro hilo lo está cargando en este momento.
+        """
+        with self._lock:
+            if self._estaciones is not None:
+                return True
+            if time.time() < self._reintentar_desde:
+                return False
+        if not self._carga_lock.acquire(blocking=False):
+            return False
+        try:
+            with self._lock:
+                if self._estaciones is not None:
+                    return True
+            guardado = None
+            if os.path.exists(self.ruta):
+                try:
+                    with open(self.ruta, "r", encoding="utf-8") as f:
+                        guardado = json.load(f)
+                except Exception as e:
+                    print(f"    ⚠️ No se pudo leer el índice de Radio Browser: {e}")
+            estaciones = None
+            if guardado and time.time() - guardado.get("descargado", 0) < self.ttl:
+                estaciones = guardado.get("estaciones", [])
+            else:
+                try:
+                    estaciones = self._descargar()
+                except Exception as e:
+                    print(f"    ⚠️ No se pudo descargar el índice de Radio Browser: {e}")
+                    if guardado:
+                        print(f"    📚 Usando la copia local vencida del índice")
+                        estaciones = guardado.get("estaciones", [])
+            if estaciones is None:
+                # Sin API ni copia local: no reintentar la descarga en cada radio caída
+                with self._lock:
+                    self._reintentar_desde = time.time() + 600
+                return False
+            por_token = {}
+            for i, (nombre, _, _) in enumerate(estaciones):
+                for token in set(tokens_nombre_radio(nombre)):
+                    por_token.setdefault(token, []).append(i)
+            with self._lock:
+                self._estaciones, self._por_token = estaciones, por_token
+            print(f"    📚 Índice de Radio Browser: {len(estaciones)} estaciones")
+            return True
+        finally:
+            self._carga_lock.release()
+    def buscar(self, nombre, limite=10):
+        """
+        Devuelve hasta `limite` estaciones ({"name", "url", "votes"}) ordenadas por similitud
+        y votos, o None si no hay índice disponible (hay que ir a la API).
+        """
+        if not self.cargar():
+            return None
+        with self._lock:
+            estaciones, por_token = self._estaciones, self._por_token
+        tokens = tokens_nombre_radio(nombre)
+        if not tokens:
+            return []
+        candidatas = set()
+        for token in tokens:
+            for parecido in difflib.get_close_matches(token, por_token.keys(), n=3, cutoff=0.85) if token not in por_token else [token]:
+                candidatas.update(por_token[parecido])
+        texto = " ".join(tokens)
+        puntuadas = []
+        for i in candidatas:
+            nombre_est, url_stream, votos = estaciones[i]
+            tokens_est = tokens_nombre_radio(nombre_est)
+            cobertura = sum(1 for t in tokens if t in tokens_est or difflib.get_close_matches(t, tokens_est, n=1, cutoff=0.85)) / len(tokens)
+            parecido = difflib.SequenceMatcher(None, texto, " ".join(tokens_est)).ratio()
+            puntaje = 0.7 * cobertura + 0.3 * parecido
+            if puntaje >= SIMILITUD_MINIMA_NOMBRE:
+                puntuadas.append((puntaje, votos, {"name": nombre_est, "url": url_stream, "votes": votos}))
+        puntuadas.sort(key=lambda x: (x[0], x[1]), reverse=True)
+        return [estacion for _, _, estacion in puntuadas[:limite]]
+
+indice_radio_browser = IndiceRadioBrowser()
+
+def clave_estacion(nombre):
+    """Clave estable de una radio para la base de descubrimientos (tokens normalizados del nombre)"""
+    return " ".join(tokens_nombre_radio(nombre)) or limpiar_nombre_radio(nombre).lower()
+
+class BaseDescubrimientos:
+    """
+    Memoria persistente (SQLite) de las búsquedas automáticas, por nombre de radio normalizado:
+    - ganadores: de dónde salió el último stream que funcionó (fuente, sitio, iframe y selector de play).
+    - perdedores: sitios candidatos que ya se analizaron sin encontrar nada.
+    La próxima búsqueda prueba primero el camino ganador y saltea los perdedores recientes
+    que fallaron al menos FALLOS_PARA_DESCARTAR veces (un corte de red aislado no alcanza).
+    """
+    def __init__(self, ruta=ARCHIVO_DESCUBRIMIENTOS):
+        self.ruta = ruta
+        self._lock = Lock()
+        self._inicializada = False
+    def _conectar(self):
+        conexion = sqlite3.connect(self.ruta, timeout=10)
+        if not self._inicializada:
+            conexion.executescript("""
+                CREATE TABLE IF NOT EXISTS ganadores (
+                    estacion TEXT PRIMARY KEY, origen TEXT, sitio TEXT, stream TEXT,
+                    selector TEXT, exitos INTEGER DEFAULT 1, actualizado REAL, iframe TEXT
+                );
+                CREATE TABLE IF NOT EXISTS perdedores (
+                    estacion TEXT, sitio TEXT, fallos INTEGER DEFAULT 1, actualizado REAL,
+                    PRIMARY KEY (estacion, sitio)
+                );
+            """)
+            columnas = {fila[1] for fila in conexion.execute("PRAGMA table_info(ganadores)")}
+            if "iframe" not in columnas:
+                conexion.execute("ALTER TABLE ganadores ADD COLUMN iframe TEXT")
+            self._inicializada = True
+        return conexion
+    def _ejecutar(self, consulta, parametros=(), leer=False):
+        try:
+            with self._lock:
+                conexion = self._conectar()
+                try:
+                    with conexion:
+                        cursor = conexion.execute(consulta, parametros)
+                        return cursor.fetchall() if leer else None
+                finally:
+                    conexion.close()
+        except Exception as e:
+            print(f"    ⚠️ Error en la base de descubrimientos: {e}")
+            return [] if leer else None
+    def ganador(self, nombre):
+        """Último camino ganador de la radio ({"origen", "sitio", "stream", "selector", "iframe"}) o None"""
+        filas = self._ejecutar(
+            "SELECT origen, sitio, stream, selector, iframe FROM ganadores WHERE estacion = ?",
+            (clave_estacion(nombre),), leer=True
+        )
+        if not filas:
+            return None
+        return dict(zip(["origen", "sitio", "stream", "selector", "iframe"], filas[0]))
+    def registrar_ganador(self, nombre, origen, stream, sitio=None, selector=None, iframe=None):
+        estacion = clave_estacion(nombre)
+        self._ejecutar(
+            """INSERT INTO ganadores (estacion, origen, sitio, stream, selector, iframe, exitos, actualizado)
+               VALUES (?, ?, ?, ?, ?, ?, 1, ?)
+               ON CONFLICT(estacion) DO UPDATE SET origen = excluded.origen, sitio = excluded.sitio,
+                   stream = excluded.stream, selector = excluded.selector, iframe = excluded.iframe,
+                   exitos = ganadores.exitos + 1, actualizado = excluded.actualizado""",
+            (estacion, origen, sitio, stream, selector, iframe, time.time())
+        )
+        if sitio:
+            self._ejecutar("DELETE FROM perdedores WHERE estacion = ? AND sitio = ?", (estacion, sitio))
+    def registrar_perdedor(self, nombre, sitio):
+        self._ejecutar(
+            """INSERT INTO perdedores (estacion, sitio, fallos, actualizado) VALUES (?, ?, 1, ?)
+               ON CONFLICT(estacion, sitio) DO UPDATE SET fallos = perdedores.fallos + 1,
+                   actualizado = excluded.actualizado""",
+            (clave_estacion(nombre), sitio, time.time())
+        )
+    def perdedores(self, nombre, ttl=TTL_PERDEDORES, minimo_fallos=FALLOS_PARA_DESCARTAR):
+        """Sitios que fallaron para esta radio al menos `minimo_fallos` veces, la última en los últimos `ttl` segundos"""
+        filas = self._ejecutar(
+            "SELECT sitio FROM perdedores WHERE estacion = ? AND actualizado > ? AND fallos >= ?",
+            (clave_estacion(nombre), time.time() - ttl, minimo_fallos), leer=True
+        )
+        return {fila[0] for fila in filas}
+
+base_descubrimientos = BaseDescubrimientos()
+
+class ConexionCDP:
+    """
+    Conexión propia al DevTools Protocol del Chrome que levanta chromedriver.
+    Chrome empuja los eventos de red por el websocket apenas ocurren, en vez de esperar
+    a que los pidamos con get_log('performance'). Con Target.setAutoAttach (flatten) cada
+    pestaña, popup e iframe fuera de proceso queda adjunta con su propia sesión, así que
+    los eventos llegan etiquetados con el target que los generó.
+    """
+    TIPOS_ADJUNTABLES = ("page", "iframe")
+    def __init__(self, debugger_address, timeout=5):
+        self.debugger_address = debugger_address
+        self.timeout = timeout
+        self.ws = None
+        self.activa = False
+        self._siguiente_id = 0
+        self._id_lock = Lock()
+        self._pendientes = {}
+        self._suscriptores = {}
+        self._al_adjuntar = []
+        self.sesiones = {}
+        self._hilo = None
+    def conectar(self):
+        """Abre el websocket del navegador y se adjunta a todos los targets actuales y futuros"""
+        if _cargar_websocket() is None:
+            raise RuntimeError("websocket-client no está instalado")
+        info = obtener_sesion_http().get(f"http://{self.debugger_address}/json/version", timeout=self.timeout).json()
+        self.ws = websocket.create_connection(info["webSocketDebuggerUrl"], timeout=self.timeout, suppress_origin=True)
+        self.ws.settimeout(None)
+        self.activa = True
+        self._hilo = Thread(target=self._leer_eventos, daemon=True)
+        self._hilo.start()
+        self.enviar("Target.setDiscoverTargets", {"discover": True})
+        self.enviar("Target.setAutoAttach", {"autoAttach": True, "waitForDebuggerOnStart": False, "flatten": True})
+        adjuntos = {t.get("targetId") for t in self.sesiones.values()}
+        for target in self.enviar("Target.getTargets").get("targetInfos", []):
+            if target.get("type") in self.TIPOS_ADJUNTABLES and target.get("targetId") not in adjuntos:
+                self.enviar("Target.attachToTarget", {"targetId": target["targetId"], "flatten": True}, esperar=False)
+    def suscribir(self, metodo, callback):
+        """Registra callback(params, session_id) para un evento CDP (ej: Network.requestWillBeSent)"""
+        self._suscriptores.setdefault(metodo, []).append(callback)
+    def al_adjuntar(self, callback):
+        """Registra callback(session_id, target_info) que se ejecuta por cada target nuevo (habilitar dominios, etc)"""
+        self._al_adjuntar.append(callback)
+        for session_id, target in list(self.sesiones.items()):
+            callback(session_id, target)
+    def target_de_sesion(self, session_id):
+        """targetId del target dueño de una sesión (coincide con el window handle de selenium en pestañas)"""
+        return self.sesiones.get(session_id, {}).get("targetId")
+    def enviar(self, metodo, params=None, session_id=None, esperar=True):
+        """
+        Manda un comando CDP. Con esperar=True bloquea hasta la respuesta y la devuelve;
+        no usar esperar=True desde un callback (corre en el hilo lector).
+        """
+        if not self.activa:
+            raise RuntimeError("Conexión CDP cerrada")
+        with self._id_lock:
+            self._siguiente_id += 1
+            id_msg = self._siguiente_id
+        mensaje = {"id": id_msg, "method": metodo, "params": params or {}}
+        if session_id:
+            mensaje["sessionId"] = session_id
+        pendiente = None
+        if esperar:
+            pendiente = {"evento": Event(), "respuesta": None}
+            self._pendientes[id_msg] = pendiente
+        self.ws.send(json.dumps(mensaje))
+        if not esperar:
+            return None
+        if not pendiente["evento"].wait(self.timeout):
+            self._pendientes.pop(id_msg, None)
+            raise TimeoutError(f"CDP no respondió a {metodo}")
+        respuesta = pendiente["respuesta"]
+        if "error" in respuesta:
+            raise RuntimeError(f"CDP {metodo}: {respuesta['error'].get('message')}")
+        return respuesta.get("result", {})
+    def _leer_eventos(self):
+        """Hilo lector: resuelve respuestas pendientes y reparte eventos a los suscriptores"""
+        while self.activa:
+            try:
+                mensaje = json.loads(self.ws.recv())
+            except Exception:
+                break
+            if "id" in mensaje:
+                pendiente = self._pendientes.pop(mensaje["id"], None)
+                if pendiente:
+                    pendiente["respuesta"] = mensaje
+                    pendiente["evento"].set()
+                continue
+            metodo = mensaje.get("method")
+            params = mensaje.get("params", {})
+            if metodo == "Target.attachedToTarget":
+                target = params.get("targetInfo", {})
+                if target.get("type") not in self.TIPOS_ADJUNTABLES:
+                    continue
+                self.sesiones[params["sessionId"]] = target
+                for callback in self._al_adjuntar:
+                    try:
+                        callback(params["sessionId"], target)
+                    except Exception:
+                        pass
+                continue
+            if metodo == "Target.detachedFromTarget":
+                self.sesiones.pop(params.get("sessionId"), None)
+                continue
+            for callback in self._suscriptores.get(metodo, []):
+                try:
+                    callback(params, mensaje.get("sessionId"))
+                except Exception:
+                    pass
+        self.activa = False
+        for pendiente in list(self._pendientes.values()):
+            pendiente["respuesta"] = {"error": {"message": "conexión cerrada"}}
+            pendiente["evento"].set()
+        self._pendientes.clear()
+    def cerrar(self):
+        self.activa = False
+        if self.ws:
+            try:
+                self.ws.close()
+            except:
+                pass
+        if self._hilo:
+            self._hilo.join(timeout=1)
+        self.ws = None
+        self._hilo = None
+        self.sesiones.clear()
+
+class GrabadorScreencast:
+    """
+    Graba el video de debug con Page.startScreencast: Chrome empuja frames JPEG por CDP
+    (solo cuando la pantalla cambia), sin tomar driver_lock ni pedir screenshots PNG.
+    - El hilo lector de CDP solo confirma el frame y guarda el último (si el encoder no
+      alcanzó a tomar el anterior, ese se saltea) y descarta los idénticos al previo.
+    - Un hilo encoder escribe a FPS fijo: el JPEG va directo al stdin de ffmpeg
+      (image2pipe) o, sin ffmpeg, se decodifica con cv2.imdecode para cv2.VideoWriter.
+      Si no llegó nada nuevo repite el último frame (sin volver a decodificarlo).
+    - Sigue al popup más nuevo mientras esté abierto, como hacía la grabación por screenshots.
+    """
+    def __init__(self, cdp, ruta, fps=FPS_GRABACION):
+        self.cdp = cdp
+        self.ruta = ruta
+        self.fps = fps
+        self.activo = False
+        self._condicion = Condition()
+        self._pendiente = None
+        self._ultimo_recibido = None
+        self._sesiones = []
+        self._hilo = None
+        self._ffmpeg = None
+        self._writer = None
+        self._tamano = None
+        self.recibidos = 0
+        self.duplicados = 0
+        self.salteados = 0
+        self.escritos = 0
+    def iniciar(self, session_id):
+        """Arranca el screencast en la sesión de la ventana actual y el hilo encoder"""
+        self.activo = True
+        self.seguir(session_id)
+        self._hilo = Thread(target=self._codificar, daemon=True)
+        self._hilo.start()
+    def seguir(self, session_id):
+        """Pasa a grabar otra página (popup nuevo); la anterior se retoma cuando esta se cierra"""
+        if not self.activo or session_id in self._sesiones:
+            return
+        self._sesiones.append(session_id)
+        ancho, alto = TAMANO_MAXIMO_SCREENCAST
+        self.cdp.enviar("Page.enable", {}, session_id=session_id, esperar=False)
+        self.cdp.enviar("Page.startScreencast", {
+            "format": "jpeg", "quality": CALIDAD_SCREENCAST,
+            "maxWidth": ancho, "maxHeight": alto, "everyNthFrame": 1
+        }, session_id=session_id, esperar=False)
+    def _sesion_grabada(self):
+        """Sesión más nueva que sigue abierta (los popups cerrados se descartan)"""
+        while len(self._sesiones) > 1 and self._sesiones[-1] not in self.cdp.sesiones:
+            self._sesiones.pop()
+        return self._sesiones[-1] if self._sesiones else None
+    def recibir(self, params, session_id):
+        """Callback de Page.screencastFrame (hilo lector de CDP): tiene que ser barato"""
+        try:
+            self.cdp.enviar("Page.screencastFrameAck", {"sessionId": params.get("sessionId")}, session_id=session_id, esperar=False)
+        except Exception:
+            pass
+        if not self.activo or session_id != self._sesion_grabada():
+            return
+        datos = params.get("data")
+        self.recibidos += 1
+        if not datos or datos == self._ultimo_recibido:
+            self.duplicados += 1
+            return
+        self._ultimo_recibido = datos
+        with self._condicion:
+            if self._pendiente is not None:
+                self.salteados += 1
+            self._pendiente = datos
+            self._condicion.notify()
+    def _abrir_encoder(self, jpeg):
+        """ffmpeg por pipe si está instalado; si no, cv2.VideoWriter con el tamaño del primer frame"""
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg:
+            self._ffmpeg = subprocess.Popen([
+                ffmpeg, "-loglevel", "error", "-y",
+                "-f", "image2pipe", "-c:v", "mjpeg", "-framerate", str(self.fps), "-i", "-",
+                "-vf", "scale=trunc(iw/2)*2:trunc(ih/2)*2",
+                "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p", self.ruta
+            ], stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            return
+        _cargar_video()
+        frame = cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR)
+        alto, ancho = frame.shape[:2]
+        self._tamano = (ancho, alto)
+        self._writer = cv2.VideoWriter(self.ruta, cv2.VideoWriter_fourcc(*'mp4v'), self.fps, self._tamano)
+    def _escribir(self, jpeg, frame_previo):
+        """Escribe un frame; devuelve el frame decodificado (cv2) para poder repetirlo"""
+        if self._ffmpeg is not None:
+            self._ffmpeg.stdin.write(jpeg)
+            return None
+        frame = frame_previo
+        if frame is None:
+            frame = cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR)
+            if (frame.shape[1], frame.shape[0]) != self._tamano:
+                frame = cv2.resize(frame, self._tamano)
+        self._writer.write(frame)
+        return frame
+    def _codificar(self):
+        """Hilo encoder: un frame por tick; si se atrasa, saltea ticks en vez de acumular"""
+        intervalo = 1 / self.fps
+        ultimo_jpeg = None
+        ultimo_frame = None
+        proximo = time.time()
+        while self.activo:
+            with self._condicion:
+                if self._pendiente is None and ultimo_jpeg is None:
+                    self._condicion.wait(0.5)
+                datos, self._pendiente = self._pendiente, None
+            try:
+                if datos is not None:
+                    ultimo_jpeg = base64.b64decode(datos)
+                    ultimo_frame = None
+                    if self._ffmpeg is None and self._writer is None:
+                        self._abrir_encoder(ultimo_jpeg)
+                        proximo = time.time()
+                if ultimo_jpeg is not None:
+                    ultimo_frame = self._escribir(ultimo_jpeg, ultimo_frame)
+                    self.escritos += 1
+            except Exception as e:
+                print(f"     ⚠️ Error en grabación: {e}")
+                break
+            proximo += intervalo
+            espera = proximo - time.time()
+            if espera > 0:
+                time.sleep(espera)
+            else:
+                proximo = time.time()
+    def detener(self):
+        """Corta el screencast y cierra el encoder; devuelve True si quedó un video escrito"""
+        self.activo = False
+        for session_id in self._sesiones:
+            try:
+                self.cdp.enviar("Page.stopScreencast", {}, session_id=session_id, esperar=False)
+            except Exception:
+                pass
+        with self._condicion:
+            self._condicion.notify()
+        if self._hilo:
+            self._hilo.join(timeout=2)
+        if self._ffmpeg is not None:
+            try:
+                self._ffmpeg.stdin.close()
+                self._ffmpeg.wait(timeout=10)
+            except Exception:
+                self._ffmpeg.kill()
+        if self._writer is not None:
+            self._writer.release()
+        print(f"      🎞️ Screencast: {self.recibidos} frames recibidos, {self.duplicados} duplicados, "
+              f"{self.salteados} salteados, {self.escritos} escritos")
+        return self.escritos > 0
+
 class RadioStreamFinder:
     def __init__(self, headless=True, grabar_video=False):
         self.headless = headless
@@ -163,24 +2138,49 @@ class RadioStreamFinder:
         self.thread_grabacion = None
         self.video_writer = None
         self.video_path = None
+        self._grabador = None
         self.driver_lock = Lock()
         self.last_exported_video = None
         self.monitoring_network = False
         self.thread_network = None
+        self.cdp = None
+        self._usar_cdp = True
+        self.bloquear_recursos = True
+        self._streams_por_target = {}
+        self._cancelar_busqueda = Event()
+        self._respaldo_sin_verificar = None
+        self._verificados_busqueda = {}
+        self._verificados_lock = Lock()
+        self._sitio_ganador = None
+        self._caminos_stream = {}
+        self._selector_preferido = None
+        self.escaneo_en_lote = True
         self._streams_detectados_pasivamente = set()
         self._streams_confirmados_pasivamente = set()
+        self._origenes_visitados = set()
+        self.navegador_ocupado = False
+        self._explorando_pestanas = False
+        self.analisis_completo = False
         self.verbose_network = True
+        self._ultima_actividad_red = 0
+        self.tiempos_fases = {}
     def iniciar_grabacion(self, nombre_archivo):
         """Inicia la grabación de video"""
         if not self.grabar_video or self.grabacion_activa:
             return
+        _asegurar_directorios_video()
         self.grabacion_activa = True
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         nombre_limpio = re.sub(r'[^\w\s-]', '', nombre_archivo).strip().replace(' ', '_')
         self.video_filename = f"debug_{nombre_limpio}_{timestamp}.mp4"
         self.video_path = os.path.join(TEMP_DIR, self.video_filename)
-        fps = 5
+        fps = FPS_GRABACION
         self.video_writer = None
+        if self._iniciar_screencast():
+            print(f"      🎥 Grabación iniciada (screencast CDP): {self.video_path}")
+            return
+        # OpenCV solo hace falta para el respaldo por screenshots (y el screencast sin ffmpeg)
+        _cargar_video()
         def grabar():
             """Función que corre en un thread separado"""
             while self.grabacion_activa:
@@ -227,15 +2227,44 @@ class RadioStreamFinder:
         self.thread_grabacion = Thread(target=grabar, daemon=True)
         self.thread_grabacion.start()
         print(f"      🎥 Grabación iniciada: {self.video_path}")
+    def _iniciar_screencast(self):
+        """Graba con GrabadorScreencast si hay conexión CDP; devuelve False para usar screenshots"""
+        if self.cdp is None or not self.cdp.activa:
+            return False
+        try:
+            with self.driver_lock:
+                target = self.driver.current_window_handle
+            session_id = next((s for s, info in list(self.cdp.sesiones.items()) if info.get("targetId") == target), None)
+            if session_id is None:
+                return False
+            self._grabador = GrabadorScreencast(self.cdp, self.video_path)
+            self._grabador.iniciar(session_id)
+            return True
+        except Exception as e:
+            print(f"      ⚠️ No se pudo iniciar el screencast ({e}), se graba con screenshots")
+            self._grabador = None
+            return False
+    def _evento_screencast_cdp(self, params, session_id):
+        grabador = self._grabador
+        if grabador is not None:
+            grabador.recibir(params, session_id)
+        elif self.cdp is not None:
+            self.cdp.enviar("Page.screencastFrameAck", {"sessionId": params.get("sessionId")}, session_id=session_id, esperar=False)
     def detener_grabacion(self):
         """Detiene la grabación de video"""
         if not self.grabacion_activa:
             return
         self.grabacion_activa = False
+        hay_video = False
+        if self._grabador is not None:
+            hay_video = self._grabador.detener()
+            self._grabador = None
         if self.thread_grabacion:
             self.thread_grabacion.join(timeout=2)
         if self.video_writer:
             self.video_writer.release()
+            hay_video = True
+        if hay_video:
             dest_path = os.path.join(EXPORTED_DIR, self.video_filename)
             try:
                 if os.path.exists(self.video_path):
@@ -247,20 +2276,88 @@ class RadioStreamFinder:
             except Exception as e:
                 print(f"      ❌ Error al exportar video: {e}")
         self.video_writer = None
-    def iniciar_monitoreo_red(self):
-        """Inicia el hilo de monitoreo de red"""
+    def iniciar_monitoreo_red(self, usar_cdp=False):
+        """
+        Inicia la captura de red. Con CDP se suscribe a los eventos push del navegador;
+        si no, levanta el hilo que hace polling de los logs de performance.
+        Devuelve False si se pidió CDP y no se pudo conectar.
+        """
         if self.monitoring_network:
-            return
+            return True
+        if usar_cdp:
+            return self._iniciar_monitoreo_cdp()
         self.monitoring_network = True
         self.thread_network = Thread(target=self._monitor_network_logic, daemon=True)
         self.thread_network.start()
         print("      🌐 Monitoreo de red activo (Capturando requests...)")
+        return True
+    def _iniciar_monitoreo_cdp(self):
+        """Conecta ConexionCDP al navegador y habilita Network en cada target adjunto"""
+        try:
+            direccion = self.driver.capabilities["goog:chromeOptions"]["debuggerAddress"]
+            cdp = ConexionCDP(direccion)
+            cdp.suscribir("Network.requestWillBeSent", self._evento_request_cdp)
+            cdp.suscribir("Network.responseReceived", self._evento_response_cdp)
+            cdp.suscribir("Network.loadingFailed", lambda params, session_id: self._registrar_carga_fallida(params))
+            cdp.suscribir("Network.loadingFinished", lambda params, session_id: self._registrar_carga_terminada(params))
+            cdp.suscribir("Page.screencastFrame", self._evento_screencast_cdp)
+            cdp.al_adjuntar(lambda session_id, target: self._preparar_target_cdp(cdp, session_id, target))
+            cdp.conectar()
+        except Exception as e:
+            print(f"      ⚠️ No se pudo conectar por CDP ({e})")
+            try:
+                cdp.cerrar()
+            except:
+                pass
+            return False
+        self.cdp = cdp
+        self.monitoring_network = True
+        print("      🌐 Monitoreo de red activo por CDP (eventos en vivo)")
+        return True
+    def _preparar_target_cdp(self, cdp, session_id, target=None):
+        """Habilita Network en un target recién adjunto, le aplica el bloqueo de recursos y, si se graba, sigue al popup"""
+        cdp.enviar("Network.enable", {}, session_id=session_id, esperar=False)
+        if self.bloquear_recursos:
+            cdp.enviar("Network.setBlockedURLs", {"urls": patrones_bloqueo_red(self.grabar_video)}, session_id=session_id, esperar=False)
+        if self._grabador is not None and (target or {}).get("type") == "page":
+            self._grabador.seguir(session_id)
+    def _registrar_carga_fallida(self, params):
+        """Cuenta los requests que cortó Network.setBlockedURLs (blockedReason 'inspector')"""
+        if params.get('blockedReason'):
+            estadisticas_bloqueo.registrar_bloqueo(params.get('type', 'Other'))
+    def _registrar_carga_terminada(self, params):
+        estadisticas_bloqueo.registrar_descarga(params.get('encodedDataLength', 0))
+    def _evento_request_cdp(self, params, session_id):
+        self._ultima_actividad_red = time.time()
+        url = params.get('request', {}).get('url')
+        if url:
+            self._analizar_url_request(url, params)
+            self._atribuir_stream_a_pestana(url, session_id)
+    def _evento_response_cdp(self, params, session_id):
+        self._ultima_actividad_red = time.time()
+        url = params.get('response', {}).get('url')
+        if url:
+            self._analizar_url_response(url, params)
+            self._atribuir_stream_a_pestana(url, session_id)
+    def _atribuir_stream_a_pestana(self, url, session_id):
+        """Anota el stream en la pestaña candidata que lo pidió (o que abrió el popup que lo pidió)"""
+        if not self._streams_por_target or url not in self._streams_detectados_pasivamente:
+            return
+        info = self.cdp.sesiones.get(session_id, {}) if self.cdp else {}
+        target = info.get("targetId")
+        if target not in self._streams_por_target:
+            target = info.get("openerId")
+        if target in self._streams_por_target:
+            self._streams_por_target[target].add(url)
     def detener_monitoreo_red(self):
         """Detiene el monitoreo de red"""
         self.monitoring_network = False
         if self.thread_network:
             self.thread_network.join(timeout=1)
         self.thread_network = None
+        if self.cdp:
+            self.cdp.cerrar()
+        self.cdp = None
     def _monitor_network_logic(self):
         """Lógica del hilo de monitoreo: extrae logs de performance continuamente"""
         while self.monitoring_network:
@@ -273,6 +2370,8 @@ class RadioStreamFinder:
                             logs = []
                     else:
                         logs = []
+                if logs:
+                    self._ultima_actividad_red = time.time()
                 for entry in logs:
                     try:
                         msg = json.loads(entry['message'])['message']
@@ -286,6 +2385,10 @@ class RadioStreamFinder:
                             url = params.get('response', {}).get('url')
                             if url:
                                 self._analizar_url_response(url, params)
+                        elif method == 'Network.loadingFailed':
+                            self._registrar_carga_fallida(params)
+                        elif method == 'Network.loadingFinished':
+                            self._registrar_carga_terminada(params)
                     except:
                         continue
                 time.sleep(0.5)
@@ -296,10 +2399,20 @@ class RadioStreamFinder:
         PROCESAMIENTO DE REQUESTS (Desde el principio)
         Aquí es donde se analizan las URLs apenas se intentan solicitar.
         """
+        if params.get('type') == 'Document':
+            self._anotar_origen(url)
         if self._es_stream_audio(url):
             if url not in self._streams_detectados_pasivamente:
                 print(f"      🎵 Stream detectado al INICIAR solicitud: {url[:80]}...")
                 self._streams_detectados_pasivamente.add(url)
+    def _anotar_origen(self, url):
+        """Guarda el origen de cada documento cargado (página, popup o iframe) para limpiar su storage al devolver el navegador"""
+        try:
+            partes = urlparse(url)
+        except ValueError:
+            return
+        if partes.scheme in ('http', 'https') and partes.netloc:
+            self._origenes_visitados.add(f"{partes.scheme}://{partes.netloc.lower()}")
     def _analizar_url_response(self, url, params):
         """PROCESAMIENTO DE RESPUESTAS"""
         response = params.get('response', {})
@@ -307,11 +2420,7 @@ class RadioStreamFinder:
         content_type = (headers.get('content-type', '').lower() or
                        headers.get('Content-Type', '').lower() or
                        response.get('mimeType', '').lower())
-        tipos_audio = [
-            'audio/', 'mpegurl', 'video/mp2t', 'application/ogg',
-            'application/x-mpegurl', 'application/vnd.apple.mpegurl'
-        ]
-        if any(t in content_type for t in tipos_audio):
+        if es_tipo_audio(content_type, amplio=False):
             if url not in self._streams_confirmados_pasivamente:
                 print(f"      🎵 Stream CONFIRMADO por respuesta ({content_type}): {url[:80]}...")
                 self._streams_confirmados_pasivamente.add(url)
@@ -324,11 +2433,13 @@ class RadioStreamFinder:
                 return
             except Exception:
                 print("      ⚠️ Sesión expirada o driver cerrado, reiniciando...")
+                self.detener_monitoreo_red()
                 try:
                     self.driver.quit()
                 except:
                     pass
                 self.driver = None
+        _cargar_selenium()
         chrome_options = Options()
         if self.headless:
             chrome_options.add_argument('--headless=new')
@@ -371,21 +2482,64 @@ class RadioStreamFinder:
         chrome_options.add_experimental_option('useAutomationExtension', False)
         chrome_options.add_argument('--autoplay-policy=no-user-gesture-required')
         chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-        chrome_options.set_capability('goog:loggingPrefs', {
-            'performance': 'ALL',
-            'browser': 'ALL'
-        })
+        # Con websocket-client los eventos de red llegan por CDP y no hace falta que
+        # chromedriver acumule el log de performance (que crece si nadie lo vacía)
+        usar_cdp = self._usar_cdp and _cargar_websocket() is not None
+        if usar_cdp:
+            chrome_options.add_argument('--remote-allow-origins=*')
+            chrome_options.set_capability('goog:loggingPrefs', {
+                'browser': 'ALL'
+            })
+        else:
+            chrome_options.set_capability('goog:loggingPrefs', {
+                'performance': 'ALL',
+                'browser': 'ALL'
+            })
         self.driver = webdriver.Chrome(options=chrome_options)
+        # Acota cada driver.get: así una búsqueda cancelada suelta el navegador en segundos
+        self.driver.set_page_load_timeout(TIMEOUT_CARGA_PAGINA)
         self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        self.iniciar_monitoreo_red()
+        if not self.iniciar_monitoreo_red(usar_cdp):
+            print("      🔁 Relanzando navegador con captura por logs de performance...")
+            self._usar_cdp = False
+            with self.driver_lock:
+                try:
+                    self.driver.quit()
+                except:
+                    pass
+            self.driver = None
+            return self.setup_driver()
+        if not usar_cdp and self.bloquear_recursos:
+            # Sin conexión CDP propia solo se puede bloquear en la pestaña principal
+            try:
+                self.driver.execute_cdp_cmd("Network.enable", {})
+                self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patrones_bloqueo_red(self.grabar_video)})
+            except Exception as e:
+                print(f"      ⚠️ No se pudo activar el bloqueo de recursos: {e}")
         print("      ⏳ Navegador iniciando con 5s de paciencia...")
         time.sleep(5)
+    def _cargar_pagina(self, url):
+        """
+        driver.get acotado por TIMEOUT_CARGA_PAGINA: si la página no termina de cargar se frena y
+        se sigue con lo que haya. Devuelve True solo si cargó completa (sin timeout ni página de error de Chrome).
+        """
+        with self.driver_lock:
+            try:
+                self.driver.get(url)
+            except TimeoutException:
+                print(f"      ⏱️ La página no terminó de cargar en {TIMEOUT_CARGA_PAGINA}s, se sigue con lo cargado")
+                try:
+                    self.driver.execute_script("window.stop();")
+                except Exception:
+                    pass
+                return False
+            try:
+                return not self.driver.current_url.startswith("chrome-error://")
+            except Exception:
+                return False
     def limpiar_nombre_radio(self, nombre):
         """Limpia el nombre de la radio (quita asteriscos, etc)"""
-        nombre = nombre.strip()
-        nombre = nombre.replace('*', '')
-        nombre = ' '.join(nombre.split())
-        return nombre
+        return limpiar_nombre_radio(nombre)
     def preparar_query_busqueda(self, nombre_radio):
         """Prepara la query de búsqueda optimizada"""
         nombre = self.limpiar_nombre_radio(nombre_radio)
@@ -402,9 +2556,13 @@ class RadioStreamFinder:
         search_url = f"https://html.duckduckgo.com/html/?q={quote_plus(query)}&kl=ar-es"
         print(f"    🔎 Buscando en DuckDuckGo: '{query}'")
         try:
-            with self.driver_lock:
-                self.driver.get(search_url)
-            time.sleep(10)
+            self._cargar_pagina(search_url)
+            def hay_resultados():
+                with self.driver_lock:
+                    if self.driver.find_elements(By.CSS_SELECTOR, '.result'):
+                        return True
+                return self._dom_listo()
+            self._esperar("busqueda", hay_resultados)
         except Exception as e:
             print(f"    ✗ Error cargando búsqueda: {e}")
             return []
@@ -514,9 +2672,36 @@ class RadioStreamFinder:
                 urls.append(f"https://www.{version}{tld}")
                 urls.append(f"https://{version}{tld}")
         return urls
+    def _escanear_dom_en_lote(self, selectores=()):
+        """
+        Corre SCRIPT_ESCANEO_DOM en el contexto actual (página, popup o iframe) y devuelve
+        {"medios", "botones", "iframes"} en un solo round-trip. None si el modo en lote está
+        apagado o el script falla; en ese caso se usan las consultas por elemento.
+        """
+        if not self.escaneo_en_lote:
+            return None
+        try:
+            with self.driver_lock:
+                if not self.driver:
+                    return None
+                return self.driver.execute_script(SCRIPT_ESCANEO_DOM, list(selectores))
+        except Exception as e:
+            print(f"      ⚠️ Escaneo del DOM en lote falló ({str(e)[:60]}), consultando elemento por elemento")
+            return None
+    def _candidatos_play(self, selector, botones_lote):
+        """Candidatos de play de un selector: del escaneo en lote o, si no lo hay, consultando al driver"""
+        if botones_lote is not None:
+            return botones_lote.get(selector, [])
+        with self.driver_lock:
+            elementos = self.driver.find_elements(By.CSS_SELECTOR, selector)
+        return [{"elemento": elemento} for elemento in elementos]
     def _escanear_contexto_actual(self):
         """Escanea el DOM y retorna los streams detectados por el monitor de red en tiempo real"""
         encontrados = list(self._streams_detectados_pasivamente)
+        lote = self._escanear_dom_en_lote()
+        if lote is not None:
+            encontrados.extend(val for val in lote["medios"] if self._es_stream_audio(val))
+            return list(set(encontrados))
         for tag in ['audio', 'video', 'source', 'object', 'embed']:
             try:
                 with self.driver_lock:
@@ -532,28 +2717,64 @@ class RadioStreamFinder:
             except:
                 continue
         return list(set(encontrados))
+    def _heredar_camino(self, original, normalizada):
+        """La URL normalizada de un stream hereda el camino (selector, iframe) de la original; devuelve la normalizada"""
+        if normalizada != original and original in self._caminos_stream:
+            self._caminos_stream.setdefault(normalizada, self._caminos_stream[original])
+        return normalizada
+    def _es_iframe_player(self, src):
+        """True si el src de un iframe parece un reproductor embebido"""
+        return bool(src) and any(kw in src.lower() for kw in PALABRAS_IFRAME_PLAYER)
     def _buscar_en_iframes(self):
         """Busca streams dentro de iframes en el contexto actual"""
         streams_found = []
         try:
-            iframes = self.driver.find_elements(By.TAG_NAME, 'iframe')
+            lote = self._escanear_dom_en_lote()
+            if lote is not None:
+                iframes = [(iframe["elemento"], iframe["src"]) for iframe in lote["iframes"]]
+            else:
+                iframes = [(iframe, None) for iframe in self.driver.find_elements(By.TAG_NAME, 'iframe')]
             if not iframes:
                 return []
             print(f"      🖼️ Analizando {len(iframes)} iframes...")
-            for iframe in iframes:
+            if lote is not None:
+                srcs_player = list(dict.fromkeys(src for _, src in iframes if self._es_iframe_player(src) and src.startswith('http')))
+                en_paralelo = self._explorar_candidatos_en_pestanas(srcs_player[:MAX_PESTANAS_PARALELAS], "iframes de player")
+                if en_paralelo is not None:
+                    stream, src, sin_explorar = en_paralelo
+                    if stream:
+                        print(f"      ✅ Stream confirmado en iframe ({src[:60]})")
+                        self._caminos_stream.setdefault(stream, {}).setdefault("iframe", src)
+                        return [stream]
+                    # Los que no llegaron a explorarse en pestaña (o no entraron en el cupo) se recorren en serie
+                    sin_explorar = set(sin_explorar) | set(srcs_player[MAX_PESTANAS_PARALELAS:])
+                    iframes = [(iframe, src) for iframe, src in iframes if src in sin_explorar]
+            for iframe, iframe_src in iframes:
+                if self._cancelar_busqueda.is_set():
+                    break
                 try:
-                    iframe_src = iframe.get_attribute('src')
-                    if iframe_src and any(kw in iframe_src.lower() for kw in ['player', 'stream', 'listen', 'radio', 'vivo', 'embed', 'cast', 'media']):
+                    if lote is None:
+                        iframe_src = iframe.get_attribute('src')
+                    if self._es_iframe_player(iframe_src):
                         print(f"      📺 Analizando iframe: {iframe_src[:60]}...")
+                        streams_previos = len(streams_found)
+                        conocidos = set(self._streams_detectados_pasivamente)
                         self.driver.switch_to.frame(iframe)
-                        time.sleep(10)
+                        self._esperar_pagina("iframe")
                         streams_iframe = self._clickear_botones_play()
                         if isinstance(streams_iframe, list):
                             urls_validadas = [s for s in streams_iframe if isinstance(s, str) and s.startswith('http')]
                             streams_found.extend(urls_validadas)
-                        time.sleep(10)
+                        self._esperar_pagina("interaccion")
                         streams_found.extend(self._escanear_contexto_actual())
                         self.driver.switch_to.default_content()
+                        for s in streams_found[streams_previos:]:
+                            if s not in conocidos:
+                                self._caminos_stream.setdefault(s, {}).setdefault("iframe", iframe_src)
+                        nuevos = [self._heredar_camino(s, self._normalizar_url_stream(s)) for s in streams_found[streams_previos:]]
+                        if self._primer_stream_verificado(list(dict.fromkeys(nuevos))):
+                            print(f"      ✅ Stream confirmado en iframe, se saltean los restantes")
+                            break
                 except Exception:
                     try:
                         self.driver.switch_to.default_content()
@@ -563,22 +2784,66 @@ class RadioStreamFinder:
         except Exception as e:
             print(f"      ⚠️ Error buscando en iframes: {e}")
         return streams_found
-    def _esperar_stream(self, timeout):
-        """Espera hasta que se detecte un stream confirmado o se agote el tiempo"""
-        start = time.time()
-        confirmado_una_vez = False
-        while time.time() - start < timeout:
-            if self._streams_confirmados_pasivamente:
-                if not confirmado_una_vez:
-                    print(f"      🎵 Stream confirmado detectado, esperando 3s para estabilizar solicitud...")
-                    confirmado_una_vez = True
-                    time.sleep(3)
+    def _esperar(self, fase, condicion, timeout=None, intervalo=0.25):
+        """
+        Espera hasta que condicion() sea verdadera o venza el timeout de la fase
+        (TIEMPOS_ESPERA). Acumula el tiempo esperado en tiempos_fases y devuelve si se cumplió.
+        """
+        timeout = TIEMPOS_ESPERA[fase] if timeout is None else timeout
+        inicio = time.time()
+        cumplida = False
+        while time.time() - inicio < timeout and not self._cancelar_busqueda.is_set():
+            try:
+                if condicion():
+                    cumplida = True
+                    break
+            except Exception:
+                pass
+            time.sleep(intervalo)
+        self.tiempos_fases[fase] = self.tiempos_fases.get(fase, 0) + time.time() - inicio
+        return cumplida
+    def _dom_listo(self):
+        """True si el documento del contexto actual terminó de cargar"""
+        with self.driver_lock:
+            return self.driver.execute_script("return document.readyState") == "complete"
+    def _red_inactiva(self):
+        """True si el monitor de red no vio requests en los últimos RED_INACTIVA_SEGUNDOS"""
+        return time.time() - self._ultima_actividad_red >= RED_INACTIVA_SEGUNDOS
+    def _esperar_pagina(self, fase, ventanas_previas=None):
+        """
+        Espera a que la página reaccione: aparece un stream confirmado nuevo, se abre una
+        ventana nueva (si se pasa ventanas_previas) o el DOM está listo y la red quedó quieta.
+        """
+        confirmados_previos = len(self._streams_confirmados_pasivamente)
+        self._ultima_actividad_red = time.time()
+        def hay_senal():
+            if len(self._streams_confirmados_pasivamente) > confirmados_previos:
                 return True
-            time.sleep(0.5)
+            if ventanas_previas is not None:
+                with self.driver_lock:
+                    if len(self.driver.window_handles) > ventanas_previas:
+                        return True
+            return self._dom_listo() and self._red_inactiva()
+        return self._esperar(fase, hay_senal)
+    def _esperar_stream(self, timeout=None):
+        """Espera hasta que se detecte un stream confirmado o se agote el tiempo"""
+        if self._esperar("actividad_repositorio", lambda: bool(self._streams_confirmados_pasivamente), timeout):
+            print(f"      🎵 Stream confirmado detectado, esperando a que se estabilice la solicitud...")
+            self._esperar("estabilizacion", self._red_inactiva)
+            return True
         return False
+    def _reportar_tiempos_fases(self):
+        """Muestra cuánto se esperó en cada fase de la búsqueda"""
+        if self.tiempos_fases:
+            detalle = ", ".join(f"{fase} {segundos:.1f}s" for fase, segundos in self.tiempos_fases.items())
+            print(f"    ⏱️ Tiempo de espera por fase: {detalle}")
     def extraer_streams(self, url, nombre_radio=None):
-        """Extrae streams de una URL"""
+        """
+        Extrae streams de una URL. Deja en self.analisis_completo si la página cargó y se
+        escaneó entera (para no anotar como perdedor un sitio que falló por la red).
+        """
         streams = []
+        self.analisis_completo = False
         es_repo = "radios-argentinas.org" in url
         try:
             if self.grabar_video:
@@ -588,11 +2853,11 @@ class RadioStreamFinder:
                     id_video = urlparse(url).netloc.replace('.', '_')
                 self.iniciar_grabacion(id_video)
             print(f"      📡 Cargando página...")
-            with self.driver_lock:
-                self.driver.get(url)
+            self._anotar_origen(url)
+            cargada = self._cargar_pagina(url)
             if es_repo:
-                print(f"      ⏳ Esperando actividad en el repositorio (máx 12s)...")
-                if self._esperar_stream(12):
+                print(f"      ⏳ Esperando actividad en el repositorio (máx {TIEMPOS_ESPERA['actividad_repositorio']}s)...")
+                if self._esperar_stream():
                     print(f"      ✅ Actividad detectada rápidamente!")
                 else:
                     if "/embed/" not in url:
@@ -600,7 +2865,7 @@ class RadioStreamFinder:
                     else:
                         print(f"      ⏱️ Sin actividad inmediata en embed, seguiremos analizando...")
             else:
-                time.sleep(10)
+                self._esperar_pagina("carga")
             if "radios-argentinas.org" in url and "/embed/" not in url:
                 print(f"      🇦🇷 Analizando estructura de radios-argentinas.org...")
                 try:
@@ -614,10 +2879,9 @@ class RadioStreamFinder:
                             embed_url = f"http://e.radios-argentinas.org/embed/{popup_id}"
                             print(f"      🚀 Popup ID detectado: {popup_id}")
                             print(f"      🔗 Redirigiendo página principal a: {embed_url}")
-                            with self.driver_lock:
-                                self.driver.get(embed_url)
-                            print(f"      ⏳ Esperando actividad en embed (máx 12s)...")
-                            if self._esperar_stream(12):
+                            self._cargar_pagina(embed_url)
+                            print(f"      ⏳ Esperando actividad en embed (máx {TIEMPOS_ESPERA['actividad_repositorio']}s)...")
+                            if self._esperar_stream():
                                 print(f"      ✅ Actividad detectada en embed!")
                             else:
                                 print(f"      ⚠️ No se detectó actividad automática en embed. Intentaremos clickear.")
@@ -634,7 +2898,7 @@ class RadioStreamFinder:
                     if isinstance(streams_encontrados, list):
                         urls_validadas = [s for s in streams_encontrados if isinstance(s, str) and s.startswith('http')]
                         streams.extend(urls_validadas)
-                    time.sleep(10)
+                    self._esperar_pagina("interaccion")
                     streams.extend(self._escanear_contexto_actual())
             else:
                 print(f"      ✅ Stream detectado pasivamente")
@@ -644,6 +2908,7 @@ class RadioStreamFinder:
                 if streams_iframes:
                     streams.extend(self._escanear_contexto_actual())
             self._imprimir_logs_consola()
+            self.analisis_completo = cargada and not self._cancelar_busqueda.is_set()
             if self.grabar_video:
                 self.detener_grabacion()
         except Exception as e:
@@ -654,7 +2919,7 @@ class RadioStreamFinder:
         streams = list(set(streams))
         streams_procesados = []
         for s in streams:
-            url_norm = self._normalizar_url_stream(s)
+            url_norm = self._heredar_camino(s, self._normalizar_url_stream(s))
             streams_procesados.append(url_norm)
         streams = list(set(streams_procesados))
         candidatos_validos = []
@@ -697,51 +2962,50 @@ class RadioStreamFinder:
         """Busca y clickea el PRIMER botón de play que encuentre en el contexto actual.
            Retorna una lista de streams encontrados durante la interacción."""
         streams_interaccion = []
-        ventanas_originales = len(self.driver.window_handles)
-        selectores = [
-            'button#play_pause_button', '#play_pause_button',
-            '[class*="play"]', '[class*="Play"]', '[class*="PLAY"]',
-            '[class*="player"]', '[class*="Player"]',
-            '[class*="btn-play"]', '[class*="playButton"]', '[class*="play-button"]',
-            '[class*="btnPlay"]', '[class*="PlayBtn"]',
-            '[id*="play"]', '[id*="Play"]', '[id*="player"]',
-            '[id*="btnPlay"]', '[id*="playBtn"]',
-            '[aria-label*="play" i]', '[aria-label*="reproducir" i]',
-            '[aria-label*="Play" i]', '[aria-label*="Reproducir" i]',
-            '[title*="play" i]', '[title*="reproducir" i]',
-            'button[class*="icon-play"]', 'button[class*="fa-play"]',
-            'div[class*="icon-play"]', 'div[class*="fa-play"]',
-            'svg[class*="play"]', 'svg[aria-label*="play" i]',
-            '.player-button', '.audio-player button', '.radio-player button',
-            '.stream-button', '.live-button', '.online-button',
-            'div[onclick*="play"]', 'div[onclick*="stream"]',
-            'a[href*="play"]', 'a[href*="stream"]'
-        ]
+        with self.driver_lock:
+            handles_previos = set(self.driver.window_handles)
+            ventana_origen = self.driver.current_window_handle
+        ventanas_originales = len(handles_previos)
+        selectores = list(SELECTORES_PLAY)
+        if self._selector_preferido:
+            selectores.insert(0, self._selector_preferido)
+        lote = self._escanear_dom_en_lote(selectores)
+        botones_lote = lote["botones"] if lote is not None else None
         for selector in selectores:
+            if self._cancelar_busqueda.is_set():
+                break
             try:
-                with self.driver_lock:
-                    elementos = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if elementos:
-                    print(f"      🔎 Selector '{selector}' encontró {len(elementos)} candidato(s)")
-                for i, elemento in enumerate(elementos):
+                candidatos = self._candidatos_play(selector, botones_lote)
+                if candidatos:
+                    print(f"      🔎 Selector '{selector}' encontró {len(candidatos)} candidato(s)")
+                for i, candidato in enumerate(candidatos):
+                    elemento = candidato["elemento"]
                     try:
-                        with self.driver_lock:
-                            is_displayed = elemento.is_displayed()
-                            size = elemento.size
+                        if "visible" in candidato:
+                            is_displayed, size = candidato["visible"], candidato["tamano"]
+                        else:
+                            with self.driver_lock:
+                                is_displayed = elemento.is_displayed()
+                                size = elemento.size
                         if not is_displayed:
                             if any(kw in selector for kw in ['play', 'player', '#']):
                                 print(f"         ⚠️ Elemento {i} ({selector}) existe pero está ocultO (size: {size})")
                             continue
                         print(f"         🎯 Intentando interactuar con elemento {i} visible...")
+                        previos = len(streams_interaccion)
+                        conocidos = set(self._streams_detectados_pasivamente)
                         try:
-                            with self.driver_lock:
-                                onclick_attr = elemento.get_attribute('onclick')
+                            if "onclick" in candidato:
+                                onclick_attr = candidato["onclick"]
+                            else:
+                                with self.driver_lock:
+                                    onclick_attr = elemento.get_attribute('onclick')
                             if onclick_attr and ('openPopUp' in onclick_attr or 'window.open' in onclick_attr):
                                 print(f"      🚀 Ejecutando JS directamente (onclick): {onclick_attr[:60]}...")
                                 js_to_run = onclick_attr.replace('return ', '').strip()
                                 with self.driver_lock:
                                     self.driver.execute_script(js_to_run)
-                                time.sleep(10)
+                                self._esperar_pagina("popup", ventanas_originales)
                                 print(f"      🖱️ Script ejecutado exitosamente sin click físico")
                             else:
                                 try:
@@ -757,72 +3021,48 @@ class RadioStreamFinder:
                                     elemento.click()
                             except:
                                 pass
-                        time.sleep(10)
+                        self._esperar_pagina("interaccion", ventanas_originales)
                         streams_interaccion.extend(self._escanear_contexto_actual())
                         with self.driver_lock:
                             ventanas_actuales = len(self.driver.window_handles)
                         if ventanas_actuales > ventanas_originales:
                             print(f"      🪟 Popup detectado por el click, analizando...")
                             with self.driver_lock:
-                                self.driver.switch_to.window(self.driver.window_handles[-1])
-                            time.sleep(10)
+                                nuevas = [h for h in self.driver.window_handles if h not in handles_previos]
+                                self.driver.switch_to.window(nuevas[-1] if nuevas else self.driver.window_handles[-1])
+                            self._esperar_pagina("popup")
                             streams_interaccion.extend(self._escanear_contexto_actual())
                             streams_pop = self._clickear_botones_play()
                             streams_interaccion.extend(streams_pop)
                             streams_interaccion.extend(self._buscar_en_iframes())
-                            time.sleep(10)
+                            self._esperar_pagina("interaccion")
                             streams_interaccion.extend(self._escanear_contexto_actual())
                             with self.driver_lock:
                                 self.driver.close()
-                                if len(self.driver.window_handles) > 0:
+                                if ventana_origen in self.driver.window_handles:
+                                    self.driver.switch_to.window(ventana_origen)
+                                elif len(self.driver.window_handles) > 0:
                                     self.driver.switch_to.window(self.driver.window_handles[0])
+                        for s in streams_interaccion[previos:]:
+                            if s not in conocidos:
+                                camino = self._caminos_stream.setdefault(s, {})
+                                # El selector de adentro de un iframe es el que sirve al recargar el iframe
+                                if "iframe" not in camino:
+                                    camino["selector"] = selector
                         streams_validos = [s for s in streams_interaccion if isinstance(s, str) and s.startswith('http')]
                         if streams_validos:
                             return streams_interaccion
+                        if botones_lote is not None:
+                            lote = self._escanear_dom_en_lote(selectores)
+                            botones_lote = lote["botones"] if lote is not None else None
                     except Exception:
                         continue
             except Exception:
                 continue
         return streams_interaccion
-    def _es_stream_audio(self, url):
-        """Detecta si una URL es de audio streaming"""
-        if not url or not isinstance(url, str):
-            return False
-        url_lower = url.lower()
-        extensiones_ignorar = [
-            '.js', '.css', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico',
-            '.woff', '.woff2', '.ttf', '.eot', '.json', '.xml', '.html',
-            '.webp', '.map', '.txt'
-        ]
-        if any(url_lower.endswith(ext) for ext in extensiones_ignorar):
-            return False
-        palabras_ignorar = [
-            'duckduckgo.com', 'google.com', 'facebook.com',
-            '/js/', '/css/', '/images/', '/img/', '/fonts/',
-            '/assets/', '/_astro/', '/static/',
-            'analytics', 'tracking', 'pixel', 'advertisement'
-        ]
-        if any(palabra in url_lower for palabra in palabras_ignorar):
-            return False
-        extensiones_audio = ['.mp3', '.aac', '.aacp', '.m3u8', '.pls', '.m3u', '.ogg', '.oga']
-        if any(ext in url_lower for ext in extensiones_audio):
-            return True
-        keywords_validos = [
-            'icecast', 'shoutcast', 'streamtheworld',
-            '/stream', '/live', '/radio', '/audio',
-            'listen', 'player', 'broadcast', 'api/listening',
-        ]
-        parsed = urlparse(url)
-        path = parsed.path.lower()
-        if any(kw in path or kw in parsed.netloc.lower() for kw in keywords_validos):
-            if not any(ignore in path for ignore in ['/js/', '/css/', '/fonts/', '/images/']):
-                return True
-        if 'emisoraenvivo.com/api/listening/' in url_lower:
-            return True
-        if any(f':{port}' in url for port in ['8000', '8080', '8443', '9000', '7189']):
-            if not any(ext in url_lower for ext in extensiones_ignorar):
-                return True
-        return False
+    def _es_stream_audio(self, url):
+        """Detecta si una URL es de audio streaming"""
+        return es_url_stream_audio(url)
     def _normalizar_url_stream(self, url):
         """Transforma URLs de StreamTheWorld o APIs de terceros al formato de stream directo"""
         if not url or not isinstance(url, str):
@@ -841,7 +3081,7 @@ class RadioStreamFinder:
         if 'emisoraenvivo.com/api/listening/' in url_lower:
             try:
                 print(f"      📡 Consultando API de EmisoraEnvivo: {url[:60]}...")
-                response = requests.get(url, headers=HEADERS_STREAM, timeout=5)
+                response = obtener_sesion_http().get(url, headers=HEADERS_STREAM, timeout=5)
                 if response.status_code == 200:
                     data = response.json()
                     nueva_url = data.get('stream', {}).get('data', {}).get('url')
@@ -860,21 +3100,13 @@ class RadioStreamFinder:
         url_busqueda = f"https://www.radios-argentinas.org/busca?q={query}"
         print(f"    � Buscando en repositorio: {url_busqueda}")
         try:
-            with self.driver_lock:
-                self.driver.get(url_busqueda)
-            start_search = time.time()
-            found_results = False
-            while time.time() - start_search < 8:
-                try:
-                    elementos = self.driver.find_elements(By.CSS_SELECTOR, 'li.mdc-grid-tile a')
-                    if elementos:
-                        found_results = True
-                        break
-                except:
-                    pass
-                time.sleep(0.5)
-            if not found_results:
-                print(f"    ✗ No se encontraron resultados en el repositorio (timeout 8s)")
+            self._cargar_pagina(url_busqueda)
+            elementos = []
+            def hay_resultados():
+                elementos[:] = self.driver.find_elements(By.CSS_SELECTOR, 'li.mdc-grid-tile a')
+                return bool(elementos)
+            if not self._esperar("repositorio", hay_resultados, intervalo=0.5):
+                print(f"    ✗ No se encontraron resultados en el repositorio (timeout {TIEMPOS_ESPERA['repositorio']}s)")
                 return None
             mejor_href = None
             for el in elementos:
@@ -895,36 +3127,135 @@ class RadioStreamFinder:
             print(f"    ✗ Error en repositorio: {e}")
         return None
     def _verificar_stream_real(self, url):
-        """Verifica si un stream de audio está realmente activo y es del tipo correcto"""
+        """
+        Verifica si un stream de audio está realmente activo y es del tipo correcto.
+        El resultado queda memorizado durante la búsqueda actual (ver buscar_stream) como un
+        Future por URL: una URL que ya validó extraer_streams no se vuelve a pedir, y si otro
+        hilo la está probando se espera ese mismo probe. El memo se toma una sola vez al
+        entrar, así un probe que quedó corriendo de una búsqueda anterior escribe en el memo
+        de esa búsqueda y no en el de la actual.
+        """
+        with self._verificados_lock:
+            memo = self._verificados_busqueda
+            futuro = memo.get(url)
+            propio = futuro is None
+            if propio:
+                futuro = Future()
+                memo[url] = futuro
+        if propio:
+            resultado = False
+            try:
+                resultado = self._probar_stream_real(url)
+            finally:
+                futuro.set_result(resultado)
+        return futuro.result()
+    def _primer_stream_verificado(self, urls, max_hilos=5):
+        """
+        Verifica las URLs en paralelo y devuelve la de mejor ranking (la primera de la lista)
+        que pasa. Decide apenas fallaron todas las anteriores a una que pasó, sin esperar a
+        las de menor ranking.
+        """
+        urls = list(dict.fromkeys(u for u in urls if u))
+        if not urls:
+            return None
+        if len(urls) == 1:
+            return urls[0] if self._verificar_stream_real(urls[0]) else None
+        ganadora = None
+        resultados = {}
+        executor = ThreadPoolExecutor(max_workers=min(max_hilos, len(urls)))
         try:
-            r = requests.get(url, headers=HEADERS_STREAM, timeout=7, stream=True, allow_redirects=True)
-            ct = r.headers.get('Content-Type', '').lower()
-            tipos_audio = [
-                'audio/', 'mpegurl', 'video/mp2t', 'application/ogg',
-                'application/x-mpegurl', 'application/vnd.apple.mpegurl',
-                'application/octet-stream', 'video/mp4'
-            ]
-            is_icy = any(k.lower().startswith('icy-') for k in r.headers.keys())
-            if 'text/html' in ct or 'image/' in ct or 'text/javascript' in ct:
-                print(f"    ✗ Candidato rechazado por Content-Type no-audio: {ct}")
+            futuros = {executor.submit(self._verificar_stream_real, u): u for u in urls}
+            for futuro in as_completed(futuros):
+                try:
+                    resultados[futuros[futuro]] = bool(futuro.result())
+                except Exception:
+                    resultados[futuros[futuro]] = False
+                # La mejor URL que todavía no falló: si ya pasó, gana; si sigue pendiente, se la espera
+                mejor = next((u for u in urls if resultados.get(u) is not False), None)
+                if mejor is None:
+                    break
+                if resultados.get(mejor):
+                    ganadora = mejor
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return ganadora
+    def _probar_stream_real(self, url):
+        """Pide el stream y revisa status, Content-Type/ICY y que llegue contenido"""
+        if resolvedor_dns.resolver(host_de_url(url)) == []:
+            print(f"    ✗ Candidato descartado: el dominio no existe ({host_de_url(url)})")
+            return False
+        if es_url_playlist(url):
+            medios = resolvedor_playlists.resolver(url)
+            if medios == []:
+                print(f"    ✗ Candidato rechazado: playlist vacía")
                 return False
-            if not is_icy and not any(t in ct for t in tipos_audio):
-                if ct and ct != 'binary/octet-stream':
-                     print(f"    ⚠️ Content-Type inusual: {ct}. Verificando contenido...")
-            for _ in r.iter_content(chunk_size=1024):
-                break
-            if r.status_code < 400:
-                print(f"    ✅ Stream verificado! (Type: {ct if ct else 'unknown/icy'})")
+            if medios and medios != [url]:
+                print(f"    📃 Playlist con {len(medios)} entradas, verificando la media...")
+                return any(self._probar_stream_real(medio) for medio in medios[:2])
+        if VALIDACION_PROFUNDA:
+            estado, info = _probar_stream(url, 7, profunda=True)
+            if estado == "ACTIVO":
+                print(f"    ✅ Stream verificado! ({info})")
                 return True
+            print(f"    ✗ Candidato rechazado por contenido: {info}")
+            return False
+        try:
+            with obtener_sesion_http().get(url, headers=HEADERS_STREAM, timeout=7, stream=True, allow_redirects=True) as r:
+                ct = r.headers.get('Content-Type', '').lower()
+                is_icy = any(k.lower().startswith('icy-') for k in r.headers.keys())
+                if 'text/html' in ct or 'image/' in ct or 'text/javascript' in ct:
+                    print(f"    ✗ Candidato rechazado por Content-Type no-audio: {ct}")
+                    return False
+                if not is_icy and not es_tipo_audio(ct):
+                    if ct and ct != 'binary/octet-stream':
+                         print(f"    ⚠️ Content-Type inusual: {ct}. Verificando contenido...")
+                for _ in r.iter_content(chunk_size=1024):
+                    break
+                if r.status_code < 400:
+                    print(f"    ✅ Stream verificado! (Type: {ct if ct else 'unknown/icy'})")
+                    return True
         except Exception as e:
             pass
         return False
     def buscar_en_radio_browser(self, nombre_radio):
-        """Busca la radio usando la API de Radio Browser (working=true)"""
-        print(f"    🔍 Buscando en Radio Browser API: {nombre_radio}")
+        """Busca la radio en el índice local de Radio Browser; sin índice, consulta la API (working=true)"""
+        nombre_busqueda = self.limpiar_nombre_radio(nombre_radio)
+        nombre_limpio = re.sub(r'\(.*?\)', '', nombre_busqueda).strip()
+        try:
+            resultados = indice_radio_browser.buscar(nombre_limpio)
+        except Exception as e:
+            print(f"    ⚠️ Error consultando el índice de Radio Browser: {e}")
+            resultados = None
+        if resultados is None:
+            return self._buscar_en_api_radio_browser(nombre_limpio)
+        print(f"    🔍 Buscando en índice local de Radio Browser: {nombre_limpio}")
+        if not resultados:
+            print(f"    ❌ No se encontraron resultados en Radio Browser para: {nombre_limpio}")
+            return None
+        return self._probar_estaciones_radio_browser(resultados)
+    def _probar_estaciones_radio_browser(self, resultados):
+        """Verifica los candidatos de Radio Browser en orden y devuelve el primero que funciona"""
+        print(f"    ✨ Radio Browser encontró {len(resultados)} candidatos. Verificando en paralelo...")
+        urls = []
+        for station in resultados:
+            url_stream = station.get("url_resolved") or station.get("url")
+            if url_stream:
+                if not self._es_stream_audio(url_stream):
+                     continue
+                nombre_encontrado = station.get("name", "Desconocida")
+                print(f"    ⏳ Probando candidato: {nombre_encontrado} ({url_stream[:50]}...)")
+                urls.append(url_stream)
+        url_stream = self._primer_stream_verificado(urls)
+        if url_stream:
+            print(f"    ✅ Stream verificado desde Radio Browser!")
+            return url_stream
+        print(f"    ❌ Ninguno de los candidatos de Radio Browser funcionó.")
+        return None
+    def _buscar_en_api_radio_browser(self, nombre_limpio):
+        """Búsqueda en vivo contra la API de Radio Browser (cuando no hay índice local)"""
+        print(f"    🔍 Buscando en Radio Browser API: {nombre_limpio}")
         try:
-            nombre_busqueda = self.limpiar_nombre_radio(nombre_radio)
-            nombre_limpio = re.sub(r'\(.*?\)', '', nombre_busqueda).strip()
             url_api = "https://de1.api.radio-browser.info/json/stations/search"
             params = {
                 "name": nombre_limpio,
@@ -934,71 +3265,416 @@ class RadioStreamFinder:
                 "reverse": "true",
                 "countrycode": "AR"
             }
-            response = requests.get(url_api, params=params, timeout=10)
+            response = obtener_sesion_http().get(url_api, params=params, timeout=10)
             if response.status_code == 200:
                 resultados = response.json()
                 if not resultados:
                     print(f"    ❌ No se encontraron resultados en Radio Browser para: {nombre_limpio}")
                     return None
-                print(f"    ✨ Radio Browser encontró {len(resultados)} candidatos. Verificando...")
-                for station in resultados:
-                    url_stream = station.get("url_resolved") or station.get("url")
-                    if url_stream:
-                        if not self._es_stream_audio(url_stream):
-                             continue
-                        nombre_encontrado = station.get("name", "Desconocida")
-                        print(f"    ⏳ Probando candidato: {nombre_encontrado} ({url_stream[:50]}...)")
-                        if self._verificar_stream_real(url_stream):
-                             print(f"    ✅ Stream verificado desde Radio Browser!")
-                             return url_stream
-                print(f"    ❌ Ninguno de los candidatos de Radio Browser funcionó.")
+                return self._probar_estaciones_radio_browser(resultados)
             else:
                 print(f"    ❌ Error en Radio Browser API (Status: {response.status_code})")
         except Exception as e:
             print(f"    ❌ Error durante búsqueda en Radio Browser: {e}")
         return None
-    def buscar_stream(self, nombre_radio):
-        """Proceso completo de búsqueda: 1. API Radio Browser, 2. Repositorio, 3. DuckDuckGo"""
+    def buscar_stream(self, nombre_radio, en_carrera=True):
+        """
+        Proceso completo de búsqueda: API Radio Browser, repositorio, DuckDuckGo y URLs armadas.
+        Por defecto las fuentes compiten en paralelo (ver _buscar_stream_en_carrera).
+        """
+        self.tiempos_fases = {}
+        self._cancelar_busqueda.clear()
+        self._respaldo_sin_verificar = None
+        with self._verificados_lock:
+            self._verificados_busqueda = verificados = {}
+        self._sitio_ganador = None
+        self._caminos_stream = {}
+        try:
+            resultado = self._buscar_en_memoria(nombre_radio)
+            if not resultado[0]:
+                if en_carrera:
+                    resultado = self._buscar_stream_en_carrera(nombre_radio)
+                else:
+                    resultado = self._buscar_stream_secuencial(nombre_radio)
+            stream, origen = resultado
+            # Solo se recuerda un camino que terminó en un stream verificado (no el respaldo sin verificar)
+            verificado = verificados.get(stream)
+            if stream and origen != "Memoria" and verificado is not None and verificado.done() and verificado.result():
+                sitio = self._sitio_ganador if origen == "Navegador" else None
+                camino = self._caminos_stream.get(stream, {}) if sitio else {}
+                base_descubrimientos.registrar_ganador(nombre_radio, origen, stream, sitio, camino.get("selector"), camino.get("iframe"))
+            return resultado
+        finally:
+            self._selector_preferido = None
+            self._reportar_tiempos_fases()
+    def _buscar_en_memoria(self, nombre_radio):
+        """
+        Repite el camino que funcionó la última vez para esta radio: primero el mismo stream
+        y, si ya no anda, el iframe del player y después el sitio (clickeando primero el
+        selector que funcionó).
+        """
+        previo = base_descubrimientos.ganador(nombre_radio)
+        if not previo:
+            return None, None
+        print(f"    🧠 Camino conocido para {nombre_radio}: {previo['origen']} ({previo['sitio'] or previo['stream'][:60]})")
+        if previo["stream"] and self._verificar_stream_real(previo["stream"]):
+            base_descubrimientos.registrar_ganador(nombre_radio, previo["origen"], previo["stream"], previo["sitio"], previo["selector"], previo["iframe"])
+            return previo["stream"], "Memoria"
+        for pagina, es_iframe in ((previo["iframe"], True), (previo["sitio"], False)):
+            if not pagina or self._cancelar_busqueda.is_set():
+                continue
+            self.setup_driver()
+            self._selector_preferido = previo["selector"]
+            print(f"    🧠 Reanalizando {'el iframe' if es_iframe else 'el sitio'} que funcionó la última vez: {pagina}")
+            stream = self._primer_stream_verificado(self.extraer_streams(pagina, nombre_radio))
+            if stream:
+                camino = self._caminos_stream.get(stream, {})
+                iframe = previo["iframe"] if es_iframe else camino.get("iframe")
+                base_descubrimientos.registrar_ganador(nombre_radio, previo["origen"], stream, previo["sitio"], camino.get("selector") or previo["selector"], iframe)
+                return stream, "Memoria"
+        return None, None
+    def _buscar_stream_secuencial(self, nombre_radio):
+        """Prueba las fuentes una detrás de otra y devuelve (stream, origen)"""
         print(f"    🔍 Buscando nuevo stream para: {nombre_radio}")
         print(f"    📡 Probando Radio Browser API primero...")
         stream_rb = self.buscar_en_radio_browser(nombre_radio)
         if stream_rb:
             return stream_rb, "Radio Browser"
         print(f"    🌐 No se encontró por API, iniciando navegador para búsqueda profunda...")
+        stream = self._buscar_con_navegador(nombre_radio)
+        if stream:
+            return stream, "Navegador"
+        if self._respaldo_sin_verificar:
+            print(f"    ⚠️ Usando stream del repo sin verificación completa como último recurso")
+            return self._respaldo_sin_verificar, "Navegador"
+        return None, None
+    def _buscar_stream_en_carrera(self, nombre_radio):
+        """
+        Corre a la vez Radio Browser, las URLs armadas (HEAD + HTML sin navegador) y la búsqueda
+        con navegador (repositorio → DuckDuckGo → URLs armadas) dentro de TIEMPO_MAXIMO_BUSQUEDA.
+        Gana el primer stream que pasa _verificar_stream_real; el resto se cancela con
+        _cancelar_busqueda. Devuelve (stream, origen) como el modo secuencial.
+        Si la rama del navegador no suelta el driver a tiempo, el finder queda marcado
+        (navegador_ocupado) para que el pool lo cierre en vez de prestarlo de nuevo.
+        """
+        print(f"    🏁 Buscando nuevo stream para: {nombre_radio} (fuentes en paralelo, máx {TIEMPO_MAXIMO_BUSQUEDA}s)")
+        executor = ThreadPoolExecutor(max_workers=4)
+        sitios_armados = executor.submit(self._sitios_armados_vivos, nombre_radio)
+        navegador = executor.submit(self._buscar_con_navegador, nombre_radio, sitios_armados)
+        fuentes = {
+            executor.submit(self.buscar_en_radio_browser, nombre_radio): "Radio Browser",
+            executor.submit(self._buscar_en_sitios_armados, sitios_armados): "URLs armadas",
+            navegador: "Navegador"
+        }
+        ganador = (None, None)
+        inicio = time.time()
+        pendientes = set(fuentes)
+        try:
+            while pendientes:
+                restante = TIEMPO_MAXIMO_BUSQUEDA - (time.time() - inicio)
+                if restante <= 0:
+                    print(f"    ⏱️ Se agotó el tiempo de búsqueda ({TIEMPO_MAXIMO_BUSQUEDA}s)")
+                    break
+                terminadas, pendientes = wait(pendientes, timeout=restante, return_when=FIRST_COMPLETED)
+                for futuro in terminadas:
+                    try:
+                        stream = futuro.result()
+                    except Exception as e:
+                        print(f"    ❌ Falló la fuente {fuentes[futuro]}: {e}")
+                        stream = None
+                    if stream and not ganador[0]:
+                        ganador = (stream, fuentes[futuro])
+                if ganador[0]:
+                    break
+        finally:
+            self._cancelar_busqueda.set()
+            # El navegador se devuelve al pool al volver: hay que esperar a que suelte el driver
+            wait(fuentes, timeout=TIEMPO_CANCELACION_BUSQUEDA)
+            if not navegador.done():
+                print(f"    ⚠️ La búsqueda con navegador no se detuvo en {TIEMPO_CANCELACION_BUSQUEDA}s, el navegador se descarta")
+                self.navegador_ocupado = True
+            executor.shutdown(wait=False)
+        if ganador[0]:
+            print(f"    🏆 Ganó {ganador[1]} en {time.time() - inicio:.1f}s")
+            return ganador
+        if self._respaldo_sin_verificar:
+            print(f"    ⚠️ Usando stream del repo sin verificación completa como último recurso")
+            return self._respaldo_sin_verificar, "Navegador"
+        return None, None
+    def _sitios_armados_vivos(self, nombre_radio):
+        """
+        Chequea en paralelo (HEAD) las URLs de _generar_urls_posibles y devuelve las que responden,
+        en orden. Antes resuelve todos los dominios juntos y descarta los que no existen.
+        """
+        nombre_limpio = self.limpiar_nombre_radio(nombre_radio).lower()
+        urls_posibles = self._generar_urls_posibles(nombre_limpio)
+        resolvedor_dns.resolver_lote([host_de_url(u) for u in urls_posibles])
+        urls_posibles = [u for u in urls_posibles if resolvedor_dns.existe(host_de_url(u))]
+        def responde(url):
+            if self._cancelar_busqueda.is_set():
+                return False
+            try:
+                return obtener_sesion_http().head(url, timeout=3, allow_redirects=True).status_code < 400
+            except:
+                return False
+        if not urls_posibles:
+            return []
+        with ThreadPoolExecutor(max_workers=min(8, len(urls_posibles))) as executor:
+            vivos = list(executor.map(responde, urls_posibles))
+        return [url for url, vivo in zip(urls_posibles, vivos) if vivo]
+    def _buscar_en_sitios_armados(self, sitios_armados):
+        """
+        Fuente barata de la carrera: baja el HTML de las URLs armadas que respondieron al HEAD
+        y verifica las URLs de audio que aparezcan en él, sin tocar el navegador.
+        sitios_armados es el futuro de _sitios_armados_vivos (compartido con la rama del navegador).
+        """
+        for url in sitios_armados.result():
+            if self._cancelar_busqueda.is_set():
+                return None
+            try:
+                html = self._bajar_html_armado(url)
+            except Exception:
+                continue
+            if not html:
+                continue
+            candidatos = [self._normalizar_url_stream(c) for c in re.findall(r"https?://[^\s\"'<>]+", html) if self._es_stream_audio(c)]
+            stream = self._primer_stream_verificado(list(dict.fromkeys(candidatos)))
+            if stream:
+                print(f"    ✓ Stream encontrado en el HTML de {url}")
+                return stream
+        return None
+    def _bajar_html_armado(self, url):
+        """
+        HTML de una URL armada, acotado a MAX_BYTES_HTML_ARMADO (el timeout de requests es por
+        lectura: una URL que responde con audio infinito no terminaría nunca). Si no es texto
+        devuelve None.
+        """
+        with obtener_sesion_http().get(url, headers=HEADERS_STREAM, timeout=5, stream=True, allow_redirects=True) as r:
+            content_type = r.headers.get('Content-Type', '').lower()
+            if r.status_code >= 400 or (content_type and not any(t in content_type for t in ('text/', 'html', 'xml', 'json', 'javascript'))):
+                return None
+            datos = b""
+            for bloque in r.iter_content(chunk_size=8192):
+                datos += bloque
+                if len(datos) >= MAX_BYTES_HTML_ARMADO or self._cancelar_busqueda.is_set():
+                    break
+            return datos.decode(r.encoding or "utf-8", "ignore")
+    def _buscar_con_navegador(self, nombre_radio, sitios_armados=None):
+        """
+        Fuentes que necesitan navegador, en orden: repositorio, DuckDuckGo y URLs armadas.
+        Devuelve el primer stream verificado o None; corta apenas se pide cancelar.
+        sitios_armados puede ser un futuro con el resultado de _sitios_armados_vivos.
+        """
+        cancelada = self._cancelar_busqueda.is_set
         self.setup_driver()
+        if cancelada():
+            return None
         print(f"    📦 Probando repositorio especializado...")
         sitio_repo = self.buscar_en_repositorio_radios(nombre_radio)
-        if sitio_repo:
+        if sitio_repo and not cancelada():
             print(f"    🌐 Analizando página del repositorio: {sitio_repo}")
             streams_repo = self.extraer_streams(sitio_repo, nombre_radio)
-            for stream in streams_repo:
-                if self._verificar_stream_real(stream):
-                    return stream, "Navegador"
+            stream = self._primer_stream_verificado(streams_repo)
+            if stream:
+                self._sitio_ganador = sitio_repo
+                return stream
+            if streams_repo:
+                self._respaldo_sin_verificar = streams_repo[0]
+        if cancelada():
+            return None
         print(f"    ⚠️ No se encontró en el repositorio, buscando en DuckDuckGo...")
         candidatos_ddg = self.buscar_sitios_duckduckgo(nombre_radio)
+        perdedores = base_descubrimientos.perdedores(nombre_radio)
+        if perdedores:
+            descartados = [sitio for sitio in candidatos_ddg if sitio in perdedores]
+            if descartados:
+                print(f"    🧠 Salteando {len(descartados)} candidatos DDG que ya fallaron antes")
+            candidatos_ddg = [sitio for sitio in candidatos_ddg if sitio not in perdedores]
+        en_paralelo = self._explorar_candidatos_en_pestanas(candidatos_ddg[:MAX_PESTANAS_PARALELAS])
+        if en_paralelo is not None:
+            stream, sitio, sin_explorar = en_paralelo
+            if stream:
+                print(f"    ✅ Stream encontrado en DDG ({sitio})")
+                self._sitio_ganador = sitio
+                return stream
+            if not cancelada():
+                for sitio in candidatos_ddg[:MAX_PESTANAS_PARALELAS]:
+                    if sitio not in sin_explorar:
+                        base_descubrimientos.registrar_perdedor(nombre_radio, sitio)
+            candidatos_ddg = sin_explorar + candidatos_ddg[MAX_PESTANAS_PARALELAS:]
         for i, sitio in enumerate(candidatos_ddg, 1):
+            if cancelada():
+                return None
             print(f"    🌐 ({i}/{len(candidatos_ddg)}) Analizando candidato DDG: {sitio}")
             streams_ddg = self.extraer_streams(sitio, nombre_radio)
-            for stream in streams_ddg:
-                if self._verificar_stream_real(stream):
-                    print(f"    ✅ Stream encontrado en DDG ({sitio})")
-                    return stream, "Navegador"
+            analisis_completo = self.analisis_completo
+            stream = self._primer_stream_verificado(streams_ddg)
+            if stream:
+                print(f"    ✅ Stream encontrado en DDG ({sitio})")
+                self._sitio_ganador = sitio
+                return stream
+            if analisis_completo and not cancelada():
+                base_descubrimientos.registrar_perdedor(nombre_radio, sitio)
+        if cancelada():
+            return None
         print(f"    ⚠️ Probando construcción manual de URLs...")
-        nombre_limpio = self.limpiar_nombre_radio(nombre_radio).lower()
-        urls_posibles = self._generar_urls_posibles(nombre_limpio)
-        for url in urls_posibles:
+        sitios = sitios_armados.result() if sitios_armados is not None else self._sitios_armados_vivos(nombre_radio)
+        for url in sitios:
+            if cancelada():
+                return None
+            print(f"    ✓ Sitio manual encontrado: {url}")
+            streams_manual = self.extraer_streams(url, nombre_radio)
+            stream = self._primer_stream_verificado(streams_manual)
+            if stream:
+                self._sitio_ganador = url
+                return stream
+        return None
+    def _explorar_candidatos_en_pestanas(self, sitios, descripcion="candidatos DDG"):
+        """
+        Carga varios candidatos (sitios de DDG o srcs de iframes de player) a la vez, cada uno
+        en su pestaña del mismo Chrome, y devuelve (stream, sitio, sin_explorar): el primer
+        stream verificado y su candidato (o None, None) y la lista de candidatos que no se
+        llegaron a explorar (pestaña que no se adjuntó a tiempo, que no terminó de cargar o
+        falló, o sin interacción antes de que se agotara el tiempo), para que el que llama los
+        recorra en serie.
+        La red se atribuye a cada pestaña por su sesión CDP; las pestañas cargan en paralelo y
+        los clicks en play se hacen de a una (selenium maneja una ventana por vez).
+        Devuelve None si no hay conexión CDP, hay un solo candidato, se está grabando video
+        (la grabación sigue a una sola ventana) o ya se está dentro de una exploración en
+        pestañas (iframes de una pestaña): en esos casos se usa el modo serie.
+        """
+        if self.cdp is None or not self.cdp.activa or len(sitios) < 2 or self.grabar_video or self._explorando_pestanas:
+            return None
+        pestanas = {}
+        sin_explorar = list(sitios)
+        with self.driver_lock:
+            ventana_origen = self.driver.current_window_handle
+        self._explorando_pestanas = True
+        inicio_total = time.time()
+        fases_previas = sum(self.tiempos_fases.values())
+        try:
+            for sitio in sitios:
+                target = self.cdp.enviar("Target.createTarget", {"url": "about:blank", "background": True})["targetId"]
+                pestanas[target] = sitio
+                self._streams_por_target[target] = set()
+            sesiones = {}
+            def todas_adjuntas():
+                for session_id, info in list(self.cdp.sesiones.items()):
+                    if info.get("targetId") in pestanas:
+                        sesiones[info["targetId"]] = session_id
+                return len(sesiones) == len(pestanas)
+            self._esperar("pestanas", todas_adjuntas, timeout=5)
+            for target, session_id in sesiones.items():
+                self.cdp.enviar("Page.navigate", {"url": pestanas[target]}, session_id=session_id, esperar=False)
+            print(f"    🗂️ Analizando {len(sesiones)} {descripcion} en pestañas paralelas...")
+            ya_verificados = set()
+            def primer_verificado():
+                for target in sesiones:
+                    for url in list(self._streams_por_target[target]):
+                        url_norm = self._heredar_camino(url, self._normalizar_url_stream(url))
+                        if url_norm in ya_verificados:
+                            continue
+                        ya_verificados.add(url_norm)
+                        if self._verificar_stream_real(url_norm):
+                            return url_norm, pestanas[target]
+                return None
+            por_interactuar = list(sesiones)
+            descartadas = []
+            inicio = time.time()
+            while time.time() - inicio < TIEMPOS_ESPERA["pestanas"] and not self._cancelar_busqueda.is_set():
+                encontrado = primer_verificado()
+                if encontrado:
+                    return encontrado + ([],)
+                if not por_interactuar:
+                    time.sleep(0.25)
+                    continue
+                target = por_interactuar.pop(0)
+                print(f"      🗂️ Interactuando con pestaña de {pestanas[target][:60]}...")
+                try:
+                    with self.driver_lock:
+                        self.driver.switch_to.window(target)
+                    if not self._esperar("carga", self._dom_listo):
+                        print(f"      ⚠️ La pestaña no terminó de cargar, queda para el modo serie")
+                        descartadas.append(target)
+                    elif not self._streams_por_target[target]:
+                        self._clickear_botones_play()
+                except Exception as e:
+                    print(f"      ⚠️ Pestaña descartada: {e}")
+                    descartadas.append(target)
+            encontrado = primer_verificado()
+            if encontrado:
+                return encontrado + ([],)
+            sin_explorar = [pestanas[target] for target in por_interactuar + descartadas]
+            sin_explorar += [sitio for target, sitio in pestanas.items() if target not in sesiones]
+            if sin_explorar:
+                print(f"      🗂️ {len(sin_explorar)} {descripcion} sin explorar en pestaña, quedan para el modo serie")
+            return None, None, sin_explorar
+        except Exception as e:
+            print(f"      ⚠️ Falló la exploración en pestañas ({e}), se sigue en serie")
+            return None
+        finally:
+            self._explorando_pestanas = False
+            # Solo el tiempo que no quedó ya anotado en otra fase (carga, interacción...) dentro de las pestañas
+            anidadas = sum(self.tiempos_fases.values()) - fases_previas
+            propio = time.time() - inicio_total - anidadas
+            self.tiempos_fases["pestanas"] = self.tiempos_fases.get("pestanas", 0) + max(0, propio)
+            for target in pestanas:
+                self._streams_por_target.pop(target, None)
+                try:
+                    self.cdp.enviar("Target.closeTarget", {"targetId": target}, esperar=False)
+                except Exception:
+                    pass
             try:
-                r = requests.head(url, timeout=3, allow_redirects=True)
-                if r.status_code < 400:
-                    print(f"    ✓ Sitio manual encontrado: {url}")
-                    streams_manual = self.extraer_streams(url, nombre_radio)
-                    for s in streams_manual:
-                        if self._verificar_stream_real(s): return s, "Navegador"
-            except: continue
-        if 'streams_repo' in locals() and streams_repo:
-            print(f"    ⚠️ Usando stream del repo sin verificación completa como último recurso")
-            return streams_repo[0], "Navegador"
-        return None, None
+                with self.driver_lock:
+                    self.driver.switch_to.window(ventana_origen)
+            except Exception:
+                pass
+    def restablecer_sesion(self):
+        """
+        Deja el navegador listo para otra radio sin relanzarlo: cierra ventanas extra,
+        borra cookies y el storage de cada origen visitado y olvida los streams detectados.
+        Devuelve False si la sesión ya no responde.
+        """
+        self.detener_grabacion()
+        self.last_exported_video = None
+        if self.driver is None:
+            return True
+        try:
+            with self.driver_lock:
+                handles = self.driver.window_handles
+                for handle in handles[1:]:
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+                self.driver.switch_to.window(handles[0])
+                self.driver.get("about:blank")
+                self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+                origenes, self._origenes_visitados = self._origenes_visitados, set()
+                for origen in origenes:
+                    try:
+                        self.driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origen, "storageTypes": "all"})
+                    except WebDriverException as e:
+                        print(f"      ⚠️ No se pudo borrar el storage de {origen}: {str(e)[:60]}")
+        except Exception as e:
+            print(f"      ⚠️ No se pudo restablecer el navegador: {e}")
+            return False
+        self._streams_detectados_pasivamente.clear()
+        self._streams_confirmados_pasivamente.clear()
+        return True
+    def rss_navegador_mb(self):
+        """Memoria residente de chromedriver + Chrome (requiere psutil; sin psutil devuelve 0)"""
+        try:
+            import psutil
+        except ImportError:
+            if not _aviso_sin_psutil.is_set():
+                _aviso_sin_psutil.set()
+                print(f"      ⚠️ psutil no está instalado: el reciclado por RSS ({MAX_RSS_NAVEGADOR_MB} MB) queda desactivado (pip install psutil)")
+            return 0
+        try:
+            proceso = psutil.Process(self.driver.service.process.pid)
+            procesos = [proceso] + proceso.children(recursive=True)
+            return sum(p.memory_info().rss for p in procesos) / (1024 * 1024)
+        except Exception:
+            return 0
     def cerrar(self):
         self.detener_monitoreo_red()
         if self.driver:
@@ -1009,11 +3685,90 @@ class RadioStreamFinder:
                     pass
             self.driver = None
 
-def buscar_stream_worker(radio, grabar_video):
-    """Worker para buscar streams en paralelo"""
-    finder = RadioStreamFinder(headless=True, grabar_video=grabar_video)
+class PoolNavegadores:
+    """
+    Pool acotado de RadioStreamFinder con el navegador ya abierto.
+    Los workers piden uno prestado y lo devuelven; al devolverlo se limpia la sesión
+    y se recicla (se cierra y se abrirá uno nuevo) si ya no responde, si superó
+    max_usos búsquedas o si su RSS pasó de max_rss_mb.
+    """
+    def __init__(self, tamano=MAX_BROWSER_THREADS, grabar_video=False, max_usos=MAX_USOS_NAVEGADOR, max_rss_mb=MAX_RSS_NAVEGADOR_MB):
+        self.grabar_video = grabar_video
+        self.max_usos = max_usos
+        self.max_rss_mb = max_rss_mb
+        self._libres = queue.LifoQueue()
+        self._cupos = BoundedSemaphore(tamano)
+        self._usos = {}
+        self._lock = Lock()
+    @contextlib.contextmanager
+    def prestar(self):
+        """Presta un finder (reutilizando uno abierto si hay) y lo devuelve al terminar"""
+        self._cupos.acquire()
+        try:
+            try:
+                finder = self._libres.get_nowait()
+            except queue.Empty:
+                finder = RadioStreamFinder(headless=True, grabar_video=self.grabar_video)
+            try:
+                yield finder
+            finally:
+                self.devolver(finder)
+        finally:
+            self._cupos.release()
+    def devolver(self, finder):
+        """Limpia el finder y lo deja disponible, o lo cierra si hay que reciclarlo"""
+        with self._lock:
+            usos = self._usos.get(id(finder), 0) + 1
+            self._usos[id(finder)] = usos
+        motivo = None
+        if finder.navegador_ocupado:
+            motivo = "búsqueda cancelada que no soltó el navegador"
+        elif not finder.restablecer_sesion():
+            motivo = "no responde"
+        elif finder.driver is not None and usos >= self.max_usos:
+            motivo = f"{usos} usos"
+        elif finder.driver is not None and self.max_rss_mb:
+            rss = finder.rss_navegador_mb()
+            if rss > self.max_rss_mb:
+                motivo = f"RSS {rss:.0f} MB"
+        if motivo:
+            print(f"      ♻️ Reciclando navegador ({motivo})")
+            with self._lock:
+                self._usos.pop(id(finder), None)
+            try:
+                finder.cerrar()
+            except:
+                pass
+            return
+        self._libres.put(finder)
+    def cerrar(self):
+        """Cierra todos los navegadores libres del pool"""
+        while True:
+            try:
+                finder = self._libres.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                finder.cerrar()
+            except:
+                pass
+
+def buscar_stream_worker(radio, grabar_video, pool=None):
+    """Worker para buscar streams en paralelo (con un navegador del pool si se pasa uno)"""
     error = None
     meta_info = {"origen": None}
+    if pool is not None:
+        with pool.prestar() as finder:
+            try:
+                nuevo_stream, origen = finder.buscar_stream(radio['nombre'])
+                meta_info["origen"] = origen
+            except Exception as e:
+                error = str(e)
+                nuevo_stream = None
+            finder.detener_grabacion()
+            video = finder.last_exported_video
+        return radio, nuevo_stream, error, video, meta_info
+    finder = RadioStreamFinder(headless=True, grabar_video=grabar_video)
     try:
         nuevo_stream, origen = finder.buscar_stream(radio['nombre'])
         meta_info["origen"] = origen
@@ -1061,6 +3816,187 @@ def actualizar_markdown(lineas_originales, radios_actualizadas):
         lineas_nuevas[linea_num] = linea_actualizada
     return "\n".join(lineas_nuevas)
 
+class EventosProceso:
+    """
+    Receptor de eventos del proceso de verificación.
+    La implementación base escribe todo por consola; la GUI y el modo batch la reemplazan.
+    """
+    def log(self, texto):
+        print(texto)
+    def progreso(self, actual, total):
+        pass
+    def estado(self, texto):
+        pass
+    def tabla(self, radios):
+        pass
+    def fila(self, indice, estado, url, info, nombre):
+        pass
+    def video(self, nombre, ruta):
+        pass
+    def finalizado(self, mensaje):
+        print(mensaje)
+    def activo(self):
+        return True
+
+def ejecutar_verificacion(eventos, auto_search=True, record_video=False, incremental=False,
+                          max_concurrencia=MAX_CONCURRENCIA_ASYNC, max_por_host=MAX_CONEXIONES_POR_HOST,
+                          archivo_md=ARCHIVO_MD_ACTUALIZADO):
+    """
+    Pipeline completo: obtener_gist → extraer_radios → verificar_stream → buscar_stream → actualizar_markdown.
+    No depende de la GUI: todo se informa a través de `eventos` (ver EventosProceso).
+    """
+    inicio = datetime.now()
+    eventos.log("="*80)
+    eventos.log("RADIO CHECKER")
+    eventos.log("="*80)
+    try:
+        eventos.log("\n📥 Descargando gist...")
+        try:
+            markdown = obtener_gist()
+            radios, lineas_originales = extraer_radios(markdown)
+            total = len(radios)
+            eventos.tabla(radios)
+            eventos.log(f"✓ Se encontraron {total} streams para verificar\n")
+        except Exception as e:
+            eventos.log(f"❌ Error descargando/procesando gist: {e}")
+            eventos.finalizado("Error inicial")
+            return
+        cache_probes.cargar()
+        resolvedor_playlists.cargar()
+        estado_previo = cargar_estado_incremental()
+        estado_nuevo = {"hash_gist": hash_gist(markdown), "filas": {}}
+        completados = 0
+        conteo = {"ACTIVO": 0, "TIMEOUT": 0, "CAIDO": 0}
+        radios_caidas = []
+        radios_actualizadas = []
+        def procesar_resultado(idx, radio_verificada, estado, info):
+            radio_original = radios[idx]
+            if radio_verificada['nombre'] != radio_original['nombre']:
+                radios_actualizadas.append({
+                    'nombre': radio_verificada['nombre'],
+                    'url_vieja': radio_original['url'],
+                    'url_nueva': radio_original['url'],
+                    'linea_num': radio_original['linea_num']
+                })
+            radios[idx] = radio_verificada
+            eventos.progreso(completados, total)
+            eventos.fila(idx, estado, radio_verificada['url'], str(info), radio_verificada['nombre'])
+            if estado in ["CAIDO", "TIMEOUT"]:
+                radios_caidas.append((idx, radio_verificada))
+        if incremental:
+            indices, reutilizadas = seleccionar_radios_a_verificar(radios, estado_previo)
+            if estado_previo.get("hash_gist") == estado_nuevo["hash_gist"]:
+                eventos.log("♻️ Modo incremental: el gist no cambió desde la última corrida")
+            else:
+                eventos.log("♻️ Modo incremental: el gist cambió desde la última corrida")
+            eventos.log(f"   Se verificarán {len(indices)} de {total} streams ({len(reutilizadas)} reutilizados)")
+            for idx, previo in reutilizadas.items():
+                radio = radios[idx]
+                estado_nuevo["filas"].setdefault(clave_fila(radio), {})[radio["url"]] = previo
+                radio_verificada = radio.copy()
+                radio_verificada['nombre'] = ajustar_nombre_por_url(radio['nombre'], radio['url'])
+                completados += 1
+                conteo[previo["estado"]] += 1
+                procesar_resultado(idx, radio_verificada, previo["estado"], f"(incremental) {previo['info']}")
+        else:
+            indices = list(range(total))
+        eventos.log("🔍 VERIFICANDO STREAMS...")
+        eventos.estado(f"Verificando {len(indices)} streams...")
+        lote = verificar_streams_en_lote([radios[i].copy() for i in indices], max_concurrencia, max_por_host)
+        try:
+            for posicion, resultado in lote:
+                if not eventos.activo():
+                    break
+                try:
+                    idx = indices[posicion]
+                    radio_verificada, estado, info = resultado
+                    previo = estado_previo.get("filas", {}).get(clave_fila(radios[idx]), {}).get(radios[idx]["url"])
+                    registrar_resultado_incremental(estado_nuevo, radios[idx], estado, info, previo)
+                    completados += 1
+                    conteo[estado] += 1
+                    procesar_resultado(idx, radio_verificada, estado, info)
+                except Exception as e:
+                    eventos.log(f"Error verificando: {e}")
+        finally:
+            lote.close()
+        guardar_estado_incremental(estado_nuevo)
+        cache_probes.persistir()
+        resolvedor_playlists.persistir()
+        eventos.log(f"🗃️ Cache de probes: {cache_probes.resumen()}")
+        eventos.log(f"📃 Playlists: {resolvedor_playlists.resumen()}")
+        eventos.log(f"📶 Control por host: {control_hosts.resumen()}")
+        if not eventos.activo():
+            eventos.finalizado("Cancelado por usuario")
+            return
+        eventos.log("\n" + "="*80)
+        eventos.log("RESUMEN DE VERIFICACIÓN:")
+        for estado_key, cantidad in conteo.items():
+            porcentaje = (cantidad * 100 / total) if total else 0
+            eventos.log(f"  {estado_key:<7}: {cantidad:3} ({porcentaje:.2f}%)")
+        if radios_caidas and auto_search:
+            eventos.log(f"\n⚠️  {len(radios_caidas)} streams caídos. Iniciando búsqueda automática...")
+            eventos.estado(f"Buscando {len(radios_caidas)} nuevos streams...")
+            if record_video:
+                eventos.log("🎥 Modo grabación activado")
+            estadisticas_bloqueo.reiniciar()
+            pool = PoolNavegadores(MAX_BROWSER_THREADS, record_video)
+            with ThreadPoolExecutor(max_workers=MAX_BROWSER_THREADS) as executor:
+                future_to_item = {
+                    executor.submit(buscar_stream_worker, item[1], record_video, pool): item
+                    for item in radios_caidas
+                }
+                completados_busqueda = 0
+                total_busqueda = len(radios_caidas)
+                for future in as_completed(future_to_item):
+                    if not eventos.activo():
+                        break
+                    idx_original, radio_orig = future_to_item[future]
+                    completados_busqueda += 1
+                    eventos.progreso(completados_busqueda, total_busqueda)
+                    try:
+                        radio, nuevo_stream, error, video_path, meta_info = future.result()
+                        progreso_msg = f"[{completados_busqueda}/{total_busqueda}] {radio['nombre']}"
+                        if video_path:
+                            eventos.video(radio['nombre'], video_path)
+                        if error:
+                            eventos.log(f"\n{progreso_msg}\n      ✗ Error: {error}")
+                            eventos.fila(idx_original, "ERROR_BUSQ", radio['url'], f"Err: {error}", radio['nombre'])
+                        elif nuevo_stream:
+                            radio['nombre'] = ajustar_nombre_por_url(radio['nombre'], nuevo_stream)
+                            radios_actualizadas.append({
+                                'nombre': radio['nombre'],
+                                'url_vieja': radio_orig['url'],
+                                'url_nueva': nuevo_stream,
+                                'linea_num': radio['linea_num']
+                            })
+                            status_txt = f"ACTUALIZADO ({meta_info.get('origen', '')})"
+                            eventos.fila(idx_original, status_txt, nuevo_stream, "Nuevo stream encontrado", radio['nombre'])
+                        else:
+                            eventos.log(f"\n{progreso_msg}\n      ✗ No encontrado")
+                            eventos.fila(idx_original, "NO_ENCONTRADO", radio['url'], "Búsqueda fallida", radio['nombre'])
+                    except Exception as e:
+                        eventos.log(f"Error procesando resultado búsqueda: {e}")
+            pool.cerrar()
+            eventos.log(f"🚫 Bloqueo de recursos: {estadisticas_bloqueo.resumen()}")
+        if radios_actualizadas:
+            eventos.log(f"\n✅ Se encontraron {len(radios_actualizadas)} nuevos streams")
+            markdown_nuevo = actualizar_markdown(lineas_originales, radios_actualizadas)
+            try:
+                with open(archivo_md, "w", encoding="utf-8") as f:
+                    f.write(markdown_nuevo)
+                eventos.log(f"✓ Markdown guardado: {archivo_md}")
+            except Exception as e:
+                eventos.log(f"Error guardando markdown: {e}")
+        else:
+             eventos.log("\nNo hubo actualizaciones para guardar.")
+        fin = datetime.now()
+        tiempo_total = fin - inicio
+        eventos.log(f"\n⏱️  Tiempo total: {tiempo_total}")
+        eventos.finalizado(f"Proceso finalizado. {len(radios_actualizadas)} actualizados.")
+    except Exception as e:
+        eventos.log(f"❌ Error fatal en worker: {e}")
+        eventos.finalizado("Error fatal")
+
 def es_primera_vez():
     """Verifica si es la primera vez que se abre la aplicación"""
     if not os.path.exists(ARCHIVO_SETTINGS):
@@ -1087,953 +4023,99 @@ def marcar_primera_vez_completada():
             json.dump(settings, f)
     except:
         pass
-try:
-    from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
-                                QHBoxLayout, QPushButton, QCheckBox, QTableWidget,
-                                QTableWidgetItem, QHeaderView, QTextEdit, QLabel,
-                                QProgressBar, QSplitter, QMessageBox, QStyle,
-                                QListWidget, QListWidgetItem, QStackedWidget, QSlider,
-                                QDialog, QAbstractItemView)
-    from PyQt6.QtCore import Qt, QThread, pyqtSignal, QObject, pyqtSlot, QUrl
-    from PyQt6.QtGui import QColor, QFont, QTextCursor, QIcon, QPalette
-    from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
-    from PyQt6.QtMultimediaWidgets import QVideoWidget
-except ImportError:
-    print("Error: PyQt6 no está instalado. Instálalo con: pip install PyQt6")
-    sys.exit(1)
-
-class StreamRedirector(QObject):
-    text_written = pyqtSignal(str)
-    def write(self, text):
-        self.text_written.emit(str(text))
-    def flush(self):
-        pass
-
-class RadioCheckWorker(QThread):
-    log_signal = pyqtSignal(str)
-    progress_signal = pyqtSignal(int, int)
-    status_signal = pyqtSignal(str)
-    table_init_signal = pyqtSignal(list)
-    row_update_signal = pyqtSignal(int, str, str, str, str)
-    video_found_signal = pyqtSignal(str, str)
-    finished_signal = pyqtSignal(str)
-    def __init__(self, auto_search, record_video):
-        super().__init__()
-        self.auto_search = auto_search
-        self.record_video = record_video
-        self.is_running = True
+class EventosBatch(EventosProceso):
+    """Eventos del modo batch: log por consola (y opcionalmente a archivo) y resultados por fila"""
+    def __init__(self, archivo_log=None):
+        self.archivo_log = archivo_log
         self.radios = []
-        self.lineas_originales = []
-    def run(self):
-        inicio = datetime.now()
-        self.log_signal.emit("="*80)
-        self.log_signal.emit("RADIO CHECKER")
-        self.log_signal.emit("="*80)
-        try:
-            self.log_signal.emit("\n📥 Descargando gist...")
+        self.resultados = {}
+        self.mensaje = None
+    def log(self, texto):
+        print(texto)
+        if self.archivo_log:
             try:
-                markdown = obtener_gist()
-                self.radios, self.lineas_originales = extraer_radios(markdown)
-                total = len(self.radios)
-                self.table_init_signal.emit(self.radios)
-                self.log_signal.emit(f"✓ Se encontraron {total} streams para verificar\n")
-            except Exception as e:
-                self.log_signal.emit(f"❌ Error descargando/procesando gist: {e}")
-                self.finished_signal.emit("Error inicial")
-                return
-            self.log_signal.emit("🔍 VERIFICANDO STREAMS...")
-            self.status_signal.emit(f"Verificando {total} streams...")
-            completados = 0
-            conteo = {"ACTIVO": 0, "TIMEOUT": 0, "CAIDO": 0}
-            radios_caidas = []
-            radios_actualizadas = []
-            with ThreadPoolExecutor(max_workers=MAX_THREADS) as executor:
-                future_to_index = {executor.submit(verificar_stream, radio.copy()): i for i, radio in enumerate(self.radios)}
-                for future in as_completed(future_to_index):
-                    if not self.is_running:
-                        executor.shutdown(wait=False)
-                        break
-                    idx = future_to_index[future]
-                    try:
-                        radio_verificada, estado, info = future.result()
-                        radio_original = self.radios[idx]
-                        completados += 1
-                        conteo[estado] += 1
-                        if radio_verificada['nombre'] != radio_original['nombre']:
-                            radios_actualizadas.append({
-                                'nombre': radio_verificada['nombre'],
-                                'url_vieja': radio_original['url'],
-                                'url_nueva': radio_original['url'],
-                                'linea_num': radio_original['linea_num']
-                            })
-                        self.radios[idx] = radio_verificada
-                        self.progress_signal.emit(completados, total)
-                        self.row_update_signal.emit(idx, estado, radio_verificada['url'], str(info), radio_verificada['nombre'])
-                        if estado in ["CAIDO", "TIMEOUT"]:
-                            radios_caidas.append((idx, radio_verificada))
-                    except Exception as e:
-                        self.log_signal.emit(f"Error verificando: {e}")
-            if not self.is_running:
-                self.finished_signal.emit("Cancelado por usuario")
-                return
-            self.log_signal.emit("\n" + "="*80)
-            self.log_signal.emit("RESUMEN DE VERIFICACIÓN:")
-            for estado_key, cantidad in conteo.items():
-                porcentaje = (cantidad * 100 / total) if total else 0
-                self.log_signal.emit(f"  {estado_key:<7}: {cantidad:3} ({porcentaje:.2f}%)")
-            if radios_caidas and self.auto_search:
-                self.log_signal.emit(f"\n⚠️  {len(radios_caidas)} streams caídos. Iniciando búsqueda automática...")
-                self.status_signal.emit(f"Buscando {len(radios_caidas)} nuevos streams...")
-                if self.record_video:
-                    self.log_signal.emit("🎥 Modo grabación activado")
-                with ThreadPoolExecutor(max_workers=MAX_BROWSER_THREADS) as executor:
-                    future_to_item = {
-                        executor.submit(buscar_stream_worker, item[1], self.record_video): item
-                        for item in radios_caidas
-                    }
-                    completados_busqueda = 0
-                    total_busqueda = len(radios_caidas)
-                    for future in as_completed(future_to_item):
-                        if not self.is_running:
-                            break
-                        idx_original, radio_orig = future_to_item[future]
-                        completados_busqueda += 1
-                        self.progress_signal.emit(completados_busqueda, total_busqueda)
-                        try:
-                            radio, nuevo_stream, error, video_path, meta_info = future.result()
-                            progreso_msg = f"[{completados_busqueda}/{total_busqueda}] {radio['nombre']}"
-                            if video_path:
-                                self.video_found_signal.emit(radio['nombre'], video_path)
-                            if error:
-                                self.log_signal.emit(f"\n{progreso_msg}\n      ✗ Error: {error}")
-                                self.row_update_signal.emit(idx_original, "ERROR_BUSQ", radio['url'], f"Err: {error}", radio['nombre'])
-                            elif nuevo_stream:
-                                radio['nombre'] = ajustar_nombre_por_url(radio['nombre'], nuevo_stream)
-                                radios_actualizadas.append({
-                                    'nombre': radio['nombre'],
-                                    'url_vieja': radio_orig['url'],
-                                    'url_nueva': nuevo_stream,
-                                    'linea_num': radio['linea_num']
-                                })
-                                status_txt = f"ACTUALIZADO ({meta_info.get('origen', '')})"
-                                self.row_update_signal.emit(idx_original, status_txt, nuevo_stream, "Nuevo stream encontrado", radio['nombre'])
-                            else:
-                                self.log_signal.emit(f"\n{progreso_msg}\n      ✗ No encontrado")
-                                self.row_update_signal.emit(idx_original, "NO_ENCONTRADO", radio['url'], "Búsqueda fallida", radio['nombre'])
-                        except Exception as e:
-                            self.log_signal.emit(f"Error procesando resultado búsqueda: {e}")
-            if radios_actualizadas:
-                self.log_signal.emit(f"\n✅ Se encontraron {len(radios_actualizadas)} nuevos streams")
-                markdown_nuevo = actualizar_markdown(self.lineas_originales, radios_actualizadas)
-                try:
-                    with open(ARCHIVO_MD_ACTUALIZADO, "w", encoding="utf-8") as f:
-                        f.write(markdown_nuevo)
-                    self.log_signal.emit(f"✓ Markdown guardado: {ARCHIVO_MD_ACTUALIZADO}")
-                except Exception as e:
-                    self.log_signal.emit(f"Error guardando markdown: {e}")
-            else:
-                 self.log_signal.emit("\nNo hubo actualizaciones para guardar.")
-            fin = datetime.now()
-            tiempo_total = fin - inicio
-            self.log_signal.emit(f"\n⏱️  Tiempo total: {tiempo_total}")
-            self.finished_signal.emit(f"Proceso finalizado. {len(radios_actualizadas)} actualizados.")
-        except Exception as e:
-            self.log_signal.emit(f"❌ Error fatal en worker: {e}")
-            self.finished_signal.emit("Error fatal")
-    def stop(self):
-        self.is_running = False
-
-
-class GUID(ctypes.Structure):
-    _fields_ = [
-        ("Data1", wintypes.DWORD),
-        ("Data2", wintypes.WORD),
-        ("Data3", wintypes.WORD),
-        ("Data4", wintypes.BYTE * 8)
-    ]
-
-def DEFINE_GUID(l, w1, w2, b1, b2, b3, b4, b5, b6, b7, b8):
-    return GUID(l, w1, w2, (wintypes.BYTE * 8)(b1, b2, b3, b4, b5, b6, b7, b8))
-
-CLSID_TaskbarList = DEFINE_GUID(0x56FDF344, 0xFD6D, 0x11d0, 0x95, 0x8A, 0x00, 0x60, 0x97, 0xC9, 0xA0, 0x90)
-IID_ITaskbarList3 = DEFINE_GUID(0xEA1AFB91, 0x9E28, 0x4B86, 0x90, 0xE9, 0x9E, 0x9F, 0x8A, 0x5E, 0xEF, 0xAF)
-
-TBPF_NOPROGRESS    = 0
-TBPF_INDETERMINATE = 0x1
-TBPF_NORMAL        = 0x2
-TBPF_ERROR         = 0x4
-TBPF_PAUSED        = 0x8
-
-class TaskbarProgress:
-    def __init__(self, hwnd=None):
-        self.hwnd = hwnd
-        self._ptr = None
-        try:
-            self._init_interface()
-        except Exception as e:
-            print(f"Error initializing TaskbarProgress: {e}")
-            self._ptr = None
-
-    def _init_interface(self):
-        try:
-            # S_FALSE = 1, S_OK = 0, RPC_E_CHANGED_MODE = 0x80010106
-            # We don't really care if it fails due to changed mode, Qt handles COM usually.
-            ctypes.windll.ole32.CoInitialize(None)
-        except Exception:
-            pass
-        
-        ptr = ctypes.c_void_p()
-        CLSCTX_INPROC_SERVER = 1
-        
-        try:
-            hr = ctypes.windll.ole32.CoCreateInstance(
-                ctypes.byref(CLSID_TaskbarList),
-                None,
-                CLSCTX_INPROC_SERVER,
-                ctypes.byref(IID_ITaskbarList3),
-                ctypes.byref(ptr)
-            )
-            
-            if hr == 0 and ptr:
-                self._ptr = ptr
-                # HrInit is at index 3 in ITaskbarList3 (IUnknown=3 + ITaskbarList=1?? No, ITaskbarList inherits IUnknown)
-                # IUnknown: QueryInterface(0), AddRef(1), Release(2)
-                # ITaskbarList: HrInit(3), AddTab(4), DeleteTab(5), ActivateTab(6), SetActiveAlt(7)
-                # ITaskbarList2: MarkFullscreenWindow(8)
-                # ITaskbarList3: SetProgressValue(9), SetProgressState(10), ...
-                init_func = self._get_vtable_func(3, ctypes.HRESULT)
-                if init_func:
-                    init_func(self._ptr)
-        except Exception as e:
-            print(f"Failed to create ITaskbarList3: {e}")
-            self._ptr = None
-
-    def _get_vtable_func(self, index, res_type, *arg_types):
-        if not self._ptr or not self._ptr.value: return None
-        try:
-            pInterface = self._ptr.value
-            # Get VTable pointer (first value at interface address)
-            pVTable = ctypes.c_void_p.from_address(pInterface).value
-            if not pVTable: return None
-            # Get Function address (index-th entry in VTable)
-            func_addr = ctypes.c_void_p.from_address(pVTable + index * ctypes.sizeof(ctypes.c_void_p)).value
-            if not func_addr: return None
-            
-            return ctypes.WINFUNCTYPE(res_type, ctypes.c_void_p, *arg_types)(func_addr)
-        except Exception as e:
-            print(f"Error getting vtable func: {e}")
-            return None
+                with open(self.archivo_log, "a", encoding="utf-8") as f:
+                    f.write(f"{texto}\n")
+            except:
+                pass
+    def tabla(self, radios):
+        self.radios = [radio.copy() for radio in radios]
+    def fila(self, indice, estado, url, info, nombre):
+        self.resultados[indice] = {"estado": estado, "url": url, "info": info, "nombre": nombre}
+    def finalizado(self, mensaje):
+        self.mensaje = mensaje
+        self.log(mensaje)
+    def exportar(self):
+        """Arma el resumen en un formato apto para procesar con otras herramientas"""
+        filas = []
+        resumen = {}
+        for i, radio in enumerate(self.radios):
+            resultado = self.resultados.get(i, {"estado": "PENDIENTE", "url": radio["url"], "info": "", "nombre": radio["nombre"]})
+            resumen[resultado["estado"]] = resumen.get(resultado["estado"], 0) + 1
+            filas.append({
+                "indice": i,
+                "nombre": resultado["nombre"],
+                "frecuencia": radio["frecuencia"],
+                "url_original": radio["url"],
+                "url": resultado["url"],
+                "estado": resultado["estado"],
+                "info": resultado["info"]
+            })
+        return {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "mensaje": self.mensaje,
+            "resumen": resumen,
+            "radios": filas
+        }
 
-    def set_progress_value(self, current, total):
-        # 9 is SetProgressValue
-        if not self._ptr or not self.hwnd: return
-        try:
-            func = self._get_vtable_func(9, ctypes.HRESULT, wintypes.HWND, ctypes.c_uint64, ctypes.c_uint64)
-            if func:
-                func(self._ptr, self.hwnd, current, total)
-        except: pass
-
-    def set_progress_state(self, state):
-        # 10 is SetProgressState
-        if not self._ptr or not self.hwnd: return
-        try:
-            func = self._get_vtable_func(10, ctypes.HRESULT, wintypes.HWND, wintypes.DWORD)
-            if func:
-                func(self._ptr, self.hwnd, state)
-        except: pass
-            
-    def set_hwnd(self, hwnd):
-        self.hwnd = hwnd
-
-class InfoDialog(QDialog):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("Información de Radio Checker")
-        self.setMinimumSize(500, 400)
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #252525;
-                color: white;
-            }
-            QLabel {
-                color: #e0e0e0;
-                font-size: 14px;
-            }
-            QPushButton#nav_btn {
-                background-color: #333;
-                border-radius: 20px;
-                padding: 10px;
-                font-weight: bold;
-                font-size: 18px;
-                color: white;
-                border: 1px solid #444;
-            }
-            QPushButton#nav_btn:hover {
-                background-color: #444;
-                border: 1px solid #555;
-            }
-            QPushButton#nav_btn:pressed {
-                background-color: #2a82da;
-            }
-            QPushButton#nav_btn:disabled {
-                background-color: #1a1a1a;
-                color: #444;
-                border: 1px solid #222;
-            }
-        """)
-        layout = QVBoxLayout(self)
-        self.pages = QStackedWidget()
-        p1 = QWidget()
-        l1 = QVBoxLayout(p1)
-        h1 = QHBoxLayout()
-        icon1 = QLabel()
-        icon1.setPixmap(self.style().standardIcon(QStyle.StandardPixmap.SP_MessageBoxInformation).pixmap(32, 32))
-        h1.addWidget(icon1)
-        h1.addWidget(QLabel("<h2 style='color: #42A5F5; margin: 0;'> Bienvenido a Radio Checker</h2>"))
-        h1.addStretch()
-        l1.addLayout(h1)
-        lbl1 = QLabel("<div style='margin-top: 10px; text-align: justify;'>"
-                           "<p>Esta herramienta ha sido diseñada para automatizar la gestión y el mantenimiento de una extensa lista de emisoras de radio argentinas. Su objetivo principal es garantizar que todos los enlaces de streaming funcionen correctamente y se mantengan actualizados de forma autónoma.</p>"
-                           "<p>El proceso comienza descargando la información más reciente desde un repositorio central alojado en GitHub Gist, asegurando que siempre trabaje con la versión más reciente del listado oficial. Una vez obtenida la lista, el sistema analiza la estructura del archivo para identificar cada emisora, su frecuencia y su enlace actual, preparándolos para una verificación exhaustiva y veloz mediante procesos concurrentes.</p>"
-                           "</div>")
-        lbl1.setWordWrap(True)
-        l1.addWidget(lbl1)
-        l1.addStretch()
-        self.pages.addWidget(p1)
-        p2 = QWidget()
-        l2 = QVBoxLayout(p2)
-        h2 = QHBoxLayout()
-        icon2 = QLabel()
-        icon2.setPixmap(self.style().standardIcon(QStyle.StandardPixmap.SP_DialogApplyButton).pixmap(32, 32))
-        h2.addWidget(icon2)
-        h2.addWidget(QLabel("<h2 style='color: #4CAF50; margin: 0;'> Verificación de Streams</h2>"))
-        h2.addStretch()
-        l2.addLayout(h2)
-        lbl2 = QLabel("<div style='margin-top: 10px; text-align: justify;'>"
-                           "<p>Durante la fase de verificación técnica, el sistema realiza una conexión directa con cada servidor de streaming para validar su estado de actividad en tiempo real. Para garantizar un diagnóstico preciso, se establece un tiempo de espera inteligente que evita que enlaces lentos bloqueen el flujo de trabajo.</p>"
-                           "<p>No solo comprobamos la disponibilidad del servidor, sino que también inspeccionamos minuciosamente las cabeceras de respuesta para confirmar que el contenido sea realmente un flujo de audio válido. Además, utilizamos identificadores de navegador reales para simular conexiones legítimas, evitando bloqueos automáticos y asegurando la mayor tasa de éxito posible en la verificación.</p>"
-                           "</div>")
-        lbl2.setWordWrap(True)
-        l2.addWidget(lbl2)
-        l2.addStretch()
-        self.pages.addWidget(p2)
-        p3 = QWidget()
-        l3 = QVBoxLayout(p3)
-        h3 = QHBoxLayout()
-        icon3 = QLabel()
-        icon3.setPixmap(self.style().standardIcon(QStyle.StandardPixmap.SP_BrowserReload).pixmap(32, 32))
-        h3.addWidget(icon3)
-        h3.addWidget(QLabel("<h2 style='color: #FFCA28; margin: 0;'> Búsqueda Automática</h2>"))
-        h3.addStretch()
-        l3.addLayout(h3)
-        lbl3 = QLabel("<div style='margin-top: 10px; text-align: justify;'>"
-                           "<p>Cuando se detecta que una emisora está fuera de línea, la aplicación activa un proceso de recuperación inteligente por pasos. En primera instancia, consulta la base de datos de <b>Radio Browser API</b>, una plataforma global que permite localizar rápidamente streams verificados por la comunidad.</p>"
-                           "<p>Si la API no devuelve resultados válidos, el sistema inicia automáticamente una instancia del navegador para explorar la web. Durante esta fase, el script realiza un monitoreo de red en tiempo real para capturar el enlace exacto del audio mientras simula interacciones humanas y clics en botones de reproducción, agotando todas las instancias para restaurar el servicio.</p>"
-                           "</div>")
-        lbl3.setWordWrap(True)
-        l3.addWidget(lbl3)
-        l3.addStretch()
-        self.pages.addWidget(p3)
-        p4 = QWidget()
-        l4 = QVBoxLayout(p4)
-        h4 = QHBoxLayout()
-        icon4 = QLabel()
-        icon4.setPixmap(self.style().standardIcon(QStyle.StandardPixmap.SP_MediaPlay).pixmap(32, 32))
-        h4.addWidget(icon4)
-        h4.addWidget(QLabel("<h2 style='color: #EF5350; margin: 0;'> Grabación Debug</h2>"))
-        h4.addStretch()
-        l4.addLayout(h4)
-        lbl4 = QLabel("<div style='margin-top: 10px; text-align: justify;'>"
-                           "<p>Para los usuarios que desean una supervisión total o necesitan resolver problemas complejos de detección, la aplicación ofrece un modo de grabación de depuración. Al activar esta función, el sistema captura un video completo de cada sesión de búsqueda realizada por el navegador automático.</p>"
-                           "<p>Esto resulta extremadamente útil para visualizar exactamente qué sucede en el sitio web de una radio, permitiendo identificar cambios visuales o errores técnicos que impidieron la detección. Todos estos videos se organizan automáticamente y pueden ser revisados directamente desde el reproductor integrado en esta herramienta.</p>"
-                           "</div>")
-        lbl4.setWordWrap(True)
-        l4.addWidget(lbl4)
-        l4.addStretch()
-        self.pages.addWidget(p4)
-        layout.addWidget(self.pages)
-        nav_layout = QHBoxLayout()
-        self.btn_prev = QPushButton("←")
-        self.btn_prev.setObjectName("nav_btn")
-        self.btn_prev.setFixedSize(60, 40)
-        self.btn_prev.clicked.connect(self.prev_page)
-        self.page_label = QLabel(f"1 / {self.pages.count()}")
-        self.page_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.page_label.setStyleSheet("font-weight: bold; font-size: 16px; color: #aaa;")
-        self.btn_next = QPushButton("→")
-        self.btn_next.setObjectName("nav_btn")
-        self.btn_next.setFixedSize(60, 40)
-        self.btn_next.clicked.connect(self.next_page)
-        nav_layout.addWidget(self.btn_prev)
-        nav_layout.addStretch()
-        nav_layout.addWidget(self.page_label)
-        nav_layout.addStretch()
-        nav_layout.addWidget(self.btn_next)
-        layout.addLayout(nav_layout)
-        self.update_nav_buttons()
-    def prev_page(self):
-        curr = self.pages.currentIndex()
-        if curr > 0:
-            self.pages.setCurrentIndex(curr - 1)
-            self.update_nav_buttons()
-    def next_page(self):
-        curr = self.pages.currentIndex()
-        if curr < self.pages.count() - 1:
-            self.pages.setCurrentIndex(curr + 1)
-            self.update_nav_buttons()
-    def update_nav_buttons(self):
-        curr = self.pages.currentIndex()
-        total = self.pages.count()
-        self.btn_prev.setEnabled(curr > 0)
-        self.btn_next.setEnabled(curr < total - 1)
-        self.page_label.setText(f"{curr + 1} / {total}")
-
-class MainWindow(QMainWindow):
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle("Radio Checker")
-        self.resize(1200, 800)
-        self.redirector = StreamRedirector()
-        self.redirector.text_written.connect(self.append_log)
-        sys.stdout = self.redirector
-        sys.stderr = self.redirector
-        central_widget = QWidget()
-        self.setCentralWidget(central_widget)
-        main_layout = QVBoxLayout(central_widget)
-        self.worker = None
-        self.worker = None
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #1e1e1e;
-            }
-            QWidget {
-                color: #e0e0e0;
-                font-family: 'Segoe UI', Arial;
-            }
-            QPushButton {
-                background-color: #333333;
-                color: white;
-                border: 1px solid #444;
-                border-radius: 4px;
-                padding: 6px 14px;
-                font-size: 13px;
-                min-height: 24px;
-            }
-            QPushButton:hover {
-                background-color: #444444;
-                border: 1px solid #555;
-            }
-            QPushButton:pressed {
-                background-color: #2a82da;
-                border: 1px solid #2a82da;
-            }
-            QPushButton:disabled {
-                background-color: #252525;
-                color: #555;
-                border: 1px solid #333;
-            }
-            QPushButton#btn_start {
-                background-color: #2e7d32;
-                border: 1px solid #1b5e20;
-                font-weight: bold;
-            }
-            QPushButton#btn_start:hover {
-                background-color: #388e3c;
-            }
-            QPushButton#btn_start:disabled {
-                background-color: #1b331b;
-                color: #444;
-            }
-            QPushButton#btn_stop {
-                background-color: #c62828;
-                border: 1px solid #b71c1c;
-            }
-            QPushButton#btn_stop:hover {
-                background-color: #d32f2f;
-            }
-            QPushButton#btn_stop:disabled {
-                background-color: #331b1b;
-                color: #444;
-            }
-            QCheckBox {
-                spacing: 8px;
-                color: #e0e0e0;
-            }
-            QCheckBox::indicator {
-                width: 18px;
-                height: 18px;
-                background-color: #333;
-                border: 1px solid #555;
-                border-radius: 3px;
-            }
-            QCheckBox::indicator:checked {
-                background-color: #2a82da;
-                border: 1px solid #2a82da;
-                image: url(check_mark.png); /* Note: if we don't have the icon it will just be blue */
-            }
-            QTableWidget {
-                background-color: #252525;
-                alternate-background-color: #2a2a2a;
-                gridline-color: #333;
-                border: 1px solid #333;
-                selection-background-color: #2a82da;
-                outline: 0;
-            }
-            QHeaderView::section {
-                background-color: #333;
-                color: #aaa;
-                padding: 6px;
-                border: 1px solid #222;
-                font-weight: bold;
-            }
-            QScrollBar:vertical {
-                border: none;
-                background: #1e1e1e;
-                width: 10px;
-                margin: 0px;
-            }
-            QScrollBar::handle:vertical {
-                background: #444;
-                min-height: 20px;
-                border-radius: 5px;
-            }
-            QScrollBar::handle:vertical:hover {
-                background: #555;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                height: 0px;
-            }
-            QProgressBar {
-                border: 1px solid #333;
-                border-radius: 4px;
-                text-align: center;
-                background-color: #252525;
-            }
-            QProgressBar::chunk {
-                background-color: #2a82da;
-                width: 10px;
-            }
-        """)
-        control_panel = QHBoxLayout()
-        control_panel.setContentsMargins(10, 10, 10, 10)
-        control_panel.setSpacing(10)
-        self.btn_start = QPushButton(" Iniciar Verificación")
-        self.btn_start.setObjectName("btn_start")
-        self.btn_start.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_MediaPlay))
-        self.btn_start.clicked.connect(self.start_process)
-        self.btn_stop = QPushButton(" Detener")
-        self.btn_stop.setObjectName("btn_stop")
-        self.btn_stop.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_MediaStop))
-        self.btn_stop.clicked.connect(self.stop_process)
-        self.btn_stop.setEnabled(False)
-        self.btn_info = QPushButton(" Información")
-        self.btn_info.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_MessageBoxInformation))
-        self.btn_info.clicked.connect(self.show_info)
-        self.btn_info.setToolTip("Cómo funciona este script")
-        self.check_auto_search = QCheckBox("Auto-búsqueda")
-        self.check_auto_search.setChecked(True)
-        self.check_auto_search.setToolTip("Busca automáticamente nuevos streams para radios caídas")
-        self.check_video = QCheckBox("Grabar Debug")
-        self.check_video.setToolTip("Graba video de la búsqueda automática (Selenium)")
-        self.btn_clean = QPushButton(" Limpiar Videos")
-        self.btn_clean.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_DialogDiscardButton))
-        self.btn_clean.clicked.connect(self.limpiar_videos)
-        self.btn_clean.setToolTip("Borra todos los videos de las carpetas temp y exported")
-        control_panel.addWidget(self.btn_start)
-        control_panel.addWidget(self.btn_stop)
-        control_panel.addSpacing(10)
-        control_panel.addWidget(self.btn_info)
-        control_panel.addSpacing(20)
-        control_panel.addWidget(self.check_auto_search)
-        control_panel.addWidget(self.check_video)
-        control_panel.addStretch()
-        control_panel.addWidget(self.btn_clean)
-        main_layout.addLayout(control_panel)
-        splitter = QSplitter(Qt.Orientation.Vertical)
-        self.table = QTableWidget()
-        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["Radio/Frecuencia", "Estado", "URL Stream", "Info / Debug"])
-        header = self.table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Fixed)
-        self.table.setColumnWidth(1, 100)
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
-        splitter.addWidget(self.table)
-        self.log_console = QTextEdit()
-        self.log_console.setReadOnly(True)
-        self.log_console.setStyleSheet("background-color: #1e1e1e; color: #00ff00; font-family: Consolas;")
-        splitter.addWidget(self.log_console)
-        splitter.setSizes([500, 300])
-        self.main_splitter = QSplitter(Qt.Orientation.Horizontal)
-        self.main_splitter.addWidget(splitter)
-        self.video_panel = QStackedWidget()
-        self.video_panel.setMinimumWidth(350)
-        self.video_list_page = QWidget()
-        v_list_layout = QVBoxLayout(self.video_list_page)
-        v_header_layout = QHBoxLayout()
-        v_icon_label = QLabel()
-        v_icon_label.setPixmap(self.style().standardIcon(QStyle.StandardPixmap.SP_MediaPlay).pixmap(20, 20))
-        v_label = QLabel("Videos de la Sesión")
-        v_label.setStyleSheet("font-weight: bold; font-size: 16px;")
-        v_header_layout.addWidget(v_icon_label)
-        v_header_layout.addWidget(v_label)
-        v_header_layout.addStretch()
-        v_list_layout.addLayout(v_header_layout)
-        self.video_list = QListWidget()
-        self.video_list.setStyleSheet("""
-            QListWidget {
-                background-color: #252525;
-                border: 1px solid #333;
-                border-radius: 5px;
-                padding: 5px;
-            }
-            QListWidget::item {
-                padding: 10px;
-                border-bottom: 1px solid #333;
-                border-radius: 4px;
-            }
-            QListWidget::item:hover {
-                background-color: #333;
-            }
-            QListWidget::item:selected {
-                background-color: #2a82da;
-                color: white;
-            }
-        """)
-        self.video_list.itemClicked.connect(self.play_selected_video)
-        v_list_layout.addWidget(self.video_list)
-        self.video_panel.addWidget(self.video_list_page)
-        self.player_page = QWidget()
-        self.player_page.setStyleSheet("background-color: #1a1a1a;")
-        player_layout = QVBoxLayout(self.player_page)
-        player_layout.setContentsMargins(10, 10, 10, 10)
-        player_top_bar = QHBoxLayout()
-        btn_back = QPushButton(" Volver")
-        btn_back.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_ArrowBack))
-        btn_back.clicked.connect(self.stop_and_back)
-        btn_back.setStyleSheet("padding: 5px 15px; background-color: #333;")
-        self.current_video_label = QLabel("Reproduciendo: ...")
-        self.current_video_label.setStyleSheet("font-weight: bold; color: #42A5F5; font-size: 14px;")
-        player_top_bar.addWidget(btn_back)
-        player_top_bar.addSpacing(15)
-        player_top_bar.addWidget(self.current_video_label)
-        player_top_bar.addStretch()
-        player_layout.addLayout(player_top_bar)
-        video_container = QWidget()
-        video_container.setStyleSheet("border: 1px solid #333; background-color: black;")
-        video_container_layout = QVBoxLayout(video_container)
-        video_container_layout.setContentsMargins(0, 0, 0, 0)
-        self.video_widget = QVideoWidget()
-        self.video_widget.setMinimumHeight(400)
-        video_container_layout.addWidget(self.video_widget)
-        player_layout.addWidget(video_container)
-        controls_panel = QWidget()
-        controls_panel.setStyleSheet("background-color: #252525; border-radius: 8px;")
-        controls_layout = QVBoxLayout(controls_panel)
-        progress_layout = QHBoxLayout()
-        self.lbl_time_current = QLabel("00:00")
-        self.lbl_time_current.setStyleSheet("color: #aaa; font-family: Consolas;")
-        self.video_slider = QSlider(Qt.Orientation.Horizontal)
-        self.video_slider.setRange(0, 0)
-        self.video_slider.sliderMoved.connect(self.set_position)
-        self.video_slider.sliderReleased.connect(self.play_after_seek)
-        self.video_slider.setStyleSheet("""
-            QSlider {
-                height: 30px;
-                padding-left: 10px;
-                padding-right: 10px;
-            }
-            QSlider::groove:horizontal {
-                border: 1px solid #333;
-                height: 6px;
-                background: #444;
-                margin: 2px 0;
-                border-radius: 3px;
-            }
-            QSlider::handle:horizontal {
-                background: #42A5F5;
-                border: 1px solid #42A5F5;
-                width: 14px;
-                height: 14px;
-                margin: -5px 0;
-                border-radius: 7px;
-            }
-            QSlider::handle:horizontal:hover {
-                background: #64B5F6;
-                border: 1px solid #64B5F6;
-            }
-        """)
-        self.lbl_time_total = QLabel("00:00")
-        self.lbl_time_total.setStyleSheet("color: #aaa; font-family: Consolas;")
-        progress_layout.addWidget(self.lbl_time_current)
-        progress_layout.addWidget(self.video_slider)
-        progress_layout.addWidget(self.lbl_time_total)
-        controls_layout.addLayout(progress_layout)
-        btns_layout = QHBoxLayout()
-        self.btn_play_pause = QPushButton()
-        self.btn_play_pause.setFixedSize(40, 40)
-        self.btn_play_pause.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_MediaPlay))
-        self.btn_play_pause.clicked.connect(self.toggle_playback)
-        self.btn_play_pause.setStyleSheet("border-radius: 20px; background-color: #333;")
-        btns_layout.addStretch()
-        btns_layout.addWidget(self.btn_play_pause)
-        btns_layout.addStretch()
-        controls_layout.addLayout(btns_layout)
-        player_layout.addWidget(controls_panel)
-        self.media_player = QMediaPlayer()
-        self.audio_output = QAudioOutput()
-        self.media_player.setAudioOutput(self.audio_output)
-        self.media_player.setVideoOutput(self.video_widget)
-        self.media_player.positionChanged.connect(self.update_position)
-        self.media_player.durationChanged.connect(self.update_duration)
-        self.media_player.playbackStateChanged.connect(self.update_play_button)
-        self.media_player.errorOccurred.connect(self.handle_media_error)
-        self.video_panel.addWidget(self.player_page)
-        self.main_splitter.addWidget(self.video_panel)
-        self.main_splitter.setSizes([800, 400])
-        main_layout.addWidget(self.main_splitter)
-        status_layout = QHBoxLayout()
-        self.progress_bar = QProgressBar()
-        self.status_label = QLabel("Listo")
-        status_layout.addWidget(self.status_label)
-        status_layout.addWidget(self.progress_bar)
-        main_layout.addLayout(status_layout)
-        self.worker = None
-        self.taskbar_progress = TaskbarProgress()
-    def show_info(self):
-        diag = InfoDialog(self)
-        diag.exec()
-    def limpiar_videos(self):
-        if self.worker and self.worker.isRunning():
-            QMessageBox.warning(self, "Acción no permitida", "No puedes limpiar los videos mientras el proceso está en ejecución.")
-            return
-        reply = QMessageBox.question(
-            self, 'Confirmación',
-            "¿Estás seguro de que deseas eliminar TODOS los videos de las carpetas 'temp' y 'exported'?",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-            QMessageBox.StandardButton.No
+def main_cli(argv=None):
+    """Modo batch sin GUI (pensado para cron): corre el pipeline completo y deja los resultados en JSON"""
+    global TIMEOUT, MAX_THREADS, MAX_BROWSER_THREADS, VALIDACION_PROFUNDA
+    parser = argparse.ArgumentParser(description="Radio Checker en modo batch (sin interfaz gráfica)")
+    parser.add_argument("--cli", action="store_true", help="Ejecuta en modo batch (sin GUI)")
+    parser.add_argument("--sin-busqueda", action="store_true", help="No buscar streams nuevos para las radios caídas")
+    parser.add_argument("--grabar-video", action="store_true", help="Graba video de la búsqueda automática")
+    parser.add_argument("--incremental", action="store_true", help="Solo verifica filas nuevas, caídas o con éxito antiguo")
+    parser.add_argument("--concurrencia", type=int, default=MAX_CONCURRENCIA_ASYNC, help="Máximo de verificaciones simultáneas")
+    parser.add_argument("--por-host", type=int, default=MAX_CONEXIONES_POR_HOST, help="Máximo de conexiones simultáneas a un mismo host")
+    parser.add_argument("--hilos", type=int, default=MAX_THREADS, help="Hilos de verificación si aiohttp no está instalado")
+    parser.add_argument("--navegadores", type=int, default=MAX_BROWSER_THREADS, help="Búsquedas con navegador en paralelo")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="Timeout de cada verificación (segundos)")
+    parser.add_argument("--validacion-profunda", action="store_true", help="Exigir frames de audio reales (y seguir playlists) además de las cabeceras")
+    parser.add_argument("--salida-md", default=ARCHIVO_MD_ACTUALIZADO, help="Markdown actualizado")
+    parser.add_argument("--salida-json", default=ARCHIVO_RESULTADOS_JSON, help="Resultados en JSON ('-' para stdout)")
+    parser.add_argument("--log", default=None, help="Archivo donde copiar el log")
+    args = parser.parse_args(argv)
+    TIMEOUT = args.timeout
+    MAX_THREADS = args.hilos
+    MAX_BROWSER_THREADS = args.navegadores
+    VALIDACION_PROFUNDA = args.validacion_profunda
+    eventos = EventosBatch(args.log)
+    salida_consola = sys.stderr if args.salida_json == "-" else sys.stdout
+    with contextlib.redirect_stdout(salida_consola):
+        ejecutar_verificacion(
+            eventos,
+            auto_search=not args.sin_busqueda,
+            record_video=args.grabar_video,
+            incremental=args.incremental,
+            max_concurrencia=args.concurrencia,
+            max_por_host=args.por_host,
+            archivo_md=args.salida_md
         )
-        if reply == QMessageBox.StandardButton.Yes:
-            eliminados = 0
-            errores = 0
-            for folder in [TEMP_DIR, EXPORTED_DIR]:
-                if os.path.exists(folder):
-                    for filename in os.listdir(folder):
-                        file_path = os.path.join(folder, filename)
-                        try:
-                            if os.path.isfile(file_path) or os.path.islink(file_path):
-                                os.unlink(file_path)
-                                eliminados += 1
-                            elif os.path.isdir(file_path):
-                                shutil.rmtree(file_path)
-                                eliminados += 1
-                        except Exception as e:
-                            print(f"No se pudo eliminar {file_path}. Razón: {e}")
-                            errores += 1
-            self.video_list.clear()
-            self.append_log(f"🧹 Limpieza completada: {eliminados} archivos eliminados. Errores: {errores}")
-            QMessageBox.information(self, "Limpieza completada", f"Se eliminaron {eliminados} archivos.")
-    def start_process(self):
-        self.table.setRowCount(0)
-        self.log_console.clear()
-        try:
-            with open(ARCHIVO_LOG, "w", encoding="utf-8") as f:
-                f.write(f"=== REPORTE DE EJECUCIÓN: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ===\n\n")
-        except Exception as e:
-            print(f"Error al inicializar log: {e}")
-        self.btn_start.setEnabled(False)
-        self.btn_stop.setEnabled(True)
-        self.btn_clean.setEnabled(False)
-        self.check_auto_search.setEnabled(False)
-        self.check_video.setEnabled(False)
-        self.status_label.setText("Ejecutando...")
-        self.progress_bar.setValue(0)
-        if self.taskbar_progress:
-            self.taskbar_progress.set_progress_state(TBPF_NORMAL)
-            self.taskbar_progress.set_progress_value(0, 100)
-        self.worker = RadioCheckWorker(self.check_auto_search.isChecked(), self.check_video.isChecked())
-        self.worker.log_signal.connect(self.append_log)
-        self.worker.progress_signal.connect(self.update_progress)
-        self.worker.status_signal.connect(self.status_label.setText)
-        self.worker.table_init_signal.connect(self.init_table)
-        self.worker.row_update_signal.connect(self.update_row)
-        self.worker.video_found_signal.connect(self.add_exported_video)
-        self.worker.finished_signal.connect(self.process_finished)
-        self.worker.start()
-    def add_exported_video(self, radio_name, video_path):
-        radio_nombre_limpio = radio_name.replace('*', '').strip()
-        item = QListWidgetItem(radio_nombre_limpio)
-        item.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_FileIcon))
-        item.setData(Qt.ItemDataRole.UserRole, video_path)
-        item.setToolTip(f"Ver video de: {radio_nombre_limpio}")
-        self.video_list.addItem(item)
-        self.append_log(f"INFO: Video de {radio_nombre_limpio} disponible en la lista.")
-    def play_selected_video(self, item):
-        video_path = item.data(Qt.ItemDataRole.UserRole)
-        radio_name = item.text()
-        if os.path.exists(video_path):
-            self.current_video_label.setText(f"Reproduciendo: {radio_name}")
-            self.media_player.setSource(QUrl.fromLocalFile(video_path))
-            self.video_panel.setCurrentIndex(1)
-            self.media_player.play()
-        else:
-            QMessageBox.warning(self, "Error", "No se pudo encontrar el archivo de video.")
-    def stop_and_back(self):
-        self.media_player.stop()
-        self.video_panel.setCurrentIndex(0)
-    def toggle_playback(self):
-        if self.media_player.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
-            self.media_player.pause()
-        else:
-            self.media_player.play()
-    def update_play_button(self, state):
-        if state == QMediaPlayer.PlaybackState.PlayingState:
-            self.btn_play_pause.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_MediaPause))
-        else:
-            self.btn_play_pause.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_MediaPlay))
-    def update_position(self, position):
-        self.video_slider.setValue(position)
-        self.lbl_time_current.setText(self.format_time(position))
-    def update_duration(self, duration):
-        self.video_slider.setRange(0, duration)
-        self.lbl_time_total.setText(self.format_time(duration))
-    def set_position(self, position):
-        self.media_player.setPosition(position)
-    def play_after_seek(self):
-        """Asegura que el video siga reproduciéndose tras soltar el slider"""
-        if self.media_player.playbackState() != QMediaPlayer.PlaybackState.PlayingState:
-            self.media_player.play()
-    def format_time(self, ms):
-        s = round(ms / 1000)
-        m, s = divmod(s, 60)
-        return f"{m:02d}:{s:02d}"
-    def handle_media_error(self):
-        err = self.media_player.errorString()
-        self.append_log(f"ERROR Multimedia: {err}")
-    def stop_process(self):
-        if self.worker and self.worker.isRunning():
-            self.worker.stop()
-            if self.taskbar_progress:
-                self.taskbar_progress.set_progress_state(TBPF_PAUSED)
-            self.append_log("\n⚠️ Solicitando detención... esperando a que terminen los hilos actuales...")
-            self.status_label.setText("Deteniendo...")
-            self.btn_stop.setEnabled(False)
-    def process_finished(self, msg):
-        self.btn_start.setEnabled(True)
-        self.btn_stop.setEnabled(False)
-        self.btn_clean.setEnabled(True)
-        self.check_auto_search.setEnabled(True)
-        self.check_video.setEnabled(True)
-        self.status_label.setText(f"Finalizado: {msg}")
-        if self.taskbar_progress:
-            self.taskbar_progress.set_progress_state(TBPF_NOPROGRESS)
-        QMessageBox.information(self, "Proceso Completado", msg)
-    @pyqtSlot(str)
-    def append_log(self, text):
-        text_str = str(text)
-        self.log_console.moveCursor(QTextCursor.MoveOperation.End)
-        self.log_console.insertPlainText(text_str)
-        final_text = text_str
-        if not text_str.endswith('\n'):
-             self.log_console.insertPlainText('\n')
-             final_text += '\n'
-        self.log_console.moveCursor(QTextCursor.MoveOperation.End)
-        try:
-            with open(ARCHIVO_LOG, "a", encoding="utf-8") as f:
-                f.write(final_text)
-        except:
-            pass
-    @pyqtSlot(int, int)
-    def update_progress(self, current, total):
-        self.progress_bar.setMaximum(total)
-        self.progress_bar.setValue(current)
-        if self.taskbar_progress:
-            self.taskbar_progress.set_progress_value(int(current), int(total))
-    @pyqtSlot(list)
-    def init_table(self, radios):
-        self.table.setRowCount(len(radios))
-        for i, radio in enumerate(radios):
-            item_name = QTableWidgetItem(f"{radio['nombre']} ({radio['frecuencia']})")
-            self.table.setItem(i, 0, item_name)
-            item_status = QTableWidgetItem("PENDIENTE")
-            item_status.setForeground(QColor("gray"))
-            self.table.setItem(i, 1, item_status)
-            self.table.setItem(i, 2, QTableWidgetItem(radio['url']))
-            self.table.setItem(i, 3, QTableWidgetItem("-"))
-    @pyqtSlot(int, str, str, str, str)
-    def update_row(self, row, status, url, info, nombre):
-        item_name = self.table.item(row, 0)
-        if item_name:
-            texto_actual = item_name.text()
-            frecuencia = ""
-            if '(' in texto_actual and ')' in texto_actual:
-                frecuencia = texto_actual.split('(')[-1].split(')')[0]
-            if frecuencia:
-                item_name.setText(f"{nombre} ({frecuencia})")
-            else:
-                item_name.setText(nombre)
-        item_status = self.table.item(row, 1)
-        item_status.setText(status)
-        item_status.setBackground(QColor(0, 0, 0, 0))
-        icon = QIcon()
-        msg_type = QStyle.StandardPixmap.SP_MessageBoxInformation
-        text_color = QColor("white")
-        if status == "ACTIVO":
-            msg_type = QStyle.StandardPixmap.SP_DialogApplyButton
-            text_color = QColor("#4CAF50")
-        elif "CAIDO" in status or "NO_ENCONTRADO" in status:
-            msg_type = QStyle.StandardPixmap.SP_DialogCancelButton
-            text_color = QColor("#EF5350")
-        elif "TIMEOUT" in status:
-            msg_type = QStyle.StandardPixmap.SP_MessageBoxWarning
-            text_color = QColor("#FFCA28")
-        elif "ACTUALIZADO" in status:
-            msg_type = QStyle.StandardPixmap.SP_BrowserReload
-            text_color = QColor("#42A5F5")
-        elif "ERROR_BUSQ" in status:
-            msg_type = QStyle.StandardPixmap.SP_MessageBoxCritical
-            text_color = QColor("#FF7043")
-        item_status.setIcon(self.style().standardIcon(msg_type))
-        item_status.setForeground(text_color)
-        self.table.item(row, 2).setText(url)
-        self.table.item(row, 3).setText(info)
-        self.table.scrollToItem(self.table.item(row, 0))
-    def showEvent(self, event):
-        """Se ejecuta cuando la ventana se muestra por primera vez"""
-        super().showEvent(event)
-        if self.taskbar_progress:
-            self.taskbar_progress.set_hwnd(int(self.winId()))
-        if es_primera_vez():
-            QMessageBox.warning(
-                self,
-                "Advertencia importante",
-                "Esta herramienta puede equivocarse de URL a veces. "
-                "NO SEAS DOLOBU y revisa las URLs nuevas, a ver si no metió la pata el programa."
-            )
-            marcar_primera_vez_completada()
+    resultado = json.dumps(eventos.exportar(), ensure_ascii=False, indent=2)
+    if args.salida_json == "-":
+        print(resultado)
+    else:
+        with open(args.salida_json, "w", encoding="utf-8") as f:
+            f.write(resultado)
+    return 1 if eventos.mensaje in [None, "Error inicial", "Error fatal"] else 0
 
 def main():
-    app = QApplication(sys.argv)
-    app.setStyle("Fusion")
-    palette = QPalette()
-    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.Window, QColor(53, 53, 53))
-    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.WindowText, Qt.GlobalColor.white)
-    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.Base, QColor(25, 25, 25))
-    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.AlternateBase, QColor(53, 53, 53))
-    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.ToolTipBase, Qt.GlobalColor.white)
-    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.ToolTipText, Qt.GlobalColor.white)
-    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.Text, Qt.GlobalColor.white)
-    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.Button, QColor(53, 53, 53))
-    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.ButtonText, Qt.GlobalColor.white)
-    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.BrightText, Qt.GlobalColor.red)
-    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.Link, QColor(42, 130, 218))
-    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.Highlight, QColor(42, 130, 218))
-    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.HighlightedText, Qt.GlobalColor.black)
-    app.setPalette(palette)
-    window = MainWindow()
-    window.show()
-    sys.exit(app.exec())
+    if "--cli" in sys.argv[1:]:
+        sys.exit(main_cli(sys.argv[1:]))
+    sys.modules.setdefault("RadioChecker", sys.modules[__name__])
+    from RadioCheckerGUI import main as main_gui
+    main_gui()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,879 @@
+import sys
+import os
+import shutil
+import ctypes
+from ctypes import wintypes
+from datetime import datetime
+from RadioChecker import (ARCHIVO_LOG, TEMP_DIR, EXPORTED_DIR, ejecutar_verificacion,
+                          es_primera_vez, marcar_primera_vez_completada)
+try:
+    from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
+                                QHBoxLayout, QPushButton, QCheckBox, QTableWidget,
+                                QTableWidgetItem, QHeaderView, QTextEdit, QLabel,
+                                QProgressBar, QSplitter, QMessageBox, QStyle,
+                                QListWidget, QListWidgetItem, QStackedWidget, QSlider,
+                                QDialog, QAbstractItemView)
+    from PyQt6.QtCore import Qt, QThread, pyqtSignal, QObject, pyqtSlot, QUrl
+    from PyQt6.QtGui import QColor, QFont, QTextCursor, QIcon, QPalette
+except ImportError:
+    print("Error: PyQt6 no está instalado. Instálalo con: pip install PyQt6")
+    sys.exit(1)
+QMediaPlayer = QAudioOutput = QVideoWidget = None
+
+def _cargar_multimedia():
+    """Importa QtMultimedia recién cuando se abre el reproductor de videos"""
+    global QMediaPlayer, QAudioOutput, QVideoWidget
+    if QMediaPlayer is None:
+        from PyQt6.QtMultimedia import QMediaPlayer as _QMediaPlayer, QAudioOutput as _QAudioOutput
+        from PyQt6.QtMultimediaWidgets import QVideoWidget as _QVideoWidget
+        QAudioOutput, QVideoWidget = _QAudioOutput, _QVideoWidget
+        QMediaPlayer = _QMediaPlayer
+
+class StreamRedirector(QObject):
+    text_written = pyqtSignal(str)
+    def write(self, text):
+        self.text_written.emit(str(text))
+    def flush(self):
+        pass
+
+class RadioCheckWorker(QThread):
+    log_signal = pyqtSignal(str)
+    progress_signal = pyqtSignal(int, int)
+    status_signal = pyqtSignal(str)
+    table_init_signal = pyqtSignal(list)
+    row_update_signal = pyqtSignal(int, str, str, str, str)
+    video_found_signal = pyqtSignal(str, str)
+    finished_signal = pyqtSignal(str)
+    def __init__(self, auto_search, record_video, incremental=False):
+        super().__init__()
+        self.auto_search = auto_search
+        self.record_video = record_video
+        self.incremental = incremental
+        self.is_running = True
+    def run(self):
+        ejecutar_verificacion(self, self.auto_search, self.record_video, self.incremental)
+    def log(self, texto):
+        self.log_signal.emit(texto)
+    def progreso(self, actual, total):
+        self.progress_signal.emit(actual, total)
+    def estado(self, texto):
+        self.status_signal.emit(texto)
+    def tabla(self, radios):
+        self.table_init_signal.emit(radios)
+    def fila(self, indice, estado, url, info, nombre):
+        self.row_update_signal.emit(indice, estado, url, info, nombre)
+    def video(self, nombre, ruta):
+        self.video_found_signal.emit(nombre, ruta)
+    def finalizado(self, mensaje):
+        self.finished_signal.emit(mensaje)
+    def activo(self):
+        return self.is_running
+    def stop(self):
+        self.is_running = False
+
+
+class GUID(ctypes.Structure):
+    _fields_ = [
+        ("Data1", wintypes.DWORD),
+        ("Data2", wintypes.WORD),
+        ("Data3", wintypes.WORD),
+        ("Data4", wintypes.BYTE * 8)
+    ]
+
+def DEFINE_GUID(l, w1, w2, b1, b2, b3, b4, b5, b6, b7, b8):
+    return GUID(l, w1, w2, (wintypes.BYTE * 8)(b1, b2, b3, b4, b5, b6, b7, b8))
+
+CLSID_TaskbarList = DEFINE_GUID(0x56FDF344, 0xFD6D, 0x11d0, 0x95, 0x8A, 0x00, 0x60, 0x97, 0xC9, 0xA0, 0x90)
+IID_ITaskbarList3 = DEFINE_GUID(0xEA1AFB91, 0x9E28, 0x4B86, 0x90, 0xE9, 0x9E, 0x9F, 0x8A, 0x5E, 0xEF, 0xAF)
+
+TBPF_NOPROGRESS    = 0
+TBPF_INDETERMINATE = 0x1
+TBPF_NORMAL        = 0x2
+TBPF_ERROR         = 0x4
+TBPF_PAUSED        = 0x8
+
+class TaskbarProgress:
+    def __init__(self, hwnd=None):
+        self.hwnd = hwnd
+        self._ptr = None
+        try:
+            self._init_interface()
+        except Exception as e:
+            print(f"Error initializing TaskbarProgress: {e}")
+            self._ptr = None
+
+    def _init_interface(self):
+        try:
+            # S_FALSE = 1, S_OK = 0, RPC_E_CHANGED_MODE = 0x80010106
+            # We don't really care if it fails due to changed mode, Qt handles COM usually.
+            ctypes.windll.ole32.CoInitialize(None)
+        except Exception:
+            pass
+        
+        ptr = ctypes.c_void_p()
+        CLSCTX_INPROC_SERVER = 1
+        
+        try:
+            hr = ctypes.windll.ole32.CoCreateInstance(
+                ctypes.byref(CLSID_TaskbarList),
+                None,
+                CLSCTX_INPROC_SERVER,
+                ctypes.byref(IID_ITaskbarList3),
+                ctypes.byref(ptr)
+            )
+            
+            if hr == 0 and ptr:
+                self._ptr = ptr
+                # HrInit is at index 3 in ITaskbarList3 (IUnknown=3 + ITaskbarList=1?? No, ITaskbarList inherits IUnknown)
+                # IUnknown: QueryInterface(0), AddRef(1), Release(2)
+                # ITaskbarList: HrInit(3), AddTab(4), DeleteTab(5), ActivateTab(6), SetActiveAlt(7)
+                # ITaskbarList2: MarkFullscreenWindow(8)
+                # ITaskbarList3: SetProgressValue(9), SetProgressState(10), ...
+                init_func = self._get_vtable_func(3, ctypes.HRESULT)
+                if init_func:
+                    init_func(self._ptr)
+        except Exception as e:
+            print(f"Failed to create ITaskbarList3: {e}")
+            self._ptr = None
+
+    def _get_vtable_func(self, index, res_type, *arg_types):
+        if not self._ptr or not self._ptr.value: return None
+        try:
+            pInterface = self._ptr.value
+            # Get VTable pointer (first value at interface address)
+            pVTable = ctypes.c_void_p.from_address(pInterface).value
+            if not pVTable: return None
+            # Get Function address (index-th entry in VTable)
+            func_addr = ctypes.c_void_p.from_address(pVTable + index * ctypes.sizeof(ctypes.c_void_p)).value
+            if not func_addr: return None
+            
+            return ctypes.WINFUNCTYPE(res_type, ctypes.c_void_p, *arg_types)(func_addr)
+        except Exception as e:
+            print(f"Error getting vtable func: {e}")
+            return None
+
+    def set_progress_value(self, current, total):
+        # 9 is SetProgressValue
+        if not self._ptr or not self.hwnd: return
+        try:
+            func = self._get_vtable_func(9, ctypes.HRESULT, wintypes.HWND, ctypes.c_uint64, ctypes.c_uint64)
+            if func:
+                func(self._ptr, self.hwnd, current, total)
+        except: pass
+
+    def set_progress_state(self, state):
+        # 10 is SetProgressState
+        if not self._ptr or not self.hwnd: return
+        try:
+            func = self._get_vtable_func(10, ctypes.HRESULT, wintypes.HWND, wintypes.DWORD)
+            if func:
+                func(self._ptr, self.hwnd, state)
+        except: pass
+            
+    def set_hwnd(self, hwnd):
+        self.hwnd = hwnd
+
+class InfoDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Información de Radio Checker")
+        self.setMinimumSize(500, 400)
+        self.setStyleSheet("""
+            QDialog {
+                background-color: #252525;
+                color: white;
+            }
+            QLabel {
+                color: #e0e0e0;
+                font-size: 14px;
+            }
+            QPushButton#nav_btn {
+                background-color: #333;
+                border-radius: 20px;
+                padding: 10px;
+                font-weight: bold;
+                font-size: 18px;
+                color: white;
+                border: 1px solid #444;
+            }
+            QPushButton#nav_btn:hover {
+                background-color: #444;
+                border: 1px solid #555;
+            }
+            QPushButton#nav_btn:pressed {
+                background-color: #2a82da;
+            }
+            QPushButton#nav_btn:disabled {
+                background-color: #1a1a1a;
+                color: #444;
+                border: 1px solid #222;
+            }
+        """)
+        layout = QVBoxLayout(self)
+        self.pages = QStackedWidget()
+        p1 = QWidget()
+        l1 = QVBoxLayout(p1)
+        h1 = QHBoxLayout()
+        icon1 = QLabel()
+        icon1.setPixmap(self.style().standardIcon(QStyle.StandardPixmap.SP_MessageBoxInformation).pixmap(32, 32))
+        h1.addWidget(icon1)
+        h1.addWidget(QLabel("<h2 style='color: #42A5F5; margin: 0;'> Bienvenido a Radio Checker</h2>"))
+        h1.addStretch()
+        l1.addLayout(h1)
+        lbl1 = QLabel("<div style='margin-top: 10px; text-align: justify;'>"
+                           "<p>Esta herramienta ha sido diseñada para automatizar la gestión y el mantenimiento de una extensa lista de emisoras de radio argentinas. Su objetivo principal es garantizar que todos los enlaces de streaming funcionen correctamente y se mantengan actualizados de forma autónoma.</p>"
+                           "<p>El proceso comienza descargando la información más reciente desde un repositorio central alojado en GitHub Gist, asegurando que siempre trabaje con la versión más reciente del listado oficial. Una vez obtenida la lista, el sistema analiza la estructura del archivo para identificar cada emisora, su frecuencia y su enlace actual, preparándolos para una verificación exhaustiva y veloz mediante procesos concurrentes.</p>"
+                           "</div>")
+        lbl1.setWordWrap(True)
+        l1.addWidget(lbl1)
+        l1.addStretch()
+        self.pages.addWidget(p1)
+        p2 = QWidget()
+        l2 = QVBoxLayout(p2)
+        h2 = QHBoxLayout()
+        icon2 = QLabel()
+        icon2.setPixmap(self.style().standardIcon(QStyle.StandardPixmap.SP_DialogApplyButton).pixmap(32, 32))
+        h2.addWidget(icon2)
+        h2.addWidget(QLabel("<h2 style='color: #4CAF50; margin: 0;'> Verificación de Streams</h2>"))
+        h2.addStretch()
+        l2.addLayout(h2)
+        lbl2 = QLabel("<div style='margin-top: 10px; text-align: justify;'>"
+                           "<p>Durante la fase de verificación técnica, el sistema realiza una conexión directa con cada servidor de streaming para validar su estado de actividad en tiempo real. Para garantizar un diagnóstico preciso, se establece un tiempo de espera inteligente que evita que enlaces lentos bloqueen el flujo de trabajo.</p>"
+                           "<p>No solo comprobamos la disponibilidad del servidor, sino que también inspeccionamos minuciosamente las cabeceras de respuesta para confirmar que el contenido sea realmente un flujo de audio válido. Además, utilizamos identificadores de navegador reales para simular conexiones legítimas, evitando bloqueos automáticos y asegurando la mayor tasa de éxito posible en la verificación.</p>"
+                           "</div>")
+        lbl2.setWordWrap(True)
+        l2.addWidget(lbl2)
+        l2.addStretch()
+        self.pages.addWidget(p2)
+        p3 = QWidget()
+        l3 = QVBoxLayout(p3)
+        h3 = QHBoxLayout()
+        icon3 = QLabel()
+        icon3.setPixmap(self.style().standardIcon(QStyle.StandardPixmap.SP_BrowserReload).pixmap(32, 32))
+        h3.addWidget(icon3)
+        h3.addWidget(QLabel("<h2 style='color: #FFCA28; margin: 0;'> Búsqueda Automática</h2>"))
+        h3.addStretch()
+        l3.addLayout(h3)
+        lbl3 = QLabel("<div style='margin-top: 10px; text-align: justify;'>"
+                           "<p>Cuando se detecta que una emisora está fuera de línea, la aplicación activa un proceso de recuperación inteligente por pasos. En primera instancia, consulta la base de datos de <b>Radio Browser API</b>, una plataforma global que permite localizar rápidamente streams verificados por la comunidad.</p>"
+                           "<p>Si la API no devuelve resultados válidos, el sistema inicia automáticamente una instancia del navegador para explorar la web. Durante esta fase, el script realiza un monitoreo de red en tiempo real para capturar el enlace exacto del audio mientras simula interacciones humanas y clics en botones de reproducción, agotando todas las instancias para restaurar el servicio.</p>"
+                           "</div>")
+        lbl3.setWordWrap(True)
+        l3.addWidget(lbl3)
+        l3.addStretch()
+        self.pages.addWidget(p3)
+        p4 = QWidget()
+        l4 = QVBoxLayout(p4)
+        h4 = QHBoxLayout()
+        icon4 = QLabel()
+        icon4.setPixmap(self.style().standardIcon(QStyle.StandardPixmap.SP_MediaPlay).pixmap(32, 32))
+        h4.addWidget(icon4)
+        h4.addWidget(QLabel("<h2 style='color: #EF5350; margin: 0;'> Grabación Debug</h2>"))
+        h4.addStretch()
+        l4.addLayout(h4)
+        lbl4 = QLabel("<div style='margin-top: 10px; text-align: justify;'>"
+                           "<p>Para los usuarios que desean una supervisión total o necesitan resolver problemas complejos de detección, la aplicación ofrece un modo de grabación de depuración. Al activar esta función, el sistema captura un video completo de cada sesión de búsqueda realizada por el navegador automático.</p>"
+                           "<p>Esto resulta extremadamente útil para visualizar exactamente qué sucede en el sitio web de una radio, permitiendo identificar cambios visuales o errores técnicos que impidieron la detección. Todos estos videos se organizan automáticamente y pueden ser revisados directamente desde el reproductor integrado en esta herramienta.</p>"
+                           "</div>")
+        lbl4.setWordWrap(True)
+        l4.addWidget(lbl4)
+        l4.addStretch()
+        self.pages.addWidget(p4)
+        layout.addWidget(self.pages)
+        nav_layout = QHBoxLayout()
+        self.btn_prev = QPushButton("←")
+        self.btn_prev.setObjectName("nav_btn")
+        self.btn_prev.setFixedSize(60, 40)
+        self.btn_prev.clicked.connect(self.prev_page)
+        self.page_label = QLabel(f"1 / {self.pages.count()}")
+        self.page_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.page_label.setStyleSheet("font-weight: bold; font-size: 16px; color: #aaa;")
+        self.btn_next = QPushButton("→")
+        self.btn_next.setObjectName("nav_btn")
+        self.btn_next.setFixedSize(60, 40)
+        self.btn_next.clicked.connect(self.next_page)
+        nav_layout.addWidget(self.btn_prev)
+        nav_layout.addStretch()
+        nav_layout.addWidget(self.page_label)
+        nav_layout.addStretch()
+        nav_layout.addWidget(self.btn_next)
+        layout.addLayout(nav_layout)
+        self.update_nav_buttons()
+    def prev_page(self):
+        curr = self.pages.currentIndex()
+        if curr > 0:
+            self.pages.setCurrentIndex(curr - 1)
+            self.update_nav_buttons()
+    def next_page(self):
+        curr = self.pages.currentIndex()
+        if curr < self.pages.count() - 1:
+            self.pages.setCurrentIndex(curr + 1)
+            self.update_nav_buttons()
+    def update_nav_buttons(self):
+        curr = self.pages.currentIndex()
+        total = self.pages.count()
+        self.btn_prev.setEnabled(curr > 0)
+        self.btn_next.setEnabled(curr < total - 1)
+        self.page_label.setText(f"{curr + 1} / {total}")
+
+class MainWindow(QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Radio Checker")
+        self.resize(1200, 800)
+        self.redirector = StreamRedirector()
+        self.redirector.text_written.connect(self.append_log)
+        sys.stdout = self.redirector
+        sys.stderr = self.redirector
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        main_layout = QVBoxLayout(central_widget)
+        self.worker = None
+        self.worker = None
+        self.setStyleSheet("""
+            QMainWindow {
+                background-color: #1e1e1e;
+            }
+            QWidget {
+                color: #e0e0e0;
+                font-family: 'Segoe UI', Arial;
+            }
+            QPushButton {
+                background-color: #333333;
+                color: white;
+                border: 1px solid #444;
+                border-radius: 4px;
+                padding: 6px 14px;
+                font-size: 13px;
+                min-height: 24px;
+            }
+            QPushButton:hover {
+                background-color: #444444;
+                border: 1px solid #555;
+            }
+            QPushButton:pressed {
+                background-color: #2a82da;
+                border: 1px solid #2a82da;
+            }
+            QPushButton:disabled {
+                background-color: #252525;
+                color: #555;
+                border: 1px solid #333;
+            }
+            QPushButton#btn_start {
+                background-color: #2e7d32;
+                border: 1px solid #1b5e20;
+                font-weight: bold;
+            }
+            QPushButton#btn_start:hover {
+                background-color: #388e3c;
+            }
+            QPushButton#btn_start:disabled {
+                background-color: #1b331b;
+                color: #444;
+            }
+            QPushButton#btn_stop {
+                background-color: #c62828;
+                border: 1px solid #b71c1c;
+            }
+            QPushButton#btn_stop:hover {
+                background-color: #d32f2f;
+            }
+            QPushButton#btn_stop:disabled {
+                background-color: #331b1b;
+                color: #444;
+            }
+            QCheckBox {
+                spacing: 8px;
+                color: #e0e0e0;
+            }
+            QCheckBox::indicator {
+                width: 18px;
+                height: 18px;
+                background-color: #333;
+                border: 1px solid #555;
+                border-radius: 3px;
+            }
+            QCheckBox::indicator:checked {
+                background-color: #2a82da;
+                border: 1px solid #2a82da;
+                image: url(check_mark.png); /* Note: if we don't have the icon it will just be blue */
+            }
+            QTableWidget {
+                background-color: #252525;
+                alternate-background-color: #2a2a2a;
+                gridline-color: #333;
+                border: 1px solid #333;
+                selection-background-color: #2a82da;
+                outline: 0;
+            }
+            QHeaderView::section {
+                background-color: #333;
+                color: #aaa;
+                padding: 6px;
+                border: 1px solid #222;
+                font-weight: bold;
+            }
+            QScrollBar:vertical {
+                border: none;
+                background: #1e1e1e;
+                width: 10px;
+                margin: 0px;
+            }
+            QScrollBar::handle:vertical {
+                background: #444;
+                min-height: 20px;
+                border-radius: 5px;
+            }
+            QScrollBar::handle:vertical:hover {
+                background: #555;
+            }
+            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+                height: 0px;
+            }
+            QProgressBar {
+                border: 1px solid #333;
+                border-radius: 4px;
+                text-align: center;
+                background-color: #252525;
+            }
+            QProgressBar::chunk {
+                background-color: #2a82da;
+                width: 10px;
+            }
+        """)
+        control_panel = QHBoxLayout()
+        control_panel.setContentsMargins(10, 10, 10, 10)
+        control_panel.setSpacing(10)
+        self.btn_start = QPushButton(" Iniciar Verificación")
+        self.btn_start.setObjectName("btn_start")
+        self.btn_start.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_MediaPlay))
+        self.btn_start.clicked.connect(self.start_process)
+        self.btn_stop = QPushButton(" Detener")
+        self.btn_stop.setObjectName("btn_stop")
+        self.btn_stop.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_MediaStop))
+        self.btn_stop.clicked.connect(self.stop_process)
+        self.btn_stop.setEnabled(False)
+        self.btn_info = QPushButton(" Información")
+        self.btn_info.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_MessageBoxInformation))
+        self.btn_info.clicked.connect(self.show_info)
+        self.btn_info.setToolTip("Cómo funciona este script")
+        self.check_auto_search = QCheckBox("Auto-búsqueda")
+        self.check_auto_search.setChecked(True)
+        self.check_auto_search.setToolTip("Busca automáticamente nuevos streams para radios caídas")
+        self.check_video = QCheckBox("Grabar Debug")
+        self.check_video.setToolTip("Graba video de la búsqueda automática (Selenium)")
+        self.check_incremental = QCheckBox("Incremental")
+        self.check_incremental.setToolTip("Solo verifica URLs nuevas, caídas la última vez o con un éxito antiguo")
+        self.btn_clean = QPushButton(" Limpiar Videos")
+        self.btn_clean.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_DialogDiscardButton))
+        self.btn_clean.clicked.connect(self.limpiar_videos)
+        self.btn_clean.setToolTip("Borra todos los videos de las carpetas temp y exported")
+        control_panel.addWidget(self.btn_start)
+        control_panel.addWidget(self.btn_stop)
+        control_panel.addSpacing(10)
+        control_panel.addWidget(self.btn_info)
+        control_panel.addSpacing(20)
+        control_panel.addWidget(self.check_auto_search)
+        control_panel.addWidget(self.check_video)
+        control_panel.addWidget(self.check_incremental)
+        control_panel.addStretch()
+        control_panel.addWidget(self.btn_clean)
+        main_layout.addLayout(control_panel)
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        self.table = QTableWidget()
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setColumnCount(4)
+        self.table.setHorizontalHeaderLabels(["Radio/Frecuencia", "Estado", "URL Stream", "Info / Debug"])
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Fixed)
+        self.table.setColumnWidth(1, 100)
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+        splitter.addWidget(self.table)
+        self.log_console = QTextEdit()
+        self.log_console.setReadOnly(True)
+        self.log_console.setStyleSheet("background-color: #1e1e1e; color: #00ff00; font-family: Consolas;")
+        splitter.addWidget(self.log_console)
+        splitter.setSizes([500, 300])
+        self.main_splitter = QSplitter(Qt.Orientation.Horizontal)
+        self.main_splitter.addWidget(splitter)
+        self.video_panel = QStackedWidget()
+        self.video_panel.setMinimumWidth(350)
+        self.video_list_page = QWidget()
+        v_list_layout = QVBoxLayout(self.video_list_page)
+        v_header_layout = QHBoxLayout()
+        v_icon_label = QLabel()
+        v_icon_label.setPixmap(self.style().standardIcon(QStyle.StandardPixmap.SP_MediaPlay).pixmap(20, 20))
+        v_label = QLabel("Videos de la Sesión")
+        v_label.setStyleSheet("font-weight: bold; font-size: 16px;")
+        v_header_layout.addWidget(v_icon_label)
+        v_header_layout.addWidget(v_label)
+        v_header_layout.addStretch()
+        v_list_layout.addLayout(v_header_layout)
+        self.video_list = QListWidget()
+        self.video_list.setStyleSheet("""
+            QListWidget {
+                background-color: #252525;
+                border: 1px solid #333;
+                border-radius: 5px;
+                padding: 5px;
+            }
+            QListWidget::item {
+                padding: 10px;
+                border-bottom: 1px solid #333;
+                border-radius: 4px;
+            }
+            QListWidget::item:hover {
+                background-color: #333;
+            }
+            QListWidget::item:selected {
+                background-color: #2a82da;
+                color: white;
+            }
+        """)
+        self.video_list.itemClicked.connect(self.play_selected_video)
+        v_list_layout.addWidget(self.video_list)
+        self.video_panel.addWidget(self.video_list_page)
+        self.media_player = None
+        self.main_splitter.addWidget(self.video_panel)
+        self.main_splitter.setSizes([800, 400])
+        main_layout.addWidget(self.main_splitter)
+        status_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.status_label = QLabel("Listo")
+        status_layout.addWidget(self.status_label)
+        status_layout.addWidget(self.progress_bar)
+        main_layout.addLayout(status_layout)
+        self.worker = None
+        self.taskbar_progress = TaskbarProgress()
+    def show_info(self):
+        diag = InfoDialog(self)
+        diag.exec()
+    def limpiar_videos(self):
+        if self.worker and self.worker.isRunning():
+            QMessageBox.warning(self, "Acción no permitida", "No puedes limpiar los videos mientras el proceso está en ejecución.")
+            return
+        reply = QMessageBox.question(
+            self, 'Confirmación',
+            "¿Estás seguro de que deseas eliminar TODOS los videos de las carpetas 'temp' y 'exported'?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            eliminados = 0
+            errores = 0
+            for folder in [TEMP_DIR, EXPORTED_DIR]:
+                if os.path.exists(folder):
+                    for filename in os.listdir(folder):
+                        file_path = os.path.join(folder, filename)
+                        try:
+                            if os.path.isfile(file_path) or os.path.islink(file_path):
+                                os.unlink(file_path)
+                                eliminados += 1
+                            elif os.path.isdir(file_path):
+                                shutil.rmtree(file_path)
+                                eliminados += 1
+                        except Exception as e:
+                            print(f"No se pudo eliminar {file_path}. Razón: {e}")
+                            errores += 1
+            self.video_list.clear()
+            self.append_log(f"🧹 Limpieza completada: {eliminados} archivos eliminados. Errores: {errores}")
+            QMessageBox.information(self, "Limpieza completada", f"Se eliminaron {eliminados} archivos.")
+    def start_process(self):
+        self.table.setRowCount(0)
+        self.log_console.clear()
+        try:
+            with open(ARCHIVO_LOG, "w", encoding="utf-8") as f:
+                f.write(f"=== REPORTE DE EJECUCIÓN: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ===\n\n")
+        except Exception as e:
+            print(f"Error al inicializar log: {e}")
+        self.btn_start.setEnabled(False)
+        self.btn_stop.setEnabled(True)
+        self.btn_clean.setEnabled(False)
+        self.check_auto_search.setEnabled(False)
+        self.check_video.setEnabled(False)
+        self.check_incremental.setEnabled(False)
+        self.status_label.setText("Ejecutando...")
+        self.progress_bar.setValue(0)
+        if self.taskbar_progress:
+            self.taskbar_progress.set_progress_state(TBPF_NORMAL)
+            self.taskbar_progress.set_progress_value(0, 100)
+        self.worker = RadioCheckWorker(self.check_auto_search.isChecked(), self.check_video.isChecked(), self.check_incremental.isChecked())
+        self.worker.log_signal.connect(self.append_log)
+        self.worker.progress_signal.connect(self.update_progress)
+        self.worker.status_signal.connect(self.status_label.setText)
+        self.worker.table_init_signal.connect(self.init_table)
+        self.worker.row_update_signal.connect(self.update_row)
+        self.worker.video_found_signal.connect(self.add_exported_video)
+        self.worker.finished_signal.connect(self.process_finished)
+        self.worker.start()
+    def add_exported_video(self, radio_name, video_path):
+        radio_nombre_limpio = radio_name.replace('*', '').strip()
+        item = QListWidgetItem(radio_nombre_limpio)
+        item.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_FileIcon))
+        item.setData(Qt.ItemDataRole.UserRole, video_path)
+        item.setToolTip(f"Ver video de: {radio_nombre_limpio}")
+        self.video_list.addItem(item)
+        self.append_log(f"INFO: Video de {radio_nombre_limpio} disponible en la lista.")
+    def _crear_reproductor(self):
+        """Arma la página del reproductor la primera vez que se abre un video"""
+        _cargar_multimedia()
+        self.player_page = QWidget()
+        self.player_page.setStyleSheet("background-color: #1a1a1a;")
+        player_layout = QVBoxLayout(self.player_page)
+        player_layout.setContentsMargins(10, 10, 10, 10)
+        player_top_bar = QHBoxLayout()
+        btn_back = QPushButton(" Volver")
+        btn_back.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_ArrowBack))
+        btn_back.clicked.connect(self.stop_and_back)
+        btn_back.setStyleSheet("padding: 5px 15px; background-color: #333;")
+        self.current_video_label = QLabel("Reproduciendo: ...")
+        self.current_video_label.setStyleSheet("font-weight: bold; color: #42A5F5; font-size: 14px;")
+        player_top_bar.addWidget(btn_back)
+        player_top_bar.addSpacing(15)
+        player_top_bar.addWidget(self.current_video_label)
+        player_top_bar.addStretch()
+        player_layout.addLayout(player_top_bar)
+        video_container = QWidget()
+        video_container.setStyleSheet("border: 1px solid #333; background-color: black;")
+        video_container_layout = QVBoxLayout(video_container)
+        video_container_layout.setContentsMargins(0, 0, 0, 0)
+        self.video_widget = QVideoWidget()
+        self.video_widget.setMinimumHeight(400)
+        video_container_layout.addWidget(self.video_widget)
+        player_layout.addWidget(video_container)
+        controls_panel = QWidget()
+        controls_panel.setStyleSheet("background-color: #252525; border-radius: 8px;")
+        controls_layout = QVBoxLayout(controls_panel)
+        progress_layout = QHBoxLayout()
+        self.lbl_time_current = QLabel("00:00")
+        self.lbl_time_current.setStyleSheet("color: #aaa; font-family: Consolas;")
+        self.video_slider = QSlider(Qt.Orientation.Horizontal)
+        self.video_slider.setRange(0, 0)
+        self.video_slider.sliderMoved.connect(self.set_position)
+        self.video_slider.sliderReleased.connect(self.play_after_seek)
+        self.video_slider.setStyleSheet("""
+            QSlider {
+                height: 30px;
+                padding-left: 10px;
+                padding-right: 10px;
+            }
+            QSlider::groove:horizontal {
+                border: 1px solid #333;
+                height: 6px;
+                background: #444;
+                margin: 2px 0;
+                border-radius: 3px;
+            }
+            QSlider::handle:horizontal {
+                background: #42A5F5;
+                border: 1px solid #42A5F5;
+                width: 14px;
+                height: 14px;
+                margin: -5px 0;
+                border-radius: 7px;
+            }
+            QSlider::handle:horizontal:hover {
+                background: #64B5F6;
+                border: 1px solid #64B5F6;
+            }
+        """)
+        self.lbl_time_total = QLabel("00:00")
+        self.lbl_time_total.setStyleSheet("color: #aaa; font-family: Consolas;")
+        progress_layout.addWidget(self.lbl_time_current)
+        progress_layout.addWidget(self.video_slider)
+        progress_layout.addWidget(self.lbl_time_total)
+        controls_layout.addLayout(progress_layout)
+        btns_layout = QHBoxLayout()
+        self.btn_play_pause = QPushButton()
+        self.btn_play_pause.setFixedSize(40, 40)
+        self.btn_play_pause.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_MediaPlay))
+        self.btn_play_pause.clicked.connect(self.toggle_playback)
+        self.btn_play_pause.setStyleSheet("border-radius: 20px; background-color: #333;")
+        btns_layout.addStretch()
+        btns_layout.addWidget(self.btn_play_pause)
+        btns_layout.addStretch()
+        controls_layout.addLayout(btns_layout)
+        player_layout.addWidget(controls_panel)
+        self.media_player = QMediaPlayer()
+        self.audio_output = QAudioOutput()
+        self.media_player.setAudioOutput(self.audio_output)
+        self.media_player.setVideoOutput(self.video_widget)
+        self.media_player.positionChanged.connect(self.update_position)
+        self.media_player.durationChanged.connect(self.update_duration)
+        self.media_player.playbackStateChanged.connect(self.update_play_button)
+        self.media_player.errorOccurred.connect(self.handle_media_error)
+        self.video_panel.addWidget(self.player_page)
+    def play_selected_video(self, item):
+        video_path = item.data(Qt.ItemDataRole.UserRole)
+        radio_name = item.text()
+        if os.path.exists(video_path):
+            if self.media_player is None:
+                self._crear_reproductor()
+            self.current_video_label.setText(f"Reproduciendo: {radio_name}")
+            self.media_player.setSource(QUrl.fromLocalFile(video_path))
+            self.video_panel.setCurrentIndex(1)
+            self.media_player.play()
+        else:
+            QMessageBox.warning(self, "Error", "No se pudo encontrar el archivo de video.")
+    def stop_and_back(self):
+        self.media_player.stop()
+        self.video_panel.setCurrentIndex(0)
+    def toggle_playback(self):
+        if self.media_player.playbackState() == QMediaPlayer.PlaybackState.PlayingState:
+            self.media_player.pause()
+        else:
+            self.media_player.play()
+    def update_play_button(self, state):
+        if state == QMediaPlayer.PlaybackState.PlayingState:
+            self.btn_play_pause.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_MediaPause))
+        else:
+            self.btn_play_pause.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_MediaPlay))
+    def update_position(self, position):
+        self.video_slider.setValue(position)
+        self.lbl_time_current.setText(self.format_time(position))
+    def update_duration(self, duration):
+        self.video_slider.setRange(0, duration)
+        self.lbl_time_total.setText(self.format_time(duration))
+    def set_position(self, position):
+        self.media_player.setPosition(position)
+    def play_after_seek(self):
+        """Asegura que el video siga reproduciéndose tras soltar el slider"""
+        if self.media_player.playbackState() != QMediaPlayer.PlaybackState.PlayingState:
+            self.media_player.play()
+    def format_time(self, ms):
+        s = round(ms / 1000)
+        m, s = divmod(s, 60)
+        return f"{m:02d}:{s:02d}"
+    def handle_media_error(self):
+        err = self.media_player.errorString()
+        self.append_log(f"ERROR Multimedia: {err}")
+    def stop_process(self):
+        if self.worker and self.worker.isRunning():
+            self.worker.stop()
+            if self.taskbar_progress:
+                self.taskbar_progress.set_progress_state(TBPF_PAUSED)
+            self.append_log("\n⚠️ Solicitando detención... esperando a que terminen los hilos actuales...")
+            self.status_label.setText("Deteniendo...")
+            self.btn_stop.setEnabled(False)
+    def process_finished(self, msg):
+        self.btn_start.setEnabled(True)
+        self.btn_stop.setEnabled(False)
+        self.btn_clean.setEnabled(True)
+        self.check_auto_search.setEnabled(True)
+        self.check_video.setEnabled(True)
+        self.check_incremental.setEnabled(True)
+        self.status_label.setText(f"Finalizado: {msg}")
+        if self.taskbar_progress:
+            self.taskbar_progress.set_progress_state(TBPF_NOPROGRESS)
+        QMessageBox.information(self, "Proceso Completado", msg)
+    @pyqtSlot(str)
+    def append_log(self, text):
+        text_str = str(text)
+        self.log_console.moveCursor(QTextCursor.MoveOperation.End)
+        self.log_console.insertPlainText(text_str)
+        final_text = text_str
+        if not text_str.endswith('\n'):
+             self.log_console.insertPlainText('\n')
+             final_text += '\n'
+        self.log_console.moveCursor(QTextCursor.MoveOperation.End)
+        try:
+            with open(ARCHIVO_LOG, "a", encoding="utf-8") as f:
+                f.write(final_text)
+        except:
+            pass
+    @pyqtSlot(int, int)
+    def update_progress(self, current, total):
+        self.progress_bar.setMaximum(total)
+        self.progress_bar.setValue(current)
+        if self.taskbar_progress:
+            self.taskbar_progress.set_progress_value(int(current), int(total))
+    @pyqtSlot(list)
+    def init_table(self, radios):
+        self.table.setRowCount(len(radios))
+        for i, radio in enumerate(radios):
+            item_name = QTableWidgetItem(f"{radio['nombre']} ({radio['frecuencia']})")
+            self.table.setItem(i, 0, item_name)
+            item_status = QTableWidgetItem("PENDIENTE")
+            item_status.setForeground(QColor("gray"))
+            self.table.setItem(i, 1, item_status)
+            self.table.setItem(i, 2, QTableWidgetItem(radio['url']))
+            self.table.setItem(i, 3, QTableWidgetItem("-"))
+    @pyqtSlot(int, str, str, str, str)
+    def update_row(self, row, status, url, info, nombre):
+        item_name = self.table.item(row, 0)
+        if item_name:
+            texto_actual = item_name.text()
+            frecuencia = ""
+            if '(' in texto_actual and ')' in texto_actual:
+                frecuencia = texto_actual.split('(')[-1].split(')')[0]
+            if frecuencia:
+                item_name.setText(f"{nombre} ({frecuencia})")
+            else:
+                item_name.setText(nombre)
+        item_status = self.table.item(row, 1)
+        item_status.setText(status)
+        item_status.setBackground(QColor(0, 0, 0, 0))
+        icon = QIcon()
+        msg_type = QStyle.StandardPixmap.SP_MessageBoxInformation
+        text_color = QColor("white")
+        if status == "ACTIVO":
+            msg_type = QStyle.StandardPixmap.SP_DialogApplyButton
+            text_color = QColor("#4CAF50")
+        elif "CAIDO" in status or "NO_ENCONTRADO" in status:
+            msg_type = QStyle.StandardPixmap.SP_DialogCancelButton
+            text_color = QColor("#EF5350")
+        elif "TIMEOUT" in status:
+            msg_type = QStyle.StandardPixmap.SP_MessageBoxWarning
+            text_color = QColor("#FFCA28")
+        elif "ACTUALIZADO" in status:
+            msg_type = QStyle.StandardPixmap.SP_BrowserReload
+            text_color = QColor("#42A5F5")
+        elif "ERROR_BUSQ" in status:
+            msg_type = QStyle.StandardPixmap.SP_MessageBoxCritical
+            text_color = QColor("#FF7043")
+        item_status.setIcon(self.style().standardIcon(msg_type))
+        item_status.setForeground(text_color)
+        self.table.item(row, 2).setText(url)
+        self.table.item(row, 3).setText(info)
+        self.table.scrollToItem(self.table.item(row, 0))
+    def showEvent(self, event):
+        """Se ejecuta cuando la ventana se muestra por primera vez"""
+        super().showEvent(event)
+        if self.taskbar_progress:
+            self.taskbar_progress.set_hwnd(int(self.winId()))
+        if es_primera_vez():
+            QMessageBox.warning(
+                self,
+                "Advertencia importante",
+                "Esta herramienta puede equivocarse de URL a veces. "
+                "NO SEAS DOLOBU y revisa las URLs nuevas, a ver si no metió la pata el programa."
+            )
+            marcar_primera_vez_completada()
+
+def main():
+    app = QApplication(sys.argv)
+    app.setStyle("Fusion")
+    palette = QPalette()
+    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.Window, QColor(53, 53, 53))
+    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.WindowText, Qt.GlobalColor.white)
+    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.Base, QColor(25, 25, 25))
+    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.AlternateBase, QColor(53, 53, 53))
+    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.ToolTipBase, Qt.GlobalColor.white)
+    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.ToolTipText, Qt.GlobalColor.white)
+    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.Text, Qt.GlobalColor.white)
+    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.Button, QColor(53, 53, 53))
+    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.ButtonText, Qt.GlobalColor.white)
+    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.BrightText, Qt.GlobalColor.red)
+    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.Link, QColor(42, 130, 218))
+    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.Highlight, QColor(42, 130, 218))
+    palette.setColor(QPalette.ColorGroup.All, QPalette.ColorRole.HighlightedText, Qt.GlobalColor.black)
+    app.setPalette(palette)
+    window = MainWindow()
+    window.show()
+    sys.exit(app.exec())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark de arranque de RadioChecker.
+
+Lanza un proceso nuevo por escenario y mide el tiempo de import y el RSS máximo:
+  - lazy:  import RadioChecker tal como queda ahora (lo que paga el modo batch antes del primer probe)
+  - eager: import RadioChecker + selenium, cv2, numpy, PIL y PyQt6 (widgets y multimedia),
+           es decir todo lo que antes se importaba al tope del módulo
+
+Uso: python benchmarks/bench_arranque.py [--repeticiones N]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CODIGO_HIJO = r'''
+import json, sys, time
+t0 = time.perf_counter()
+import RadioChecker
+faltantes = []
+if sys.argv[1] == "eager":
+    for cargar in [RadioChecker._cargar_selenium, RadioChecker._cargar_video]:
+        try:
+            cargar()
+        except ImportError as e:
+            faltantes.append(str(e))
+    for modulo in ["PyQt6.QtWidgets", "PyQt6.QtMultimedia", "PyQt6.QtMultimediaWidgets"]:
+        try:
+            __import__(modulo)
+        except ImportError as e:
+            faltantes.append(str(e))
+segundos = time.perf_counter() - t0
+try:
+    import resource
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss_kb / (1024 * 1024) if sys.platform == "darwin" else rss_kb / 1024
+except ImportError:
+    import psutil
+    rss_mb = psutil.Process().memory_info().peak_wset / (1024 * 1024)
+print(json.dumps({"segundos": segundos, "rss_mb": rss_mb, "faltantes": faltantes}))
+'''
+
+def medir(escenario):
+    """Corre un escenario en un intérprete limpio y devuelve sus métricas"""
+    salida = subprocess.run(
+        [sys.executable, "-c", CODIGO_HIJO, escenario],
+        cwd=RAIZ, capture_output=True, text=True, check=True
+    )
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo de import y RSS de RadioChecker (lazy vs eager)")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+    resultados = {}
+    for escenario in ["eager", "lazy"]:
+        medidas = [medir(escenario) for _ in range(args.repeticiones)]
+        resultados[escenario] = {
+            "segundos": statistics.median(m["segundos"] for m in medidas),
+            "rss_mb": statistics.median(m["rss_mb"] for m in medidas),
+            "faltantes": medidas[0]["faltantes"]
+        }
+    print(f"{'Escenario':<10} {'Import (ms)':>12} {'RSS máx (MB)':>14}")
+    for escenario, r in resultados.items():
+        print(f"{escenario:<10} {r['segundos'] * 1000:>12.1f} {r['rss_mb']:>14.1f}")
+    if resultados["eager"]["faltantes"]:
+        print("\n⚠️ Módulos no disponibles (el escenario eager los omite):")
+        for faltante in resultados["eager"]["faltantes"]:
+            print(f"   - {faltante}")
+    ahorro = resultados["eager"]["segundos"] - resultados["lazy"]["segundos"]
+    print(f"\nAhorro en el arranque: {ahorro * 1000:.1f} ms, "
+          f"{resultados['eager']['rss_mb'] - resultados['lazy']['rss_mb']:.1f} MB")
+
+if __name__ == "__main__":
+    main()
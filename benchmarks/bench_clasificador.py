@@ -0,0 +1,153 @@
+"""
+Micro-benchmark del clasificador de URLs de streams.
+
+Compara es_url_stream_audio (regex compiladas al importar el módulo) con la versión
+anterior de _es_stream_audio (listas + any() en cada llamada) sobre un corpus de URLs
+como las que captura el performance log en sitios de radios: assets, trackers, APIs
+y streams. Antes de medir verifica que las dos den exactamente el mismo resultado.
+
+Uso: python benchmarks/bench_clasificador.py [--corpus urls.txt] [--repeticiones N]
+     (urls.txt: una URL por línea, por ejemplo volcada del performance log de Chrome)
+"""
+import argparse
+import os
+import statistics
+import sys
+import timeit
+from urllib.parse import urlparse
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import RadioChecker
+
+CORPUS = [
+    "https://www.radiomitre.com.ar/",
+    "https://www.radiomitre.com.ar/_astro/index.B3x9aQ.css",
+    "https://www.radiomitre.com.ar/_astro/hoisted.Dk2L1.js",
+    "https://www.radiomitre.com.ar/static/fonts/Roboto-Regular.woff2",
+    "https://www.radiomitre.com.ar/resizer/v2/ABCDEF.jpg?auth=12ab&width=768",
+    "https://www.googletagmanager.com/gtag/js?id=G-XXXXXXX",
+    "https://www.google-analytics.com/g/collect?v=2&tid=G-XXXXXXX&en=page_view",
+    "https://securepubads.g.doubleclick.net/tag/js/gpt.js",
+    "https://securepubads.g.doubleclick.net/gampad/ads?iu=/123/radio&sz=300x250",
+    "https://connect.facebook.net/es_LA/fbevents.js",
+    "https://www.facebook.com/tr?id=1234&ev=PageView",
+    "https://fonts.googleapis.com/css2?family=Roboto:wght@400;700&display=swap",
+    "https://fonts.gstatic.com/s/roboto/v30/KFOmCnqEu92Fr1Mu4mxK.woff2",
+    "https://cdn.jsdelivr.net/npm/hls.js@1.5.7/dist/hls.min.js",
+    "https://cdn.jsdelivr.net/npm/hls.js@1.5.7/dist/hls.min.js.map",
+    "https://playerservices.streamtheworld.com/api/livestream-redirect/MITRE790AAC.aac",
+    "https://playerservices.streamtheworld.com/api/livestream-redirect/CONTINENTAL_SC",
+    "https://playerservices.streamtheworld.com/pls/RADIO10AAC.pls",
+    "https://18063.live.streamtheworld.com/MITRE790AAC_SC?dist=web&tdsdk=js-2.9",
+    "https://sdk.listenlive.co/web/2.9/td-sdk.min.js",
+    "https://player.listenlive.co/44561/es/config",
+    "https://stream.zeno.fm/abcd1234efgh",
+    "https://stream-176.zeno.fm/xyz789?zs=abc&rj-ttl=5&rj-tok=AAAB",
+    "https://api.zeno.fm/mounts/metadata/subscribe/abcd1234efgh",
+    "https://cdn.instream.audio/:9660/stream",
+    "http://streaming.radionomy.com:8000/La100",
+    "http://200.58.118.108:8080/;stream.mp3",
+    "https://server.example-radio.com.ar:8443/live",
+    "https://server.example-radio.com.ar:9000/status-json.xsl",
+    "http://186.0.233.76:7189/;",
+    "https://icecast.example.net/radio.ogg",
+    "https://shoutcast.example.net/stream/1/",
+    "https://live.example.com/hls/radio/playlist.m3u8",
+    "https://live.example.com/hls/radio/chunklist_b128000.m3u8",
+    "https://live.example.com/hls/radio/media_12345.aac",
+    "https://live.example.com/hls/radio/segment_001.ts",
+    "https://www.emisoraenvivo.com/api/listening/radio-la-red-am-910",
+    "https://www.emisoraenvivo.com/radio-la-red-am-910",
+    "https://www.radios.com.ar/player/aspen.php",
+    "https://www.radios.com.ar/images/logos/aspen.png",
+    "https://www.radios.com.ar/img/icon-play.svg",
+    "https://www.radios.com.ar/assets/app.bundle.js",
+    "https://tracking.example-ads.com/pixel.gif?cb=123",
+    "https://stats.example.com/analytics.js",
+    "https://www.youtube.com/iframe_api",
+    "https://www.youtube.com/s/player/1a2b3c/player_ias.vflset/es_419/base.js",
+    "https://i.ytimg.com/vi/abcd/hqdefault.jpg",
+    "https://www.radio10.com.ar/en-vivo",
+    "https://www.radio10.com.ar/wp-json/wp/v2/posts?per_page=5",
+    "https://www.radio10.com.ar/wp-content/themes/radio10/player/player.css",
+    "https://www.radio10.com.ar/live/player.html",
+    "https://broadcast.example.org/listen/la_folk/radio.mp3",
+    "https://example.org/radio/8000/radio.mp3",
+    "https://example.org/public/la_folk/embed?theme=dark",
+    "https://example.org/api/nowplaying/la_folk",
+    "https://example.org/audio/podcast/episodio-12.mp3",
+    "https://example.org/sitemap.xml",
+    "https://example.org/manifest.json",
+    "https://example.org/robots.txt",
+    "https://example.org/favicon.ico",
+    "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg==",
+    "blob:https://www.radiomitre.com.ar/6b1e7c2a-1234-4abc-9def-0123456789ab",
+]
+
+def _es_stream_audio_anterior(url):
+    """Implementación previa de RadioStreamFinder._es_stream_audio (referencia)"""
+    if not url or not isinstance(url, str):
+        return False
+    url_lower = url.lower()
+    extensiones_ignorar = RadioChecker.EXTENSIONES_ASSETS
+    if any(url_lower.endswith(ext) for ext in extensiones_ignorar):
+        return False
+    if any(palabra in url_lower for palabra in RadioChecker.PALABRAS_NO_STREAM):
+        return False
+    extensiones_audio = ['.mp3', '.aac', '.aacp', '.m3u8', '.pls', '.m3u', '.ogg', '.oga']
+    if any(ext in url_lower for ext in extensiones_audio):
+        return True
+    keywords_validos = [
+        'icecast', 'shoutcast', 'streamtheworld',
+        '/stream', '/live', '/radio', '/audio',
+        'listen', 'player', 'broadcast', 'api/listening',
+    ]
+    parsed = urlparse(url)
+    path = parsed.path.lower()
+    if any(kw in path or kw in parsed.netloc.lower() for kw in keywords_validos):
+        if not any(ignore in path for ignore in ['/js/', '/css/', '/fonts/', '/images/']):
+            return True
+    if 'emisoraenvivo.com/api/listening/' in url_lower:
+        return True
+    if any(f':{port}' in url for port in ['8000', '8080', '8443', '9000', '7189']):
+        if not any(ext in url_lower for ext in extensiones_ignorar):
+            return True
+    return False
+
+def medir(funcion, corpus, repeticiones):
+    """Mediana de nanosegundos por URL clasificada"""
+    def pasada():
+        for url in corpus:
+            funcion(url)
+    vueltas = max(1, 20000 // len(corpus))
+    tiempos = timeit.repeat(pasada, number=vueltas, repeat=repeticiones)
+    return statistics.median(tiempos) / (vueltas * len(corpus)) * 1e9
+
+def main():
+    parser = argparse.ArgumentParser(description="Clasificador de URLs de streams: listas + any() vs regex compiladas")
+    parser.add_argument("--corpus", help="Archivo con una URL por línea (por defecto, el corpus incluido)")
+    parser.add_argument("--repeticiones", type=int, default=7)
+    args = parser.parse_args()
+    corpus = CORPUS
+    if args.corpus:
+        with open(args.corpus, encoding="utf-8") as f:
+            corpus = [linea.strip() for linea in f if linea.strip()]
+    distintas = [url for url in corpus if _es_stream_audio_anterior(url) != RadioChecker.es_url_stream_audio(url)]
+    if distintas:
+        print("❌ Las implementaciones no coinciden en:")
+        for url in distintas:
+            print(f"   - {url}")
+        sys.exit(1)
+    streams = sum(1 for url in corpus if RadioChecker.es_url_stream_audio(url))
+    print(f"Corpus: {len(corpus)} URLs ({streams} clasificadas como stream), resultados idénticos ✅\n")
+    anterior = medir(_es_stream_audio_anterior, corpus, args.repeticiones)
+    compilado = medir(RadioChecker.es_url_stream_audio, corpus, args.repeticiones)
+    print(f"{'Clasificador':<14} {'ns por URL':>12}")
+    print(f"{'anterior':<14} {anterior:>12.0f}")
+    print(f"{'compilado':<14} {compilado:>12.0f}")
+    print(f"\nMejora: {anterior / compilado:.1f}x")
+
+if __name__ == "__main__":
+    main()